@@ -0,0 +1,16 @@
+#!/bin/bash
+
+# Script for compiling page templates to Python bytecode.
+# Set KSQLDB_UI__TEMPLATES__COMPILED_DIR to the same directory to use them.
+
+TARGET=${1:-compiled_templates}
+
+echo "Compiling templates..."
+
+PYTHONPATH=src python3 -c "
+import sys
+from app.core.templates import compile_templates
+print(len(compile_templates(sys.argv[1])), 'templates compiled')
+" "$TARGET"
+
+echo "Templates compiled to $TARGET! Templates must be compiled again after any change."
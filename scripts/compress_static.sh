@@ -0,0 +1,16 @@
+#!/bin/bash
+
+# Script for precompressing static files (.gz, and .br if brotli is installed),
+# so they are not compressed on each request.
+
+STATIC=${1:-src/static}
+
+echo "Compressing static files..."
+
+PYTHONPATH=src python3 -c "
+import sys
+from app.core.compression import precompress_static
+print(len(precompress_static(sys.argv[1])), 'compressed files written')
+" "$STATIC"
+
+echo "Static files compressed!"
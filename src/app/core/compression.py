@@ -0,0 +1,170 @@
+import gzip
+import zlib
+from pathlib import Path
+from typing import Any
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import IdentityResponder
+from starlette.types import (
+    ASGIApp,
+    Message,
+    Receive,
+    Scope,
+    Send,
+)
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+# Content types that are worth compressing (images, fonts and archives are already compressed)
+COMPRESSIBLE_CONTENT_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/x-ndjson",
+    "application/manifest+json",
+    "image/svg+xml",
+)
+
+# Extensions of static files that are precompressed at build time
+PRECOMPRESSED_EXTENSIONS = (".css", ".js", ".json", ".svg", ".map", ".webmanifest", ".ttf")
+
+# Content encodings of precompressed files by extensions, in order of preference
+PRECOMPRESSED_ENCODINGS = {"br": ".br", "gzip": ".gz"}
+
+
+def get_accepted_encodings(headers: Headers) -> set[str]:
+    """Get content encodings accepted by client from "Accept-Encoding" header."""
+    accepted = set()
+    for item in headers.get("accept-encoding", "").split(","):
+        name, _, params = item.partition(";")
+        q = params.strip().removeprefix("q=").strip()
+        try:
+            if q and float(q) <= 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(name.strip().lower())
+    return accepted
+
+
+def get_supported_encodings() -> tuple[str, ...]:
+    """Get content encodings that app can use, in order of preference."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(headers: Headers) -> str | None:
+    accepted = get_accepted_encodings(headers)
+    for encoding in get_supported_encodings():
+        if encoding in accepted:
+            return encoding
+    return None
+
+
+class CompressionMiddleware:
+    """Compress responses with brotli (if installed) or gzip, depending on what client accepts.
+
+    Unlike `GZipMiddleware` of Starlette, each chunk of streamed response is
+    flushed, so streamed pages are not delayed until compressor buffers fill.
+    Responses with "Content-Encoding" (e.g. precompressed static files) are sent as is.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        """Initialize class instance."""
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        responder: ASGIApp
+        encoding = negotiate_encoding(Headers(scope=scope))
+        if encoding == "br":
+            responder = BrotliResponder(self.app, self.minimum_size, self.brotli_quality)
+        elif encoding == "gzip":
+            responder = GZipResponder(self.app, self.minimum_size, self.gzip_level)
+        else:
+            responder = CompressibleResponder(self.app, self.minimum_size)
+
+        await responder(scope, receive, send)
+
+
+class CompressibleResponder(IdentityResponder):
+    """Responder that compresses only compressible content types.
+
+    Responses of other content types are sent as is, bypassing compression
+    (and "Vary" header) of `IdentityResponder` entirely.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int) -> None:
+        """Initialize class instance."""
+        super().__init__(app, minimum_size)
+        self.compressible = True
+
+    async def send_with_compression(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            self.compressible = content_type.startswith(COMPRESSIBLE_CONTENT_TYPES)
+
+        if self.compressible:
+            await super().send_with_compression(message)
+        else:
+            await self.send(message)
+
+
+class GZipResponder(CompressibleResponder):
+    content_encoding = "gzip"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, level: int) -> None:
+        """Initialize class instance."""
+        super().__init__(app, minimum_size)
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        flush_mode = zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH
+        return self.compressor.compress(body) + self.compressor.flush(flush_mode)
+
+
+class BrotliResponder(CompressibleResponder):
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int) -> None:
+        """Initialize class instance."""
+        super().__init__(app, minimum_size)
+        self.compressor: Any = brotli.Compressor(quality=quality)
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        data = self.compressor.process(body)
+        return bytes(data + (self.compressor.flush() if more_body else self.compressor.finish()))
+
+
+def precompress_static(directory: str | Path) -> list[Path]:
+    """Write compressed siblings (".br" if brotli is installed, and ".gz") of static files."""
+    compressed = []
+    for path in sorted(Path(directory).rglob("*")):
+        if not path.is_file() or path.suffix not in PRECOMPRESSED_EXTENSIONS:
+            continue
+
+        data = path.read_bytes()
+        gz_path = path.with_name(path.name + PRECOMPRESSED_ENCODINGS["gzip"])
+        gz_path.write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+        compressed.append(gz_path)
+
+        if brotli is not None:
+            br_path = path.with_name(path.name + PRECOMPRESSED_ENCODINGS["br"])
+            br_path.write_bytes(brotli.compress(data, quality=11))
+            compressed.append(br_path)
+
+    return compressed
@@ -0,0 +1,164 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any
+
+import httpx
+
+from .ksqldb.jsonstream import (
+    KsqlResponse,
+    get_body_digest,
+)
+from .settings import CacheSettings
+from .utils import (
+    ContextRequest,
+    ContextResponse,
+)
+
+# Extension of httpx.Response with digest of its body (if it's not digested while received)
+DIGEST_EXTENSION = "ksqldb_ui.digest"
+
+
+class ResponseDetails:
+    """Original request and full response shown on demand under page.
+
+    Response body is kept as compact JSON (not as parsed data), so size of
+    details is close to memory they take. Body is parsed only when it's shown.
+    """
+
+    __slots__ = ("raw_request", "status_code", "content", "size", "expires_at")
+
+    def __init__(self, response: httpx.Response, expires_at: float) -> None:
+        """Initialize class instance."""
+        self.raw_request = response.request
+        self.status_code = response.status_code
+        self.content = get_compact_content(response)
+        self.size = len(self.content) + len(self.raw_request.content)
+        self.expires_at = expires_at
+
+    @property
+    def request(self) -> ContextRequest:
+        return ContextRequest(self.raw_request)
+
+    @property
+    def response(self) -> ContextResponse:
+        return ContextResponse(
+            httpx.Response(self.status_code, content=self.content, request=self.raw_request),
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        request, response = self.request, self.response
+        return {
+            "request": {
+                "method": request.method,
+                "url": str(request.url),
+                "data": request.data,
+            },
+            "response": {
+                "code": response.code,
+                "data": response.data or response.text,
+            },
+        }
+
+
+def get_compact_content(response: httpx.Response) -> bytes:
+    if isinstance(response, KsqlResponse):
+        return response.get_compact_content()
+    return response.content
+
+
+def get_response_digest(response: httpx.Response) -> str:
+    """Get digest of response body (computed while body was received if possible)."""
+    if (digest := getattr(response, "received_digest", None)) is not None:
+        return str(digest)
+    if (digest := response.extensions.get(DIGEST_EXTENSION)) is None:
+        digest = get_body_digest(get_compact_content(response))
+        response.extensions[DIGEST_EXTENSION] = digest
+    return str(digest)
+
+
+def get_details_id(response: httpx.Response) -> str:
+    """Get ID of details, which is the same for the same request and response."""
+    request = response.request
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (request.method, str(request.url), request.content, get_response_digest(response)):
+        digest.update(part.encode() if isinstance(part, str) else part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def get_received_size(response: httpx.Response) -> int:
+    """Get size of response body without serializing parsed body."""
+    if (size := getattr(response, "received_size", None)) is not None:
+        return int(size)
+    return len(get_compact_content(response))
+
+
+class ResponseDetailsStore:
+    """Bounded short-lived store of response details by opaque IDs.
+
+    Pages only link to details, so responses are not rendered twice on every
+    page. IDs are digests of request and response, so the same details are
+    stored once and pages cached by browsers keep valid links while their
+    details are added again. Bodies are serialized once and parsed only when
+    details are requested. Size is a total length of stored bodies.
+    """
+
+    def __init__(self, settings: CacheSettings = CacheSettings()) -> None:
+        """Initialize class instance."""
+        self._entries: OrderedDict[str, ResponseDetails] = OrderedDict()
+        self.total = 0
+        self.configure(settings)
+
+    def configure(self, settings: CacheSettings) -> None:
+        self.size = settings.details_size
+        self.ttl = settings.details_ttl
+        self.clear()
+
+    def add(self, response: httpx.Response) -> str | None:
+        """Store details of response, returning their ID (None if response is too large).
+
+        Expiration of details that are already stored is postponed.
+        """
+        details_id = get_details_id(response)
+        expires_at = time.monotonic() + self.ttl
+        if (details := self.get(details_id)) is not None:
+            details.expires_at = expires_at
+            self._entries.move_to_end(details_id)
+            return details_id
+
+        if get_received_size(response) > self.size:
+            return None
+
+        details = ResponseDetails(response, expires_at)
+        if details.size > self.size:
+            return None
+
+        self.drop_expired()
+        if (expired := self._entries.pop(details_id, None)) is not None:
+            self.total -= expired.size
+        self._entries[details_id] = details
+        self.total += details.size
+        while self.total > self.size:
+            self.total -= self._entries.popitem(last=False)[1].size
+
+        return details_id
+
+    def get(self, details_id: str) -> ResponseDetails | None:
+        details = self._entries.get(details_id)
+        if details is None or details.expires_at < time.monotonic():
+            return None
+        return details
+
+    def drop_expired(self) -> None:
+        # Entries are added with the same TTL, so the oldest ones expire first
+        now = time.monotonic()
+        while self._entries and next(iter(self._entries.values())).expires_at < now:
+            self.total -= self._entries.popitem(last=False)[1].size
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.total = 0
+
+
+RESPONSE_DETAILS = ResponseDetailsStore()
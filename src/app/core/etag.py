@@ -0,0 +1,77 @@
+import hashlib
+from typing import Optional
+
+import httpx
+from fastapi import Request
+from starlette.responses import Response
+
+from .details import get_response_digest
+from .i18n import get_current_language
+from .settings import (
+    get_server,
+    get_settings,
+)
+from .utils import get_version
+
+# Pages with ETag are stored by browsers, but revalidated on each request
+ETAG_CACHE_CONTROL = "no-cache"
+
+APP_DIGEST: Optional[str] = None
+
+
+def get_digest(*parts: str | bytes) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode() if isinstance(part, str) else part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def get_app_digest() -> str:
+    """Get digest of app version and settings, which change only on restart."""
+    global APP_DIGEST
+
+    if APP_DIGEST is None:
+        APP_DIGEST = get_digest(get_version() or "", get_settings().model_dump_json())
+    return APP_DIGEST
+
+
+def get_etag(request: Request, response: httpx.Response, *parts: str) -> str:
+    """Get ETag of page (or API response) built from ksqlDB response.
+
+    ETag depends on ksqlDB response, server, language, URL with query params
+    (e.g. page number) and app itself, and on any extra parts (e.g. templates version).
+    ETag is weak, because body may be sent compressed or not.
+    """
+    digest = get_digest(
+        get_response_digest(response),
+        get_server(request).code,
+        get_current_language(),
+        request.url.path,
+        str(request.query_params),
+        get_app_digest(),
+        *parts,
+    )
+    return f'W/"{digest}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Check if client has page with the same ETag (in "If-None-Match" header)."""
+    if request.method not in ("GET", "HEAD"):
+        return False
+
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+
+    # Weak comparison is used for "If-None-Match" (RFC 9110)
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+def get_etag_headers(etag: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": ETAG_CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=get_etag_headers(etag))
@@ -1,15 +1,34 @@
+import stat
 from collections import deque
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any
+from typing import (
+    Any,
+    AsyncIterator,
+)
 
+import anyio
 from fastapi import (
     FastAPI,
     Response,
 )
+from starlette.datastructures import Headers
 from starlette.responses import JSONResponse
 from starlette.staticfiles import StaticFiles
 from starlette.types import Scope
 
+from app.core.compression import (
+    PRECOMPRESSED_ENCODINGS,
+    PRECOMPRESSED_EXTENSIONS,
+    CompressionMiddleware,
+    get_accepted_encodings,
+)
+from app.core.details import RESPONSE_DETAILS
+from app.core.ksqldb import (
+    close_ksql_clients,
+    warmup_ksql_clients,
+)
+from app.core.render import FRAGMENT_CACHE
 from app.core.settings import (
     README,
     Settings,
@@ -26,14 +45,64 @@ class CacheControlledStaticFiles(StaticFiles):
         super().__init__(*args, **kwargs)
 
     async def get_response(self, path: str, scope: Scope) -> Response:
-        response = await super().get_response(path, scope)
+        response = await self.get_precompressed_response(path, scope)
+        if response is None:
+            response = await super().get_response(path, scope)
+
         response.headers["Cache-Control"] = f"public, max-age={self.max_age}"
         return response
 
+    async def get_precompressed_response(self, path: str, scope: Scope) -> Response | None:
+        """Get response with compressed sibling of file (e.g. "base.css.br") if client accepts it.
+
+        Siblings are created at build time by `scripts/compress_static.sh`, the ones
+        older than file itself (e.g. file was changed after that) are ignored.
+        """
+        if not path.endswith(PRECOMPRESSED_EXTENSIONS) or scope["method"] not in ("GET", "HEAD"):
+            return None
+
+        accepted = get_accepted_encodings(Headers(scope=scope))
+        if not accepted.intersection(PRECOMPRESSED_ENCODINGS):
+            return None
+
+        _path, original = await anyio.to_thread.run_sync(self.lookup_path, path)
+        if original is None:
+            return None
+
+        for encoding, extension in PRECOMPRESSED_ENCODINGS.items():
+            if encoding not in accepted:
+                continue
+
+            full_path, stat_result = await anyio.to_thread.run_sync(
+                self.lookup_path,
+                path + extension,
+            )
+            if (
+                stat_result
+                and stat.S_ISREG(stat_result.st_mode)
+                and stat_result.st_mtime >= original.st_mtime
+            ):
+                response = self.file_response(full_path, stat_result, scope)
+                response.headers["Content-Encoding"] = encoding
+                response.headers["Vary"] = "Accept-Encoding"
+                return response
+
+        return None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Warm up ksqlDB sessions on startup and close them on shutdown."""
+    if app.settings.http.warmup:
+        await warmup_ksql_clients(app.settings)
+
+    yield
+    await close_ksql_clients()
+
 
 def init_fastapi_app(with_routes: bool = True) -> FastAPI:
     """Initialize FastAPI application with settings and routes."""
-    app = FastAPI()
+    app = FastAPI(lifespan=lifespan)
     try:
         settings: Settings = get_settings()
     except Exception as e:
@@ -43,9 +112,13 @@ def init_fastapi_app(with_routes: bool = True) -> FastAPI:
     app.settings = settings
     if settings.history.enabled:
         app.history = deque(maxlen=settings.history.size)
+    FRAGMENT_CACHE.configure(settings.cache.fragments_size)
+    RESPONSE_DETAILS.configure(settings.cache)
 
     static_dir = Path(__file__).parent.parent.parent / "static"
     app.mount("/static", CacheControlledStaticFiles(directory=static_dir), name="static")
+    if settings.http.compress_responses:
+        app.add_middleware(CompressionMiddleware, minimum_size=settings.http.compress_min_size)
 
     app.app_version = get_version()
 
@@ -56,6 +129,7 @@ def init_fastapi_app(with_routes: bool = True) -> FastAPI:
 
 
 def register_routes(app: FastAPI) -> None:
+    from app.diff import router as diff_page
     from app.index import router as index_page
     from app.queries import router as queries_page
     from app.requests import router as requests_page
@@ -65,6 +139,7 @@ def register_routes(app: FastAPI) -> None:
     from app.topology import router as topology_page
 
     for route in (
+        diff_page,
         index_page,
         queries_page,
         requests_page,
@@ -83,8 +158,14 @@ def api_error(error: str, success: bool = False, status_code: int = 400) -> JSON
     )
 
 
-def api_success(data: Any, success: bool = True, status_code: int = 200) -> JSONResponse:
+def api_success(
+    data: Any,
+    success: bool = True,
+    status_code: int = 200,
+    headers: dict[str, str] | None = None,
+) -> JSONResponse:
     return JSONResponse(
         content={"success": success, "data": data},
         status_code=status_code,
+        headers=headers,
     )
@@ -1,7 +1,20 @@
-from .client import get_ksql_client
+from .bulk import (
+    BulkResult,
+    BulkStatus,
+    bulk_delete,
+)
+from .client import (
+    KSQL_CLIENTS_CACHE,
+    KsqlBatchResult,
+    close_ksql_clients,
+    get_ksql_client,
+    get_server_ksql_client,
+    warmup_ksql_clients,
+)
 from .resources import (
     KSQL_SYSTEM_STREAM,
     KsqlErrors,
     KsqlException,
     KsqlQuery,
+    KsqlServerUnavailable,
 )
@@ -0,0 +1,139 @@
+import time
+from collections import deque
+from enum import Enum
+from typing import (
+    Any,
+    Hashable,
+)
+
+from .resources import KsqlServerUnavailable
+
+# Adaptive timeout = p99 latency * multiplier (when there are enough samples)
+LATENCY_WINDOW = 200
+LATENCY_MIN_SAMPLES = 20
+LATENCY_MULTIPLIER = 3
+
+
+class CircuitState(Enum):
+    """States of circuit breaker."""
+
+    CLOSED = "closed"  # requests are allowed
+    OPEN = "open"  # requests fail fast
+    HALF_OPEN = "half_open"  # single trial request is allowed
+
+
+class CircuitBreaker:
+    """Circuit breaker for ksqlDB server.
+
+    After several consecutive failures server is considered unavailable and all
+    requests fail fast. After reset time single trial request is allowed, which
+    closes circuit back on success.
+    """
+
+    def __init__(self, max_failures: int = 5, reset_time: float = 15) -> None:
+        """Initialize class instance."""
+        self.max_failures = max_failures
+        self.reset_time = reset_time
+
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial_in_progress = False
+
+    @property
+    def state(self) -> CircuitState:
+        if self.opened_at is None:
+            return CircuitState.CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_time:
+            return CircuitState.HALF_OPEN
+        return CircuitState.OPEN
+
+    @property
+    def retry_after(self) -> float:
+        """Get seconds left before next trial request."""
+        if self.opened_at is None:
+            return 0
+        return max(0, self.reset_time - (time.monotonic() - self.opened_at))
+
+    def check(self) -> None:
+        """Check if request is allowed, otherwise raise exception."""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return
+
+        if state == CircuitState.HALF_OPEN and not self._trial_in_progress:
+            self._trial_in_progress = True
+            return
+
+        raise KsqlServerUnavailable(retry_after=max(1, round(self.retry_after)))
+
+    def report_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_progress = False
+
+    def report_failure(self) -> None:
+        self.failures += 1
+        if self._trial_in_progress or self.failures >= self.max_failures:
+            self.opened_at = time.monotonic()
+        self._trial_in_progress = False
+
+    def release_trial(self) -> None:
+        """Allow another trial request if current one ended without result."""
+        self._trial_in_progress = False
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return {
+            "state": self.state.value,
+            "failures": self.failures,
+            "retry_after": round(self.retry_after, 1),
+        }
+
+
+class LatencyTracker:
+    """Tracker of request latencies to adapt timeouts to them.
+
+    Timeout for each key is p99 of recent latencies multiplied by fixed factor
+    and limited by min and max timeouts. Max timeout is used until there are
+    enough samples, and again after any request times out.
+    """
+
+    def __init__(self, min_timeout: float, max_timeout: float) -> None:
+        """Initialize class instance."""
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self._samples: dict[Hashable, deque[float]] = {}
+
+    def record(self, key: Hashable, latency: float) -> None:
+        if key not in self._samples:
+            self._samples[key] = deque(maxlen=LATENCY_WINDOW)
+        self._samples[key].append(latency)
+
+    def record_timeout(self, key: Hashable) -> None:
+        """Forget latencies of key, so max timeout is used until there are enough new samples.
+
+        Requests that timed out are never sampled, so otherwise timeout adapted
+        to fast responses would never grow back after latency rises.
+        """
+        self._samples.pop(key, None)
+
+    def p99(self, key: Hashable) -> float | None:
+        samples = self._samples.get(key)
+        if not samples or len(samples) < LATENCY_MIN_SAMPLES:
+            return None
+
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+    def get_timeout(self, key: Hashable) -> float:
+        if (p99 := self.p99(key)) is None:
+            return self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, p99 * LATENCY_MULTIPLIER))
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        stats = {}
+        for key in self._samples:
+            p99 = self.p99(key) or 0
+            stats[str(key)] = f"p99={p99:.3f}s timeout={self.get_timeout(key):.1f}s"
+        return stats
@@ -0,0 +1,173 @@
+from enum import Enum
+from typing import (
+    TYPE_CHECKING,
+    Iterable,
+)
+
+from app.core.i18n import _
+
+from .models import SourceDescription
+from .resources import (
+    KSQL_SYSTEM_STREAM,
+    KsqlException,
+)
+
+if TYPE_CHECKING:
+    from .client import AbstractKsqlClient
+
+BULK_CONCURRENCY = 8
+
+
+class BulkAction(Enum):
+    """Actions of bulk operation."""
+
+    TERMINATE = "TERMINATE"
+    DROP_STREAM = "DROP STREAM"
+
+
+class BulkStatus(Enum):
+    """Statuses of single object in bulk operation."""
+
+    PENDING = "pending"
+    SUCCESS = "success"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+
+class BulkResult:
+    """Action on single object of bulk operation and its result."""
+
+    __slots__ = ("action", "name", "status", "error", "depends_on")
+
+    def __init__(self, action: BulkAction, name: str) -> None:
+        """Initialize class instance."""
+        self.action = action
+        self.name = name
+        self.status = BulkStatus.PENDING
+        self.error: str | None = None
+        self.depends_on: list["BulkResult"] = []
+
+    def __repr__(self) -> str:
+        """Return object representation."""
+        return f"<{self.__class__.__name__}: {self.statement} {self.status.value}>"
+
+    @property
+    def statement(self) -> str:
+        return f"{self.action.value} {quote_identifier(self.name)};"
+
+    @property
+    def ok(self) -> bool:
+        return self.status == BulkStatus.SUCCESS
+
+
+def quote_identifier(name: str) -> str:
+    """Quote case-sensitive identifier (unquoted identifiers are uppercased by ksqlDB)."""
+    return f'"{name}"' if name != name.upper() else name
+
+
+def plan_bulk_delete(
+    sources: list[SourceDescription],
+    streams: Iterable[str] = (),
+    queries: Iterable[str] = (),
+) -> list[list[BulkResult]]:
+    """Split deletion of streams and queries into levels of independent actions.
+
+    All queries that read from or write to deleted streams are terminated on
+    first level. Streams are dropped on next levels, streams that read from other
+    deleted streams (see `sourceConstraints`) go first.
+    """
+    by_name = {source.name: source for source in sources}
+    terminations: dict[str, BulkResult] = {}
+    drops: dict[str, BulkResult] = {}
+
+    for query_id in queries:
+        terminations.setdefault(query_id, BulkResult(BulkAction.TERMINATE, query_id))
+
+    for name in streams:
+        drops.setdefault(name, BulkResult(BulkAction.DROP_STREAM, name))
+
+    for name, drop in drops.items():
+        if name == KSQL_SYSTEM_STREAM:
+            drop.status = BulkStatus.SKIPPED
+            drop.error = _(
+                "Cannot delete {name} system stream from ksqldb-ui. "
+                "This is a protection measure.",
+            ).format(name=KSQL_SYSTEM_STREAM)
+            continue
+        if (source := by_name.get(name)) is None:
+            continue
+        for query in source.readQueries + source.writeQueries:
+            query_id = query["id"]
+            if query_id not in terminations:
+                terminations[query_id] = BulkResult(BulkAction.TERMINATE, query_id)
+            drop.depends_on.append(terminations[query_id])
+        drop.depends_on += [drops[dep] for dep in source.sourceConstraints if dep in drops]
+
+    levels: dict[int, list[BulkResult]] = {}
+    depths: dict[str, int] = {}
+
+    def get_depth(name: str, visited: frozenset[str] = frozenset()) -> int:
+        if name not in depths:
+            dependents = [
+                dep.name
+                for dep in drops[name].depends_on
+                if dep.action == BulkAction.DROP_STREAM and dep.name not in visited
+            ]
+            depths[name] = 1 + max(
+                (get_depth(dep, visited | {name}) for dep in dependents),
+                default=0,
+            )
+        return depths[name]
+
+    for name, drop in drops.items():
+        levels.setdefault(get_depth(name), []).append(drop)
+
+    result = [list(terminations.values())] if terminations else []
+    return result + [levels[depth] for depth in sorted(levels)]
+
+
+async def bulk_delete(
+    ksql: "AbstractKsqlClient",
+    streams: Iterable[str] = (),
+    queries: Iterable[str] = (),
+    concurrency: int = BULK_CONCURRENCY,
+) -> list[BulkResult]:
+    """Terminate queries and drop streams respecting dependencies between them.
+
+    Actions of each level are executed concurrently. Action is skipped if any
+    action it depends on has failed. Results are returned in execution order.
+    """
+    streams = list(streams)
+    sources: list[SourceDescription] = []
+    if streams:
+        response = await ksql.execute_statement("LIST STREAMS EXTENDED", cache=False)
+        sources = response.parsed.sources
+
+    results: list[BulkResult] = []
+    for level in plan_bulk_delete(sources, streams, queries):
+        pending = []
+        for item in level:
+            results.append(item)
+            if item.status != BulkStatus.PENDING:
+                continue
+            if failed := [dep for dep in item.depends_on if not dep.ok]:
+                item.status = BulkStatus.SKIPPED
+                item.error = _("Depends on failed action: {statement}").format(
+                    statement=failed[0].statement,
+                )
+            else:
+                pending.append(item)
+
+        batch = await ksql.execute_many(
+            *(ksql.execute_statement(item.statement) for item in pending),
+            concurrency=concurrency,
+        )
+        for item, batch_result in zip(pending, batch):
+            if batch_result.ok:
+                item.status = BulkStatus.SUCCESS
+            else:
+                item.status = BulkStatus.FAILED
+                error = batch_result.error
+                item.error = error.message if isinstance(error, KsqlException) else str(error)
+
+    return results
@@ -0,0 +1,99 @@
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Hashable,
+)
+
+from app.core.settings import CacheSettings
+
+from .jsonstream import KsqlResponse
+from .lexer import (
+    StatementKind,
+    leading_words,
+)
+from .resources import KsqlQuery
+
+
+class CacheEntry:
+    __slots__ = ("response", "expires_at", "generation")
+
+    def __init__(self, response: KsqlResponse, expires_at: float, generation: int) -> None:
+        """Initialize class instance."""
+        self.response = response
+        self.expires_at = expires_at
+        self.generation = generation
+
+
+class MetadataCache:
+    """Bounded TTL cache for responses of read-only statements of one server.
+
+    Cache is invalidated on every command (CREATE, DROP, TERMINATE, etc), using
+    generation counter: responses requested before command are never stored.
+    """
+
+    def __init__(self, settings: CacheSettings) -> None:
+        """Initialize class instance."""
+        self.enabled = settings.enabled
+        self.size = settings.size
+        self.ttl = {k.lower(): v for k, v in settings.ttl.items()}
+
+        self._entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+        self.generation = 0  # increased on each invalidation
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get_ttl(self, query: KsqlQuery) -> float:
+        """Get TTL for statement (zero if statement must not be cached)."""
+        if not self.enabled or query.kind != StatementKind.METADATA or len(query.statements) > 1:
+            return 0
+
+        words = [w.lower() for w in leading_words(query.canonical, limit=2)]
+        if words and words[0] == "list":
+            words[0] = "show"
+
+        for key in ("_".join(words), words[0] if words else ""):
+            if key in self.ttl:
+                return self.ttl[key]
+        return 0
+
+    def get(self, key: Hashable) -> KsqlResponse | None:
+        """Get cached response if it's not expired."""
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at < time.monotonic():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.response
+
+    def set(self, key: Hashable, response: KsqlResponse, ttl: float, generation: int) -> None:
+        """Store response, unless cache was invalidated after request was sent."""
+        if generation != self.generation:
+            return
+
+        self._entries[key] = CacheEntry(response, time.monotonic() + ttl, generation)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        """Drop all cached responses."""
+        self._entries.clear()
+        self.generation += 1
+        self.invalidations += 1
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_size": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
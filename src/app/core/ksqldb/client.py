@@ -1,29 +1,180 @@
+import asyncio
 import json
+import time
 from abc import (
     ABC,
     abstractmethod,
 )
+from contextlib import suppress
+from functools import (
+    lru_cache,
+    partial,
+)
 from pathlib import Path
-from typing import Any
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Hashable,
+    TypeVar,
+)
 
 import httpx
 from fastapi.requests import Request
 
 from app.core.i18n import _
 from app.core.settings import (
+    CacheSettings,
+    HTTPSettings,
+    Settings,
     get_server_code,
     get_settings,
 )
-from app.core.urls import SimpleURL
+from app.core.utils import (
+    FETCHED_AT_EXTENSION,
+    make_list,
+)
 
+from .breaker import (
+    CircuitBreaker,
+    LatencyTracker,
+)
+from .cache import MetadataCache
+from .jsonstream import (
+    KsqlResponse,
+    read_json_response,
+)
+from .lexer import StatementKind
+from .nodes import (
+    BalancingStrategy,
+    Node,
+    NodePool,
+)
 from .resources import (
     KsqlEndpoints,
     KsqlErrors,
     KsqlException,
     KsqlQuery,
 )
+from .retry import (
+    fits_retry_budget,
+    get_backoff_delay,
+)
+from .stream import (
+    NODE_URL_EXTENSION,
+    KsqlQueryStream,
+    supports_query_stream,
+)
 
 KSQL_CLIENTS_CACHE: dict[str, "AbstractKsqlClient"] = {}
+WARMUP_TIMEOUT = 3
+READ_ONLY_ENDPOINTS = (KsqlEndpoints.INFO, KsqlEndpoints.HEALTH)
+READ_ONLY_KINDS = (StatementKind.METADATA, StatementKind.QUERY)
+UNAVAILABLE_STATUS_CODES = (502, 503, 504)
+BATCH_CONCURRENCY = 8
+
+# Error of /query endpoint about statement that must be sent to /ksql endpoint
+STATEMENT_ENDPOINT_ERROR_CODES = (KsqlErrors.BAD_REQUEST.value, KsqlErrors.BAD_STATEMENT.value)
+STATEMENT_ENDPOINT_ERROR_MESSAGE = "not supported for this resource"
+
+# Seconds to use legacy /query endpoint after failed check of server version
+QUERY_STREAM_PROBE_RETRY_TIME = 60
+
+T = TypeVar("T")
+R = TypeVar("R", bound=httpx.Response)
+
+
+class RequestCoalescer:
+    """Single-flight execution of identical concurrent requests.
+
+    First caller with some key performs request, while other callers with the
+    same key just wait for its result instead of sending own requests.
+    """
+
+    def __init__(self) -> None:
+        """Initialize class instance."""
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self._joined: dict[Hashable, int] = {}
+
+        self.calls = 0  # requests actually sent
+        self.hits = 0  # requests served by another in-flight request
+        self.merges = 0  # sent requests that served several callers
+
+    async def run(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run function or join already running one with the same key."""
+        if (future := self._inflight.get(key)) is not None:
+            self.hits += 1
+            if not self._joined[key]:
+                self.merges += 1
+            self._joined[key] += 1
+
+            try:
+                return await asyncio.shield(future)  # type: ignore[no-any-return]
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # First caller was cancelled, so run function on our own
+                return await self.run(key, fn)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self._joined[key] = 0
+        self.calls += 1
+
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark as retrieved if nobody waits for it
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+            self._joined.pop(key, None)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            "calls": self.calls,
+            "hits": self.hits,
+            "merges": self.merges,
+            "in_flight": len(self._inflight),
+        }
+
+
+class KsqlBatchResult:
+    """Result of single request of batch: response or error."""
+
+    __slots__ = ("response", "error")
+
+    def __init__(
+        self,
+        response: KsqlResponse | None = None,
+        error: Exception | None = None,
+    ) -> None:
+        """Initialize class instance."""
+        self.response = response
+        self.error = error
+
+    def __repr__(self) -> str:
+        """Return object representation."""
+        return f"<{self.__class__.__name__}: {self.error or self.response}>"
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def unwrap(self) -> KsqlResponse:
+        """Get response or raise error of request."""
+        if self.error is not None:
+            raise self.error
+        assert self.response is not None
+        return self.response
 
 
 class AbstractKsqlClient(ABC):
@@ -36,7 +187,7 @@ class AbstractKsqlClient(ABC):
         self,
         statement: str,
         **kwargs: Any,
-    ) -> httpx.Response:
+    ) -> KsqlResponse:
         """Execute a KSQL statement (e.g., CREATE STREAM) and return the result."""
 
     @abstractmethod
@@ -44,7 +195,7 @@ class AbstractKsqlClient(ABC):
         self,
         query: str,
         **kwargs: Any,
-    ) -> httpx.Response:
+    ) -> KsqlResponse:
         """Execute a KSQL query and return the result."""
 
     @abstractmethod
@@ -52,17 +203,66 @@ class AbstractKsqlClient(ABC):
         self,
         statement_or_query: str,
         **kwargs: Any,
-    ) -> httpx.Response:
+    ) -> KsqlResponse:
         """Execute a KSQL statement then fallback to query."""
 
     @abstractmethod
-    async def get_info(self, **kwargs: Any) -> httpx.Response:
+    async def stream_query(
+        self,
+        query: str,
+        properties: dict | None = None,
+    ) -> KsqlQueryStream:
+        """Prepare streaming KSQL query, rows are read as they arrive."""
+
+    @abstractmethod
+    async def get_info(self, **kwargs: Any) -> KsqlResponse:
         """Get server info."""
 
     @abstractmethod
-    async def get_health(self, **kwargs: Any) -> httpx.Response:
+    async def get_health(self, **kwargs: Any) -> KsqlResponse:
         """Get server health."""
 
+    async def execute_many(
+        self,
+        *requests: str | Awaitable[KsqlResponse],
+        concurrency: int = BATCH_CONCURRENCY,
+    ) -> list[KsqlBatchResult]:
+        """Execute requests concurrently, results are in the same order as requests.
+
+        Each request is either statement or awaitable of client method, like
+        `ksql.get_info()`. Failure of one request doesn't affect others.
+
+        :param concurrency: max number of requests sent at once
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(request: str | Awaitable[KsqlResponse]) -> KsqlBatchResult:
+            async with semaphore:
+                try:
+                    if isinstance(request, str):
+                        return KsqlBatchResult(response=await self.execute_statement(request))
+                    return KsqlBatchResult(response=await request)
+                except Exception as e:
+                    return KsqlBatchResult(error=e)
+
+        return list(await asyncio.gather(*(run(request) for request in requests)))
+
+    async def warmup(self) -> None:
+        """Prepare client for first requests."""
+
+    async def close(self) -> None:
+        """Release all resources held by client."""
+
+    @property
+    def pool_stats(self) -> dict[str, Any]:
+        """Get connection pool stats for debugging."""
+        return {}
+
+    @property
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Get all client stats for debugging (grouped by sections)."""
+        return {}
+
 
 class KsqlClient(AbstractKsqlClient):
 
@@ -70,18 +270,162 @@ class KsqlClient(AbstractKsqlClient):
 
     def __init__(
         self,
-        url: str,
+        url: str | list[str],
         timeout: int = 10,
+        http: HTTPSettings | None = None,
+        cache: CacheSettings | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        balancing: str = BalancingStrategy.ROUND_ROBIN.value,
     ) -> None:
-        """Initialize class instance."""
-        self.url = SimpleURL(url)
+        """Initialize class instance.
+
+        :param url: URL of server or list of URLs of its nodes (first node is preferred)
+        """
+        urls = [url] if isinstance(url, str) else url
         self.timeout = timeout
+        self.http = http or HTTPSettings(timeout=timeout)
+        self.nodes = NodePool(
+            urls=urls,
+            strategy=BalancingStrategy(balancing),
+            max_failures=self.http.node_max_failures,
+            eject_time=self.http.node_eject_time,
+        )
+        self.url = self.nodes.nodes[0].url
+        self._probes: set[asyncio.Task] = set()
+
+        self.breaker = CircuitBreaker(
+            max_failures=self.http.breaker_failures,
+            reset_time=self.http.breaker_reset_time,
+        )
+        self.latency = LatencyTracker(
+            min_timeout=min(self.http.min_timeout, timeout),
+            max_timeout=timeout,
+        )
+        self._transport = transport
+        self._session: httpx.AsyncClient | None = None
+        self._query_stream_supported: bool | None = None
+        self._query_stream_probe_retry_at: float | None = None
+
+        # Statement shapes that were sent to wrong endpoint
+        self._routes: dict[str, KsqlEndpoints] = {}
+
+        self.coalescer = RequestCoalescer()
+        self.cache = MetadataCache(cache or CacheSettings())
+
+        # Sequence number of last executed command, used as consistency token
+        self.command_sequence: int | None = None
+
+        self.retries = 0  # retried requests
+        self.retries_exhausted = 0  # requests that failed after all retries
+
+    @property
+    def session(self) -> httpx.AsyncClient:
+        """Get persistent pooled HTTP session (opened on first use)."""
+        if self._session is None or self._session.is_closed:
+            self._session = httpx.AsyncClient(
+                headers={
+                    "Accept": self.ACCEPT_HEADER,
+                    "Accept-Encoding": "gzip" if self.http.gzip else "identity",
+                },
+                limits=httpx.Limits(
+                    max_connections=self.http.max_connections,
+                    max_keepalive_connections=self.http.max_keepalive_connections,
+                    keepalive_expiry=self.http.keepalive_expiry,
+                ),
+                http2=self.http.http2,
+                timeout=self.timeout,
+                transport=self._transport,
+            )
+
+        return self._session
+
+    async def warmup(self) -> None:
+        """Open session and establish first connection to each node."""
+        await asyncio.gather(*(self._check_node(node) for node in self.nodes.nodes))
+
+    async def _check_node(self, node: Node) -> bool:
+        """Check node health (result is reported to node pool)."""
+        try:
+            response = await self.session.get(
+                str(node.url / KsqlEndpoints.HEALTH.value),
+                timeout=min(self.timeout, WARMUP_TIMEOUT),
+            )
+        except httpx.HTTPError:
+            self.nodes.report_failure(node)
+            return False
+
+        if response.status_code in UNAVAILABLE_STATUS_CODES:
+            self.nodes.report_failure(node)
+            return False
+
+        self.nodes.report_success(node)
+        return True
+
+    async def _probe_node(self, node: Node) -> None:
+        """Probe ejected node to bring it back."""
+        node.probing = True
+        try:
+            await self._check_node(node)
+        finally:
+            node.probing = False
+
+    def _schedule_probes(self) -> None:
+        for node in self.nodes.due_for_probe():
+            task = asyncio.create_task(self._probe_node(node))
+            self._probes.add(task)
+            task.add_done_callback(self._probes.discard)
+
+    async def close(self) -> None:
+        """Close session and all pooled connections."""
+        for task in self._probes:
+            task.cancel()
+
+        if self._session is not None:
+            await self._session.aclose()
+            self._session = None
+
+    @property
+    def pool_stats(self) -> dict[str, Any]:
+        """Get connection pool stats for debugging."""
+        stats: dict[str, Any] = {
+            "url": ", ".join(str(node.url) for node in self.nodes.nodes),
+            "open": self._session is not None and not self._session.is_closed,
+            "http2": self.http.http2,
+            "max_connections": self.http.max_connections,
+            "max_keepalive_connections": self.http.max_keepalive_connections,
+            "keepalive_expiry": self.http.keepalive_expiry,
+        }
+
+        # Connections are tracked by httpcore pool inside default transport
+        pool = getattr(getattr(self._session, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+        stats["connections"] = len(connections)
+        stats["idle"] = sum(1 for conn in connections if conn.is_idle())
+        stats["active"] = stats["connections"] - stats["idle"]
+        return stats
+
+    @property
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Get all client stats for debugging (grouped by sections)."""
+        return {
+            "pool": self.pool_stats,
+            "nodes": self.nodes.stats,
+            "breaker": self.breaker.stats,
+            "timeouts": {"adaptive": self.http.adaptive_timeout, **self.latency.stats},
+            "retries": {
+                "max_retries": self.http.retries,
+                "retries": self.retries,
+                "exhausted": self.retries_exhausted,
+            },
+            "coalescing": self.coalescer.stats,
+            "cache": {**self.cache.stats, "command_sequence": self.command_sequence},
+        }
 
     async def execute_statement(
         self,
         statement: str,
         **kwargs: Any,
-    ) -> httpx.Response:
+    ) -> KsqlResponse:
         """Execute a KSQL statement."""
         return await self._request(
             query=KsqlQuery(statement),
@@ -94,7 +438,7 @@ class KsqlClient(AbstractKsqlClient):
         self,
         query: str,
         **kwargs: Any,
-    ) -> httpx.Response:
+    ) -> KsqlResponse:
         """Execute a KSQL query."""
         return await self._request(
             query=KsqlQuery(query),
@@ -106,24 +450,98 @@ class KsqlClient(AbstractKsqlClient):
     async def execute_statement_then_query(
         self,
         statement_or_query: str,
+        properties: dict[str, str] | None = None,
+        variables: dict[str, str] | None = None,
         **kwargs: Any,
-    ) -> httpx.Response:
-        """Execute a KSQL statement then fallback to query."""
+    ) -> KsqlResponse:
+        """Execute a KSQL statement or query using endpoint picked by statement kind.
+
+        If statement is sent to wrong endpoint, it's retried using another one and
+        its shape is remembered to pick right endpoint next time.
+
+        :param properties: streams properties (set by SET statements)
+        :param variables: session variables (defined by DEFINE statements)
+        """
+        query = KsqlQuery(statement_or_query)
+        endpoint = self._routes.get(query.shape, query.endpoint)
+        session = {"properties": properties, "variables": variables}
+
+        if endpoint == KsqlEndpoints.QUERY:
+            query_response = await self.execute_query(
+                statement_or_query,
+                raise_exc=False,
+                **session,
+            )
+            if not is_statement_endpoint_error(query_response):
+                return self._check_response(query_response, query, **kwargs)
+
+            # It's not a query for server, so it's executed using /ksql endpoint
+            statement_response = await self.execute_statement(
+                statement_or_query,
+                raise_exc=False,
+                **session,
+            )
+            if is_query_endpoint_error(statement_response):
+                return self._check_response(query_response, query, **kwargs)
+
+            if statement_response.is_success:
+                self._routes[query.shape] = KsqlEndpoints.KSQL
+            return statement_response
+
         statement_response = await self.execute_statement(
             statement_or_query,
             raise_exc=False,
+            **session,
             **kwargs,
         )
 
-        if (
-            statement_response.status_code == 400
-            and statement_response.json()["error_code"] == KsqlErrors.QUERY_ENDPOINT.value
-        ):
-            return await self.execute_query(statement_or_query, **kwargs)
+        if is_query_endpoint_error(statement_response):
+            self._routes[query.shape] = KsqlEndpoints.QUERY
+            return await self.execute_query(statement_or_query, **session, **kwargs)
 
         return statement_response
 
-    async def get_info(self, **kwargs: Any) -> httpx.Response:
+    async def stream_query(
+        self,
+        query: str,
+        properties: dict | None = None,
+    ) -> KsqlQueryStream:
+        """Prepare streaming KSQL query using /query-stream endpoint.
+
+        Older servers without /query-stream support get streamed /query request.
+        """
+        retry_at = self._query_stream_probe_retry_at
+        if self._query_stream_supported is None or (
+            retry_at is not None and retry_at <= time.monotonic()
+        ):
+            self._query_stream_supported = await self._probe_query_stream()
+
+        return KsqlQueryStream(
+            session=self.session,
+            send=self._open_stream,
+            query=KsqlQuery(query),
+            legacy=not self._query_stream_supported,
+            timeout=self.timeout,
+            properties=properties,
+        )
+
+    async def _probe_query_stream(self) -> bool:
+        """Check if server supports /query-stream endpoint by its version.
+
+        If server version is unknown (e.g. server is unavailable), legacy endpoint
+        is used and check is repeated later, so it's not sent with every query.
+        """
+        try:
+            info = await self.get_info(raise_exc=False)
+            version = info.json()["KsqlServerInfo"]["version"]
+        except Exception:
+            self._query_stream_probe_retry_at = time.monotonic() + QUERY_STREAM_PROBE_RETRY_TIME
+            return False
+
+        self._query_stream_probe_retry_at = None
+        return supports_query_stream(version)
+
+    async def get_info(self, **kwargs: Any) -> KsqlResponse:
         """Get server info."""
         return await self._request(
             query=KsqlQuery(""),
@@ -132,7 +550,7 @@ class KsqlClient(AbstractKsqlClient):
             **kwargs,
         )
 
-    async def get_health(self, **kwargs: Any) -> httpx.Response:
+    async def get_health(self, **kwargs: Any) -> KsqlResponse:
         """Get server health."""
         return await self._request(
             query=KsqlQuery(""),
@@ -149,33 +567,288 @@ class KsqlClient(AbstractKsqlClient):
         raise_exc: bool = True,
         exc_message: str | None = None,
         list_page_url: str | None = None,
-    ) -> httpx.Response:
-        """Get response from endpoint"""
-        full_url = self.url / endpoint.value
-        async with httpx.AsyncClient() as client:
-            response = await client.request(
+        cache: bool = True,
+        properties: dict[str, str] | None = None,
+        variables: dict[str, str] | None = None,
+    ) -> KsqlResponse:
+        """Get response from endpoint.
+
+        :param cache: use cached response of read-only statement (if it's not expired)
+        :param properties: streams properties of request
+        :param variables: session variables of request
+        """
+        key: tuple = (method, endpoint, query.canonical)
+        if properties or variables:
+            key += (
+                tuple(sorted((properties or {}).items())),
+                tuple(sorted((variables or {}).items())),
+            )
+        ttl = self.cache.get_ttl(query) if endpoint == KsqlEndpoints.KSQL else 0
+        if ttl and cache and (cached := self.cache.get(key)) is not None:
+            return self._check_response(cached, query, raise_exc, exc_message, list_page_url)
+
+        generation = self.cache.generation
+        send = partial(
+            self._send,
+            query=query,
+            method=method,
+            endpoint=endpoint,
+            properties=properties,
+            variables=variables,
+        )
+
+        # Identical concurrent read-only requests share one upstream call
+        if is_read_only(query, endpoint):
+            response = await self.coalescer.run(key, partial(self._send_with_retries, send))
+        else:
+            response = await send()
+            if endpoint == KsqlEndpoints.KSQL:
+                self._on_command_executed(response)
+
+        if ttl and response.is_success and not getattr(response, "truncated", False):
+            self.cache.set(key, response, ttl, generation)
+
+        return self._check_response(response, query, raise_exc, exc_message, list_page_url)
+
+    def _on_command_executed(self, response: httpx.Response) -> None:
+        """Invalidate cache and remember command sequence number after command."""
+        self.cache.invalidate()
+        if not response.is_success:
+            return
+
+        with suppress(Exception):
+            numbers = [
+                int(entry["commandSequenceNumber"])
+                for entry in make_list(response.json())
+                if "commandSequenceNumber" in entry
+            ]
+            if numbers:
+                self.command_sequence = max(numbers + [self.command_sequence or 0])
+
+    async def _send_with_retries(
+        self,
+        send: Callable[[], Awaitable[KsqlResponse]],
+    ) -> KsqlResponse:
+        """Send idempotent request, retrying transient failures with backoff.
+
+        Total time of retries is limited by budget of current page render.
+        """
+        attempt = 0
+        while True:
+            error: httpx.TransportError | None = None
+            try:
+                response = await send()
+                if response.status_code not in UNAVAILABLE_STATUS_CODES:
+                    return response
+            except httpx.TransportError as e:
+                error = e
+
+            delay = get_backoff_delay(attempt, self.http.retry_backoff, self.http.retry_max_backoff)
+            if attempt >= self.http.retries or not fits_retry_budget(delay):
+                if self.http.retries:
+                    self.retries_exhausted += 1
+                if error is not None:
+                    raise error
+                return response
+
+            attempt += 1
+            self.retries += 1
+            await asyncio.sleep(delay)
+
+    async def _send(
+        self,
+        query: KsqlQuery,
+        method: str,
+        endpoint: KsqlEndpoints,
+        properties: dict[str, str] | None = None,
+        variables: dict[str, str] | None = None,
+    ) -> KsqlResponse:
+        """Send request to ksqlDB server."""
+        body: dict[str, Any] = {
+            "ksql": query.as_string,
+            "streamsProperties": properties or {},
+        }
+        if variables:
+            body["sessionVariables"] = variables
+
+        # Server will wait for all previously executed commands to complete
+        if endpoint == KsqlEndpoints.KSQL and self.command_sequence is not None:
+            body["commandSequenceNumber"] = self.command_sequence
+
+        # Commands may take long, so only read-only requests get adaptive timeouts
+        read_only = is_read_only(query, endpoint)
+        latency_key = (endpoint.value, query.kind.value)
+        timeout: float = self.timeout
+        if read_only and self.http.adaptive_timeout:
+            timeout = self.latency.get_timeout(latency_key)
+
+        async def send_to_node(node: Node) -> KsqlResponse:
+            request = self.session.build_request(
                 method=method,
-                url=str(full_url),
-                json={
-                    "ksql": query.as_string,
-                    # TODO: Add custom streamsProperties
-                    "streamsProperties": {},
-                },
-                headers={
-                    "Accept": self.ACCEPT_HEADER,
-                },
-                timeout=self.timeout,
+                url=str(node.url / endpoint.value),
+                json=body,
+                timeout=timeout,
+            )
+            # Large bodies are parsed while they are received
+            return await read_json_response(
+                await self.session.send(request, stream=True),
+                max_size=self.http.max_response_size,
             )
 
-            if raise_exc and not response.is_success:
-                raise KsqlException(
-                    info=exc_message or _("Failed to execute ksqlDB request: {}").format(query),
-                    response=response,
-                    list_page_url=list_page_url,
-                )
+        started_at = time.monotonic()
+        try:
+            response = await self._send_with_breaker(read_only, send_to_node)
+        except httpx.TimeoutException:
+            self.latency.record_timeout(latency_key)
+            raise
+
+        if response.status_code not in UNAVAILABLE_STATUS_CODES:
+            self.latency.record(latency_key, time.monotonic() - started_at)
+
+        response.extensions[FETCHED_AT_EXTENSION] = time.time()
+        return response
 
+    async def _open_stream(
+        self,
+        endpoint: KsqlEndpoints,
+        body: dict,
+        headers: dict[str, str],
+        timeout: httpx.Timeout,
+    ) -> httpx.Response:
+        """Send streamed read-only request, which body is read by caller.
+
+        URL of node that sent response is saved to its extensions, so query
+        can be closed on the same node.
+        """
+
+        async def send_to_node(node: Node) -> httpx.Response:
+            request = self.session.build_request(
+                method="POST",
+                url=str(node.url / endpoint.value),
+                json=body,
+                headers=headers,
+                timeout=timeout,
+            )
+            response = await self.session.send(request, stream=True)
+            response.extensions[NODE_URL_EXTENSION] = node.url
             return response
 
+        return await self._send_with_breaker(True, send_to_node)
+
+    async def _send_with_breaker(
+        self,
+        read_only: bool,
+        send_to_node: Callable[[Node], Awaitable[R]],
+    ) -> R:
+        """Send request to nodes if circuit breaker allows it, reporting result to breaker."""
+        self.breaker.check()
+        try:
+            response = await self._send_to_nodes(read_only, send_to_node)
+        except Exception:
+            self.breaker.report_failure()
+            raise
+        except BaseException:
+            # Request is cancelled (e.g. client disconnected), which says nothing about server
+            self.breaker.release_trial()
+            raise
+
+        if response.status_code in UNAVAILABLE_STATUS_CODES:
+            self.breaker.report_failure()
+        else:
+            self.breaker.report_success()
+        return response
+
+    async def _send_to_nodes(
+        self,
+        read_only: bool,
+        send_to_node: Callable[[Node], Awaitable[R]],
+    ) -> R:
+        """Send request to best node, failing over to other nodes if possible."""
+        self._schedule_probes()
+        candidates = self.nodes.candidates(read_only)
+        for i, node in enumerate(candidates, start=1):
+            node.outstanding += 1
+            try:
+                response = await send_to_node(node)
+            except httpx.TransportError as e:
+                self.nodes.report_failure(node)
+                # Request surely didn't reach server if connection failed,
+                # otherwise only read-only requests can be sent to another node.
+                if i == len(candidates) or not (read_only or isinstance(e, httpx.ConnectError)):
+                    raise
+                continue
+            finally:
+                node.outstanding -= 1
+
+            if response.status_code in UNAVAILABLE_STATUS_CODES:
+                self.nodes.report_failure(node)
+            else:
+                self.nodes.report_success(node)
+            break
+
+        return response
+
+    def _check_response(
+        self,
+        response: KsqlResponse,
+        query: KsqlQuery,
+        raise_exc: bool = True,
+        exc_message: str | None = None,
+        list_page_url: str | None = None,
+        **kwargs: Any,
+    ) -> KsqlResponse:
+        """Raise exception for failed response (if required)."""
+        if raise_exc and not response.is_success:
+            raise KsqlException(
+                info=exc_message or _("Failed to execute ksqlDB request: {}").format(query),
+                response=response,
+                list_page_url=list_page_url,
+            )
+
+        return response
+
+
+def is_read_only(query: KsqlQuery, endpoint: KsqlEndpoints) -> bool:
+    """Check if request doesn't modify anything on server.
+
+    Queries sent to /ksql endpoint (e.g. after /query rejected them) are read-only too.
+    """
+    if endpoint in READ_ONLY_ENDPOINTS:
+        return True
+    return endpoint == KsqlEndpoints.KSQL and query.kind in READ_ONLY_KINDS
+
+
+def is_statement_endpoint_error(response: httpx.Response) -> bool:
+    """Check if response is error about using /ksql endpoint instead of /query."""
+    if response.status_code != 400:
+        return False
+
+    try:
+        data = response.json()
+        return bool(
+            data["error_code"] in STATEMENT_ENDPOINT_ERROR_CODES
+            and STATEMENT_ENDPOINT_ERROR_MESSAGE in data["message"]
+        )
+    except Exception:
+        return False
+
+
+def is_query_endpoint_error(response: httpx.Response) -> bool:
+    """Check if response is error about using /query endpoint instead of /ksql."""
+    if response.status_code != 400:
+        return False
+
+    try:
+        return bool(response.json()["error_code"] == KsqlErrors.QUERY_ENDPOINT.value)
+    except Exception:
+        return False
+
+
+@lru_cache(maxsize=None)
+def load_mock_response(path: Path) -> str:
+    """Read file with mocked response once."""
+    return path.read_text()
+
 
 class MockKsqlClient(KsqlClient):
     """Mock class for KSQL requests to simulate responses."""
@@ -187,12 +860,13 @@ class MockKsqlClient(KsqlClient):
         KsqlEndpoints.KSQL: {
             "LIST STREAMS EXTENDED;": "list_streams_extended.json",
             "SHOW PROPERTIES;": "show_properties.json",
+            "SHOW QUERIES;": "show_queries.json",
         },
     }
 
     def __init__(self) -> None:
         """Initialize class instance."""
-        self.url = SimpleURL("http://localhost.test")
+        super().__init__("http://localhost.test")
         self.response_dir = Path(__file__).parent / "responses"
 
     async def _request(
@@ -203,29 +877,39 @@ class MockKsqlClient(KsqlClient):
         raise_exc: bool = True,
         exc_message: str | None = None,
         list_page_url: str | None = None,
-    ) -> httpx.Response:
+        cache: bool = True,
+        properties: dict[str, str] | None = None,
+        variables: dict[str, str] | None = None,
+    ) -> KsqlResponse:
         """Get response from endpoint"""
         file_name = self.RESPONSES_MAP.get(endpoint, {}).get(query.as_string)
         if not file_name:
             raise ValueError(f'No mocked response for {endpoint} query: "{query}"')
 
-        with open(self.response_dir / file_name, "r") as f:
-            mock_response_data = json.load(f)
+        mock_response_data = json.loads(load_mock_response(self.response_dir / file_name))
 
         full_url = self.url / endpoint.value
-        return httpx.Response(
+        response = httpx.Response(
             status_code=200,
             json=mock_response_data,
             request=httpx.Request(method, str(full_url)),
         )
+        return KsqlResponse(response, data=mock_response_data)
 
 
-def get_ksql_client(request: Request) -> AbstractKsqlClient:
-    """Get KsqlDB client depending on scope."""
+def get_ksql_client(request: Request, server_code: str | None = None) -> AbstractKsqlClient:
+    """Get KsqlDB client depending on scope.
+
+    :param server_code: code of server, current server of request by default
+    """
     if request.scope.get("test", False):
         return MockKsqlClient()
 
-    code = get_server_code(request)
+    return get_server_ksql_client(server_code or get_server_code(request))
+
+
+def get_server_ksql_client(code: str) -> AbstractKsqlClient:
+    """Get KsqlDB client for server by its code."""
     if code in KSQL_CLIENTS_CACHE:
         return KSQL_CLIENTS_CACHE[code]
 
@@ -233,9 +917,25 @@ def get_ksql_client(request: Request) -> AbstractKsqlClient:
     server = settings.get_server(code)
 
     new_client = KsqlClient(
-        url=server.url,
+        url=server.urls,
         timeout=settings.http.timeout,
+        http=settings.http,
+        cache=settings.cache,
+        balancing=server.load_balancing,
     )
 
     KSQL_CLIENTS_CACHE[code] = new_client
     return new_client
+
+
+async def warmup_ksql_clients(settings: Settings) -> None:
+    """Create clients for all servers and open their connections."""
+    clients = [get_server_ksql_client(code) for code in settings.servers]
+    await asyncio.gather(*(client.warmup() for client in clients))
+
+
+async def close_ksql_clients() -> None:
+    """Close all cached clients (on app shutdown)."""
+    clients = list(KSQL_CLIENTS_CACHE.values())
+    KSQL_CLIENTS_CACHE.clear()
+    await asyncio.gather(*(client.close() for client in clients))
@@ -0,0 +1,163 @@
+import hashlib
+from enum import Enum
+from typing import (
+    Iterable,
+    Mapping,
+)
+
+from .lexer import normalize
+from .models import (
+    Query,
+    SourceDescription,
+)
+
+DIFF_CONCURRENCY = 16
+
+
+class CatalogKind(Enum):
+    """Kinds of compared catalog objects."""
+
+    STREAM = "stream"
+    QUERY = "query"
+
+
+# Compared aspects of objects by their kinds
+CATALOG_ASPECTS = {
+    CatalogKind.STREAM: ("fields", "format", "topic"),
+    CatalogKind.QUERY: ("query",),
+}
+
+CatalogKey = tuple[CatalogKind, str]  # (kind, name)
+Catalog = dict[CatalogKey, "CatalogObject"]
+
+
+class CatalogObject:
+    """Normalized aspects of stream or query with their hashes."""
+
+    __slots__ = ("kind", "name", "aspects", "hashes", "digest")
+
+    def __init__(self, kind: CatalogKind, name: str, aspects: dict[str, str]) -> None:
+        """Initialize class instance."""
+        self.kind = kind
+        self.name = name
+        self.aspects = aspects
+        self.hashes = {aspect: get_hash(value) for aspect, value in aspects.items()}
+        self.digest = get_hash("".join(self.hashes.values()))
+
+    def __repr__(self) -> str:
+        """Return object representation."""
+        return f"<{self.__class__.__name__}: {self.kind.value} {self.name}>"
+
+
+class DiffEntry:
+    """Object that is missing or differs on some servers."""
+
+    __slots__ = ("kind", "name", "objects", "aspects")
+
+    def __init__(
+        self,
+        kind: CatalogKind,
+        name: str,
+        objects: dict[str, CatalogObject | None],
+        aspects: list[str],
+    ) -> None:
+        """Initialize class instance."""
+        self.kind = kind
+        self.name = name
+        self.objects = objects  # by server codes, None if object is missing
+        self.aspects = aspects  # differing aspects of existing objects
+
+    def __repr__(self) -> str:
+        """Return object representation."""
+        return f"<{self.__class__.__name__}: {self.kind.value} {self.name}>"
+
+    @property
+    def missing(self) -> list[str]:
+        """Get codes of servers without object."""
+        return [code for code, obj in self.objects.items() if obj is None]
+
+
+def get_hash(value: str) -> str:
+    return hashlib.blake2b(value.encode(), digest_size=8).hexdigest()
+
+
+def format_schema(schema: dict | None) -> str:
+    """Format schema of field from source description, e.g. `ARRAY<STRING>`."""
+    if not schema:
+        return ""
+    if schema.get("fields"):
+        return f"STRUCT<{format_fields(schema['fields'])}>"
+    if member := schema.get("memberSchema"):
+        if schema.get("type") == "MAP":
+            return f"MAP<STRING, {format_schema(member)}>"
+        return f"{schema.get('type', '')}<{format_schema(member)}>"
+    return str(schema.get("type", ""))
+
+
+def format_fields(fields: list[dict]) -> str:
+    """Format fields of source description in their order, marking key fields."""
+    return ", ".join(
+        f"{f.get('name')} {format_schema(f.get('schema'))}"
+        + (" KEY" if f.get("type") == "KEY" else "")
+        for f in fields
+    )
+
+
+def get_query_name(query: Query) -> str:
+    """Get name to match query by, IDs are generated and differ between servers."""
+    return ", ".join(sorted(query.sinks)) or query.id
+
+
+def build_catalog(sources: Iterable[SourceDescription], queries: Iterable[Query]) -> Catalog:
+    """Build catalog of server objects by their kinds and names."""
+    catalog: Catalog = {}
+    for source in sources:
+        catalog[(CatalogKind.STREAM, source.name)] = CatalogObject(
+            CatalogKind.STREAM,
+            source.name,
+            {
+                "fields": format_fields(source.fields),
+                "format": f"{source.keyFormat} / {source.valueFormat}",
+                "topic": source.topic,
+            },
+        )
+
+    for query in queries:
+        # Transient queries (without sinks) only exist while someone reads them
+        if not query.sinks:
+            continue
+        name = get_query_name(query)
+        catalog[(CatalogKind.QUERY, name)] = CatalogObject(
+            CatalogKind.QUERY,
+            name,
+            {"query": normalize(query.queryString, upper=True)},
+        )
+
+    return catalog
+
+
+def diff_catalogs(catalogs: Mapping[str, Catalog]) -> list[DiffEntry]:
+    """Compare catalogs of servers, returning only objects that differ.
+
+    Objects are matched by their names and compared by hashes, so it takes
+    linear time of total number of objects.
+    """
+    keys: dict[CatalogKey, None] = {}
+    for catalog in catalogs.values():
+        keys.update(dict.fromkeys(catalog))
+
+    entries = []
+    for kind, name in sorted(keys, key=lambda key: (key[0].value, key[1])):
+        objects = {code: catalog.get((kind, name)) for code, catalog in catalogs.items()}
+        existing = [obj for obj in objects.values() if obj is not None]
+        if len(existing) == len(objects) and len({obj.digest for obj in existing}) == 1:
+            continue
+
+        aspects = [
+            aspect
+            for aspect in CATALOG_ASPECTS[kind]
+            if len({obj.hashes[aspect] for obj in existing}) > 1
+        ]
+        entries.append(DiffEntry(kind, name, objects, aspects))
+
+    return entries
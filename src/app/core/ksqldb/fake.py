@@ -0,0 +1,391 @@
+import asyncio
+import json
+import math
+import random
+from contextlib import asynccontextmanager
+from os import getenv
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+)
+
+import httpx
+from dynaconf import Dynaconf
+from pydantic import BaseModel
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import (
+    Response,
+    StreamingResponse,
+)
+from starlette.routing import Route
+
+from app.core.settings import LowercaseKeyMixin
+
+from .lexer import (
+    leading_words,
+    normalize,
+)
+from .resources import KsqlEndpoints
+
+FAKE_ENV_VAR_PREFIX = "FAKE_KSQLDB"
+FAKE_VERSION = "0.29.0-fake"
+JSON_CONTENT_TYPE = "application/json"
+
+# Endpoints served by fake server and their methods
+FAKE_ENDPOINTS = {
+    KsqlEndpoints.KSQL: "POST",
+    KsqlEndpoints.QUERY: "POST",
+    KsqlEndpoints.INFO: "GET",
+    KsqlEndpoints.HEALTH: "GET",
+}
+
+
+class FakeEndpointSettings(LowercaseKeyMixin, BaseModel):
+    """Behavior of single endpoint of fake server."""
+
+    latency: float = 0  # Median latency in seconds
+    latency_spread: float = 0  # Sigma of log-normal latency distribution (0 - fixed latency)
+    error_rate: float = 0  # Share of requests failed with "error_status" (0..1)
+    error_status: int = 503
+    chunk_size: int = 0  # Body is streamed by chunks of this size in bytes (0 - at once)
+    chunk_delay: float = 0  # Seconds between chunks of streamed body
+
+
+class FakeSettings(LowercaseKeyMixin, BaseModel):
+    """Settings of fake ksqlDB server."""
+
+    cassette: str | None = None  # Path to cassette file (JSON Lines) with recorded exchanges
+    record_url: str | None = None  # Real ksqlDB server to record exchanges from
+    streams: int = 10  # Number of streams in synthetic responses
+    fields: int = 5  # Number of fields of each synthetic stream
+    rows: int = 100  # Number of rows in synthetic SELECT responses
+    seed: int | None = None  # Seed for latencies and errors (random by default)
+    endpoints: dict[str, FakeEndpointSettings] = {}  # By endpoints, e.g. "ksql"
+
+    @classmethod
+    def from_env(cls) -> "FakeSettings":
+        """Get settings from .toml file (FAKE_KSQLDB_CONFIG) or env vars."""
+        config = Dynaconf(
+            envvar_prefix=FAKE_ENV_VAR_PREFIX + "_",
+            settings_file=getenv(f"{FAKE_ENV_VAR_PREFIX}_CONFIG"),
+        )
+        return cls(**{k.lower(): v for k, v in config.as_dict().items()})
+
+    def get_endpoint(self, endpoint: KsqlEndpoints) -> FakeEndpointSettings:
+        for name, behavior in self.endpoints.items():
+            if name.lower() == endpoint.value:
+                return behavior
+        return FakeEndpointSettings()
+
+
+class FakeResponse:
+    """Response of fake server before fault injection."""
+
+    __slots__ = ("status", "content_type", "body")
+
+    def __init__(self, status: int, body: bytes, content_type: str = JSON_CONTENT_TYPE) -> None:
+        """Initialize class instance."""
+        self.status = status
+        self.content_type = content_type
+        self.body = body
+
+    @classmethod
+    def from_data(cls, data: Any, status: int = 200) -> "FakeResponse":
+        return cls(status, json.dumps(data).encode())
+
+
+class Cassette:
+    """Recorded exchanges with ksqlDB server, kept in memory and appended to file.
+
+    File has JSON Lines format (one exchange per line), so each recorded exchange
+    is appended without rewriting the whole file. Exchanges are matched by method,
+    endpoint and normalized statement. Several responses recorded for the same
+    request are replayed in turn.
+    """
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        """Initialize class instance."""
+        self.path = Path(path) if path else None
+        self.exchanges: dict[str, list[FakeResponse]] = {}
+        self._replayed: dict[str, int] = {}
+
+        if self.path and self.path.exists():
+            with self.path.open() as f:
+                for line in filter(str.strip, f):
+                    item = json.loads(line)
+                    self.exchanges.setdefault(item["key"], []).append(
+                        FakeResponse(item["status"], item["body"].encode(), item["content_type"]),
+                    )
+
+    def __len__(self) -> int:
+        return sum(len(responses) for responses in self.exchanges.values())
+
+    @staticmethod
+    def get_key(method: str, endpoint: KsqlEndpoints, body: bytes) -> str:
+        return f"{method} /{endpoint.value} {get_statement(body)}".strip()
+
+    def replay(self, key: str) -> FakeResponse | None:
+        if not (responses := self.exchanges.get(key)):
+            return None
+        index = self._replayed.get(key, 0)
+        self._replayed[key] = index + 1
+        return responses[index % len(responses)]
+
+    async def record(self, key: str, response: FakeResponse) -> None:
+        self.exchanges.setdefault(key, []).append(response)
+        if self.path:
+            # File is written in thread, so event loop is not blocked by disk
+            await asyncio.to_thread(self.append, key, response)
+
+    def append(self, key: str, response: FakeResponse) -> None:
+        assert self.path is not None
+        item = {
+            "key": key,
+            "status": response.status,
+            "content_type": response.content_type,
+            "body": response.body.decode(errors="replace"),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a") as f:
+            f.write(json.dumps(item) + "\n")
+
+
+def get_statement(body: bytes) -> str:
+    """Get normalized statement from request body."""
+    try:
+        data = json.loads(body) if body else {}
+    except json.JSONDecodeError:
+        return ""
+    if not isinstance(data, dict):
+        return ""
+    return normalize(data.get("ksql") or data.get("sql") or "", upper=True)
+
+
+class SyntheticResponses:
+    """Generated responses of configurable size for requests missing in cassette."""
+
+    def __init__(self, settings: FakeSettings) -> None:
+        """Initialize class instance."""
+        self.settings = settings
+
+    def get(self, endpoint: KsqlEndpoints, statement: str) -> FakeResponse:
+        if endpoint == KsqlEndpoints.INFO:
+            return FakeResponse.from_data(
+                {
+                    "KsqlServerInfo": {
+                        "version": FAKE_VERSION,
+                        "kafkaClusterId": "fake",
+                        "ksqlServiceId": "fake_",
+                        "serverStatus": "RUNNING",
+                    },
+                },
+            )
+        if endpoint == KsqlEndpoints.HEALTH:
+            return FakeResponse.from_data({"isHealthy": True, "details": {}})
+        if endpoint == KsqlEndpoints.QUERY:
+            return FakeResponse.from_data(self.select())
+
+        data: dict[str, Any]
+        words = leading_words(statement, limit=3)
+        kind = words[1] if len(words) > 1 and words[0] in ("SHOW", "LIST") else ""
+        extended = "EXTENDED" in words
+        if kind == "STREAMS" and extended:
+            data = {"sourceDescriptions": [self.source(i) for i in range(self.settings.streams)]}
+        elif kind == "STREAMS":
+            data = {"streams": [self.stream(i) for i in range(self.settings.streams)]}
+        elif kind == "TOPICS":
+            data = {"topics": [self.topic(i) for i in range(self.settings.streams)]}
+        elif kind == "QUERIES":
+            data = {"queries": [self.query(i) for i in range(self.settings.streams)]}
+        elif kind == "PROPERTIES":
+            data = {"properties": []}
+        elif words[:1] == ["DESCRIBE"]:
+            data = {"sourceDescription": self.source(0)}
+        else:
+            data = {"@type": "currentStatus", "commandStatus": {"status": "SUCCESS"}}
+        return FakeResponse.from_data([{"statementText": statement, **data}])
+
+    def stream(self, i: int) -> dict:
+        return {
+            "type": "STREAM",
+            "name": f"STREAM_{i}",
+            "topic": f"topic_{i}",
+            "keyFormat": "KAFKA",
+            "valueFormat": "JSON",
+            "isWindowed": False,
+        }
+
+    def source(self, i: int) -> dict:
+        return {
+            **self.stream(i),
+            "fields": [
+                {"name": f"FIELD_{j}", "schema": {"type": "STRING"}}
+                for j in range(self.settings.fields)
+            ],
+            "readQueries": (
+                [{"id": f"CSAS_STREAM_{i + 1}_1"}] if i + 1 < self.settings.streams else []
+            ),
+            "writeQueries": [{"id": f"CSAS_STREAM_{i}_1"}] if i else [],
+            "sourceConstraints": [],
+            "partitions": 1,
+            "replication": 1,
+            "statement": f"CREATE STREAM STREAM_{i} WITH (KAFKA_TOPIC='topic_{i}');",
+        }
+
+    def topic(self, i: int) -> dict:
+        return {"name": f"topic_{i}", "replicaInfo": [1]}
+
+    def query(self, i: int) -> dict:
+        return {
+            "queryString": f"CREATE STREAM STREAM_{i} AS SELECT * FROM STREAM_{i - 1};",
+            "sinks": [f"STREAM_{i}"],
+            "sinkKafkaTopics": [f"topic_{i}"],
+            "id": f"CSAS_STREAM_{i}_1",
+            "statusCount": {"RUNNING": 1},
+            "queryType": "PERSISTENT",
+            "state": "RUNNING",
+        }
+
+    def select(self) -> list[dict]:
+        names = [f"FIELD_{j}" for j in range(self.settings.fields)]
+        schema = ", ".join(f"`{name}` STRING" for name in names)
+        rows = [
+            {"row": {"columns": [f"value_{i}_{j}" for j in range(len(names))]}}
+            for i in range(self.settings.rows)
+        ]
+        return [
+            {"header": {"queryId": "transient_fake_1", "schema": schema}},
+            *rows,
+            {"finalMessage": "Limit Reached"},
+        ]
+
+
+class FakeKsqlServer:
+    """Local stand-in for ksqlDB server to develop and measure UI without live cluster.
+
+    Responses are recorded from real server (if "record_url" is set), replayed
+    from cassette or generated. Latency, errors and slow bodies are injected
+    per endpoint.
+    """
+
+    def __init__(
+        self,
+        settings: FakeSettings,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        """Initialize class instance."""
+        self.settings = settings
+        self.cassette = Cassette(settings.cassette)
+        self.synthetic = SyntheticResponses(settings)
+        self.random = random.Random(settings.seed)
+        self.upstream: httpx.AsyncClient | None = None
+        if settings.record_url:
+            self.upstream = httpx.AsyncClient(base_url=settings.record_url, transport=transport)
+
+    async def handle(self, request: Request) -> Response:
+        endpoint = KsqlEndpoints(request.url.path.strip("/"))
+        behavior = self.settings.get_endpoint(endpoint)
+        body = await request.body()
+
+        await asyncio.sleep(self.get_latency(behavior))
+        if behavior.error_rate and self.random.random() < behavior.error_rate:
+            response = self.get_error(behavior.error_status)
+        else:
+            response = await self.get_response(request.method, endpoint, body)
+
+        if behavior.chunk_size:
+            return StreamingResponse(
+                self.iter_chunks(response.body, behavior),
+                status_code=response.status,
+                media_type=response.content_type,
+            )
+        return Response(
+            response.body, status_code=response.status, media_type=response.content_type
+        )
+
+    async def get_response(self, method: str, endpoint: KsqlEndpoints, body: bytes) -> FakeResponse:
+        key = Cassette.get_key(method, endpoint, body)
+        if self.upstream is not None:
+            response = await self.record(key, method, endpoint, body)
+        elif (replayed := self.cassette.replay(key)) is not None:
+            response = replayed
+        else:
+            response = self.synthetic.get(endpoint, get_statement(body))
+        return response
+
+    async def record(
+        self,
+        key: str,
+        method: str,
+        endpoint: KsqlEndpoints,
+        body: bytes,
+    ) -> FakeResponse:
+        assert self.upstream is not None
+        upstream = await self.upstream.request(
+            method,
+            f"/{endpoint.value}",
+            content=body or None,
+            headers={"Content-Type": "application/vnd.ksql.v1+json"} if body else None,
+        )
+        response = FakeResponse(
+            upstream.status_code,
+            upstream.content,
+            upstream.headers.get("content-type", JSON_CONTENT_TYPE),
+        )
+        await self.cassette.record(key, response)
+        return response
+
+    def get_latency(self, behavior: FakeEndpointSettings) -> float:
+        if behavior.latency <= 0:
+            return 0
+        if behavior.latency_spread <= 0:
+            return behavior.latency
+        return self.random.lognormvariate(math.log(behavior.latency), behavior.latency_spread)
+
+    def get_error(self, status: int) -> FakeResponse:
+        return FakeResponse.from_data(
+            {
+                "@type": "generic_error",
+                "error_code": status * 100,
+                "message": "Injected failure of fake ksqlDB server",
+            },
+            status=status,
+        )
+
+    async def iter_chunks(
+        self, body: bytes, behavior: FakeEndpointSettings
+    ) -> AsyncIterator[bytes]:
+        for i in range(0, len(body), behavior.chunk_size):
+            if i:
+                await asyncio.sleep(behavior.chunk_delay)
+            yield body[i : i + behavior.chunk_size]
+
+    async def close(self) -> None:
+        if self.upstream is not None:
+            await self.upstream.aclose()
+
+
+def create_fake_app(
+    settings: FakeSettings | None = None,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> Starlette:
+    """Create ASGI application of fake ksqlDB server.
+
+    :param transport: transport to real server for recording (for tests)
+    """
+    server = FakeKsqlServer(settings or FakeSettings.from_env(), transport=transport)
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette) -> AsyncIterator[None]:
+        yield
+        await server.close()
+
+    routes = [
+        Route(f"/{endpoint.value}", server.handle, methods=[method])
+        for endpoint, method in FAKE_ENDPOINTS.items()
+    ]
+    app = Starlette(routes=routes, lifespan=lifespan)
+    app.state.server = server
+    return app
@@ -0,0 +1,473 @@
+import codecs
+import hashlib
+import json
+import re
+from typing import (
+    Any,
+    Iterator,
+)
+
+import httpx
+
+from .models import ParsedResponse
+
+# Arrays of top-level objects which items are parsed one by one, e.g. "topics" in
+# [{"@type": "kafka_topics", "topics": [...]}]. Items of top-level array itself
+# (like rows of SELECT query) are parsed one by one as well.
+STREAMED_KEYS = frozenset(
+    [
+        "functions",
+        "properties",
+        "queries",
+        "sourceDescriptions",
+        "streams",
+        "tables",
+        "topics",
+    ],
+)
+
+DIGEST_SIZE = 16  # bytes of digest of received body
+
+# Received text is kept while JSON is parsed, so invalid JSON body is returned as is.
+# Body that turns out to be invalid after this size is returned truncated.
+RAW_TEXT_MAX_SIZE = 1024 * 1024
+
+WHITESPACE = " \t\n\r"
+NUMBER_CHARS = "0123456789.eE+-"
+JsonItemEvent = tuple[str, Any]  # (key of array or "" for top-level array, item)
+
+# Rest of string until closing quote or escaping backslash at the end of text
+STRING_REST = re.compile(r'(?:[^"\\]++|\\.)*+')
+# Complete strings (skipped as a whole), brackets and quotes of incomplete strings
+VALUE_TOKENS = re.compile(r'"(?:[^"\\]++|\\.)*+"|[\[\]{}"]')
+
+
+class _Frame:
+    """Container that is being parsed (array or object)."""
+
+    __slots__ = ("container", "key", "state", "streamed_key")
+
+    def __init__(self, container: list | dict, streamed_key: str | None = None) -> None:
+        """Initialize class instance."""
+        self.container = container
+        self.streamed_key = streamed_key  # items of array are reported as events
+        self.key: str | None = None  # last key of object
+        self.state = "first"
+
+
+class _NeedMoreData(Exception):
+    pass
+
+
+class _ValueScanner:
+    """Scanner of end of incomplete string, array or object.
+
+    Its state is kept between chunks, so each chunk of large value is scanned
+    once, and the value is decoded when it's fully received.
+    """
+
+    __slots__ = ("depth", "in_string", "escaped")
+
+    def __init__(self, first_char: str) -> None:
+        """Initialize class instance."""
+        self.in_string = first_char == '"'
+        self.depth = 0 if self.in_string else 1
+        self.escaped = False
+
+    def scan(self, text: str, pos: int = 0) -> bool:
+        """Scan text from position, returning True if end of value is found."""
+        if self.escaped:
+            if pos == len(text):
+                return False
+            self.escaped = False
+            pos += 1
+
+        if self.in_string:
+            rest = STRING_REST.match(text, pos)
+            assert rest is not None
+            pos = rest.end()
+            if pos == len(text):
+                return False
+            if text[pos] == "\\":
+                self.escaped = True
+                return False
+            self.in_string = False
+            pos += 1
+            if self.depth == 0:
+                return True
+
+        for match in VALUE_TOKENS.finditer(text, pos):
+            char = text[match.start()]
+            if char == '"':
+                if match.end() - match.start() == 1:
+                    # String isn't complete in this text
+                    self.in_string = True
+                    return self.scan(text, match.end())
+            elif char in "[{":
+                self.depth += 1
+            else:
+                self.depth -= 1
+                if self.depth == 0:
+                    return True
+        return False
+
+
+class JsonStreamParser:
+    """Event-based parser of ksqlDB JSON responses fed by chunks.
+
+    Only skeleton of response (top-level array, its objects and streamed arrays)
+    is parsed by this class, while each item is decoded by standard JSON decoder
+    as soon as it's fully received. Parsed text is dropped from buffer, so raw
+    body is never kept in memory as a whole. Chunks of incomplete value are only
+    scanned for its end, so large value is decoded once.
+
+    >>> parser = JsonStreamParser()
+    >>> list(parser.feed('[{"@type": "streams", "streams": [{"name": "a"}, '))
+    [('streams', {'name': 'a'})]
+    """
+
+    def __init__(self) -> None:
+        """Initialize class instance."""
+        self.result: Any = None
+        self.done = False
+        self._decoder = json.JSONDecoder()
+        self._stack: list[_Frame] = []
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._scanner: _ValueScanner | None = None
+        self._pending: list[str] = []  # chunks of incomplete value
+
+    @property
+    def buffer(self) -> str:
+        """Get text that is received, but not parsed yet."""
+        return "".join(self._pending) + self._buffer[self._pos :]
+
+    def feed(self, text: str, eof: bool = False) -> Iterator[JsonItemEvent]:
+        """Add text and parse as much as possible, yielding items of streamed arrays."""
+        if self._scanner is not None:
+            self._pending.append(text)
+            if not self._scanner.scan(text) and not eof:
+                return
+            self._scanner = None
+            text = "".join(self._pending)
+            self._pending = []
+
+        self._buffer = self._buffer[self._pos :] + text
+        self._pos = 0
+        self._eof = eof
+
+        try:
+            yield from self._parse()
+        except _NeedMoreData:
+            if eof and not self.done:
+                raise json.JSONDecodeError("Unexpected end of data", self._buffer, self._pos)
+
+    def close(self) -> Any:
+        """Finish parsing of incomplete data (e.g. truncated response).
+
+        All complete items are kept and all opened containers are closed.
+        """
+        for _event in self.iter_close():
+            pass
+        return self.result
+
+    def iter_close(self) -> Iterator[JsonItemEvent]:
+        """Close all opened containers, yielding them if they are items of streamed arrays."""
+        while self._stack:
+            yield from self._close_frame()
+        self.done = True
+
+    def _parse(self) -> Iterator[JsonItemEvent]:
+        while True:
+            char = self._next_char()
+            if self.done:
+                raise json.JSONDecodeError("Extra data", self._buffer, self._pos)
+
+            if not self._stack:
+                if char == "[":
+                    self._pos += 1
+                    self._stack.append(_Frame([], streamed_key=""))
+                else:
+                    self.result = self._decode()
+                    self.done = True
+                continue
+
+            frame = self._stack[-1]
+            if isinstance(frame.container, list):
+                yield from self._parse_array(frame, char)
+            else:
+                yield from self._parse_object(frame, char)
+
+    def _parse_array(self, frame: _Frame, char: str) -> Iterator[JsonItemEvent]:
+        assert isinstance(frame.container, list)
+        if char == "]" and frame.state in ("first", "next"):
+            self._pos += 1
+            yield from self._close_frame()
+        elif frame.state == "next":
+            self._expect(",")
+            frame.state = "value"
+        elif char == "{" and len(self._stack) == 1:
+            # Objects of top-level array are parsed to find streamed arrays in them
+            self._pos += 1
+            self._stack.append(_Frame({}))
+            frame.state = "next"
+        else:
+            value = self._decode()
+            frame.container.append(value)
+            frame.state = "next"
+            if frame.streamed_key is not None:
+                yield (frame.streamed_key, value)
+
+    def _parse_object(self, frame: _Frame, char: str) -> Iterator[JsonItemEvent]:
+        container = frame.container
+        assert isinstance(container, dict)
+        if char == "}" and frame.state in ("first", "next"):
+            self._pos += 1
+            yield from self._close_frame()
+        elif frame.state == "next":
+            self._expect(",")
+            frame.state = "key"
+        elif frame.state in ("first", "key"):
+            if char != '"':
+                raise json.JSONDecodeError("Expecting property name", self._buffer, self._pos)
+            frame.key = self._decode()
+            frame.state = "colon"
+        elif frame.state == "colon":
+            self._expect(":")
+            frame.state = "value"
+        elif char == "[" and frame.key in STREAMED_KEYS:
+            self._pos += 1
+            streamed: list = []
+            container[frame.key] = streamed
+            frame.state = "next"
+            self._stack.append(_Frame(streamed, streamed_key=frame.key))
+        else:
+            container[frame.key] = self._decode()
+            frame.state = "next"
+
+    def _close_frame(self) -> Iterator[JsonItemEvent]:
+        frame = self._stack.pop()
+        if not self._stack:
+            self.result = frame.container
+            self.done = True
+            return
+
+        # Objects of top-level array are reported when they are closed
+        parent = self._stack[-1]
+        if isinstance(frame.container, dict) and parent.streamed_key is not None:
+            assert isinstance(parent.container, list)
+            parent.container.append(frame.container)
+            yield (parent.streamed_key, frame.container)
+
+    def _next_char(self) -> str:
+        """Skip whitespaces and get next char."""
+        while self._pos < len(self._buffer) and self._buffer[self._pos] in WHITESPACE:
+            self._pos += 1
+        if self._pos >= len(self._buffer):
+            raise _NeedMoreData
+        return self._buffer[self._pos]
+
+    def _expect(self, char: str) -> None:
+        if self._buffer[self._pos] != char:
+            raise json.JSONDecodeError(f"Expecting '{char}' delimiter", self._buffer, self._pos)
+        self._pos += 1
+
+    def _decode(self) -> Any:
+        """Decode single complete value."""
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if self._eof:
+                raise
+            char = self._buffer[self._pos]
+            if char not in '"[{':
+                raise _NeedMoreData
+
+            # Value is invalid if its end is received, otherwise only new chunks are scanned
+            scanner = _ValueScanner(char)
+            if scanner.scan(self._buffer, self._pos + 1):
+                raise
+            self._scanner = scanner
+            self._pending.append(self._buffer[self._pos :])
+            self._buffer = ""
+            self._pos = 0
+            raise _NeedMoreData
+
+        # Numbers at the end of buffer may be incomplete, as well as numbers
+        # followed by their own chars (e.g. "1." is decoded as 1)
+        if (
+            not self._eof
+            and isinstance(value, (int, float))
+            and (end == len(self._buffer) or self._buffer[end] in NUMBER_CHARS)
+        ):
+            raise _NeedMoreData
+
+        self._pos = end
+        return value
+
+
+class KsqlResponse(httpx.Response):
+    """Response which JSON body was parsed while it was received.
+
+    Raw body is not kept, so content is serialized from parsed data on demand.
+    """
+
+    def __init__(
+        self,
+        response: httpx.Response,
+        data: Any = None,
+        text: str | None = None,
+        truncated: bool = False,
+        received_size: int | None = None,
+        received_digest: str | None = None,
+        parsed: ParsedResponse | None = None,
+    ) -> None:
+        """Initialize class instance."""
+        # Body is already decoded, so headers about its encoding are not valid anymore
+        headers = [
+            (k, v)
+            for k, v in response.headers.multi_items()
+            if k.lower() not in ("content-encoding", "content-length")
+        ]
+        super().__init__(
+            status_code=response.status_code,
+            headers=headers,
+            request=response.request,
+            extensions=response.extensions,
+        )
+        self.data = data
+        self.truncated = truncated
+        self.received_size = received_size  # bytes of body received from server
+        self.received_digest = received_digest  # digest of these bytes
+        self._raw_text = text
+        self._serialized: bytes | None = None
+        self._parsed = parsed
+
+    @property
+    def content(self) -> bytes:
+        if self._serialized is None:
+            if self._raw_text is not None:
+                self._serialized = self._raw_text.encode()
+            else:
+                self._serialized = json.dumps(self.data).encode()
+        return self._serialized
+
+    def get_compact_content(self) -> bytes:
+        """Get body as compact JSON (or raw text if it's invalid JSON), which is not cached."""
+        if self._raw_text is not None or self._serialized is not None:
+            return self.content
+        return json.dumps(self.data, separators=(",", ":")).encode()
+
+    def json(self, **kwargs: Any) -> Any:
+        if self._raw_text is not None:
+            return json.loads(self._raw_text, **kwargs)
+        return self.data
+
+    @property
+    def parsed(self) -> ParsedResponse:
+        """Get typed entities of response (parsed while it was received if possible)."""
+        if self._parsed is None:
+            try:
+                self._parsed = ParsedResponse(self.json())
+            except json.JSONDecodeError:
+                self._parsed = ParsedResponse(None)
+        return self._parsed
+
+
+async def read_json_response(response: httpx.Response, max_size: int = 0) -> KsqlResponse:
+    """Read streamed response, parsing JSON body while it's received.
+
+    Items of streamed arrays are parsed to typed models as soon as they are
+    received. Only beginning of received text is kept until response is read,
+    so body that turns out to be invalid JSON is returned as is (truncated if
+    it's larger than RAW_TEXT_MAX_SIZE).
+
+    :param max_size: max body size in bytes (larger body is truncated), zero for no limit
+    """
+    parser = JsonStreamParser()
+    parsed = ParsedResponse()
+    decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    size = 0
+    truncated = False
+
+    # Text of body that is not JSON (or turned out to be invalid JSON)
+    raw_text: list[str] | None = None
+    if "json" not in response.headers.get("content-type", ""):
+        raw_text = []
+
+    # Beginning of body kept while it's parsed
+    kept: list[str] = []
+    kept_size = 0
+    kept_whole = True
+
+    try:
+        chunks = response.aiter_bytes()
+        eof = False
+        while not eof:
+            try:
+                chunk = await anext(chunks)
+            except StopAsyncIteration:
+                chunk, eof = b"", True
+
+            size += len(chunk)
+            if max_size and size > max_size:
+                chunk = chunk[: len(chunk) - (size - max_size)]
+                truncated = eof = True
+
+            digest.update(chunk)
+            text = decoder.decode(chunk, final=eof and not truncated)
+            if raw_text is not None:
+                raw_text.append(text)
+                continue
+
+            if kept_whole:
+                kept.append(text[: RAW_TEXT_MAX_SIZE - kept_size])
+                kept_size += len(kept[-1])
+                kept_whole = len(kept[-1]) == len(text)
+
+            # Truncated body is never complete JSON, so it's closed instead
+            if not _feed(parser, parsed, text, eof=eof and not truncated):
+                raw_text = kept
+                if not kept_whole:
+                    truncated = True
+                    break
+    finally:
+        await response.aclose()
+
+    size = min(size, max_size) if max_size else size
+    if raw_text is not None:
+        return KsqlResponse(
+            response,
+            text="".join(raw_text),
+            truncated=truncated,
+            received_size=size,
+            received_digest=digest.hexdigest(),
+        )
+
+    for key, item in parser.iter_close():
+        parsed.add_item(key, item)
+    parsed.data = parser.result
+    return KsqlResponse(
+        response,
+        data=parser.result,
+        parsed=parsed,
+        truncated=truncated,
+        received_size=size,
+        received_digest=digest.hexdigest(),
+    )
+
+
+def get_body_digest(body: bytes) -> str:
+    return hashlib.blake2b(body, digest_size=DIGEST_SIZE).hexdigest()
+
+
+def _feed(parser: JsonStreamParser, parsed: ParsedResponse, text: str, eof: bool = False) -> bool:
+    """Feed parser, returning False if body turned out to be invalid JSON."""
+    try:
+        for key, item in parser.feed(text, eof=eof):
+            parsed.add_item(key, item)
+    except json.JSONDecodeError:
+        return False
+    return True
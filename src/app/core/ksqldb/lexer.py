@@ -0,0 +1,222 @@
+import re
+from enum import Enum
+from typing import (
+    Iterator,
+    NamedTuple,
+)
+
+
+class TokenType(Enum):
+    """Types of ksqlDB tokens."""
+
+    WHITESPACE = "whitespace"
+    COMMENT = "comment"
+    STRING = "string"  # 'string literal'
+    QUOTED_IDENTIFIER = "quoted_identifier"  # "Identifier"
+    BACKTICK_IDENTIFIER = "backtick_identifier"  # `Identifier`
+    SEMICOLON = "semicolon"
+    WORD = "word"  # keywords, identifiers and numbers
+    SYMBOL = "symbol"
+
+
+class StatementKind(Enum):
+    """Kinds of ksqlDB statements."""
+
+    # SELECT and PRINT, executed using /query endpoint
+    QUERY = "query"
+
+    # SHOW, LIST, DESCRIBE and EXPLAIN - read-only statements for /ksql endpoint
+    METADATA = "metadata"
+
+    # All other statements (CREATE, DROP, TERMINATE, INSERT, etc) for /ksql endpoint
+    COMMAND = "command"
+
+
+class Token(NamedTuple):
+    type: TokenType
+    value: str
+
+
+TOKEN_RE = re.compile(
+    r"""
+    (?P<whitespace>\s+)
+    |(?P<comment>--[^\n]*|/\*.*?(?:\*/|\Z))
+    |(?P<string>'(?:[^']|'')*(?:'|\Z))
+    |(?P<quoted_identifier>"(?:[^"]|"")*(?:"|\Z))
+    |(?P<backtick_identifier>`(?:[^`]|``)*(?:`|\Z))
+    |(?P<semicolon>;)
+    |(?P<word>\w+)
+    |(?P<symbol>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+QUERY_KEYWORDS = frozenset(["SELECT", "PRINT"])
+METADATA_KEYWORDS = frozenset(["SHOW", "LIST", "DESCRIBE", "EXPLAIN"])
+
+# Keywords that can form beginning of statement (used to detect statement shape)
+SHAPE_KEYWORDS = frozenset(
+    [
+        *QUERY_KEYWORDS,
+        *METADATA_KEYWORDS,
+        "ALL",
+        "ALTER",
+        "ASSERT",
+        "CONNECTOR",
+        "CONNECTORS",
+        "CREATE",
+        "DEFINE",
+        "DROP",
+        "EXISTS",
+        "EXTENDED",
+        "FUNCTION",
+        "FUNCTIONS",
+        "IF",
+        "INSERT",
+        "INTO",
+        "NOT",
+        "OR",
+        "PAUSE",
+        "PROPERTIES",
+        "QUERIES",
+        "REPLACE",
+        "RESUME",
+        "SCHEMA",
+        "SET",
+        "SINK",
+        "SOURCE",
+        "STREAM",
+        "STREAMS",
+        "TABLE",
+        "TABLES",
+        "TERMINATE",
+        "TOPIC",
+        "TOPICS",
+        "TYPE",
+        "TYPES",
+        "UNDEFINE",
+        "UNSET",
+        "VARIABLES",
+    ],
+)
+SHAPE_MAX_KEYWORDS = 3
+
+INSIGNIFICANT_TOKENS = (TokenType.WHITESPACE, TokenType.COMMENT)
+
+
+def tokenize(text: str) -> Iterator[Token]:
+    """Split ksqlDB text into tokens.
+
+    Unterminated literals and comments are consumed till the end of text.
+    """
+    for match in TOKEN_RE.finditer(text):
+        yield Token(TokenType(match.lastgroup), match.group())
+
+
+def normalize(text: str, upper: bool = False) -> str:
+    """Remove comments and collapse whitespaces outside of literals.
+
+    :param upper: uppercase keywords and unquoted identifiers (they are case-insensitive)
+    """
+    parts: list[str] = []
+    pending_space = False
+    for token in tokenize(text):
+        if token.type in INSIGNIFICANT_TOKENS:
+            pending_space = True
+            continue
+
+        if pending_space and parts:
+            parts.append(" ")
+        parts.append(token.value.upper() if upper and token.type == TokenType.WORD else token.value)
+        pending_space = False
+
+    return "".join(parts)
+
+
+def split_statements(text: str) -> list[str]:
+    """Split text into normalized statements (each ends with semicolon)."""
+    statements = []
+    current: list[Token] = []
+    for token in tokenize(text):
+        current.append(token)
+        if token.type == TokenType.SEMICOLON:
+            if statement := normalize("".join(t.value for t in current[:-1])):
+                statements.append(statement + ";")
+            current = []
+
+    if statement := normalize("".join(t.value for t in current)):
+        statements.append(statement + ";")
+
+    return statements
+
+
+class StatementSplitter:
+    """Incremental splitter of script into statements, fed by chunks of text.
+
+    Only text after last semicolon is buffered, so literals and comments can
+    be split between chunks.
+    """
+
+    def __init__(self) -> None:
+        """Initialize class instance."""
+        self._buffer = ""
+
+    def feed(self, text: str) -> list[str]:
+        """Add text and get statements completed by it."""
+        self._buffer += text
+        end = None
+        for token in TOKEN_RE.finditer(self._buffer):
+            if token.lastgroup == TokenType.SEMICOLON.value:
+                end = token.end()
+
+        if end is None:
+            return []
+
+        complete, self._buffer = self._buffer[:end], self._buffer[end:]
+        return split_statements(complete)
+
+    def close(self) -> list[str]:
+        """Get last statement (which may have no semicolon)."""
+        statements, self._buffer = split_statements(self._buffer), ""
+        return statements
+
+
+def leading_words(text: str, limit: int) -> list[str]:
+    """Get up to `limit` first uppercased words of statement."""
+    words: list[str] = []
+    for token in tokenize(text):
+        if token.type in INSIGNIFICANT_TOKENS:
+            continue
+        if token.type != TokenType.WORD or len(words) >= limit:
+            break
+        words.append(token.value.upper())
+
+    return words
+
+
+def classify_statement(text: str) -> StatementKind:
+    """Detect kind of statement by its first keyword."""
+    words = leading_words(text, limit=1)
+    if words and words[0] in QUERY_KEYWORDS:
+        return StatementKind.QUERY
+    if words and words[0] in METADATA_KEYWORDS:
+        return StatementKind.METADATA
+    return StatementKind.COMMAND
+
+
+def statement_shape(text: str) -> str:
+    """Get statement shape: its leading keywords without identifiers.
+
+    >>> statement_shape("CREATE OR REPLACE STREAM s AS SELECT ...")
+    'CREATE OR REPLACE'
+    >>> statement_shape("DESCRIBE my_stream EXTENDED")
+    'DESCRIBE'
+    """
+    words = leading_words(text, limit=SHAPE_MAX_KEYWORDS)
+    shape = []
+    for i, word in enumerate(words):
+        if i > 0 and word not in SHAPE_KEYWORDS:
+            break
+        shape.append(word)
+
+    return " ".join(shape)
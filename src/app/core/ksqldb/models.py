@@ -0,0 +1,251 @@
+from dataclasses import (
+    asdict,
+    dataclass,
+    field,
+    fields,
+)
+from typing import (
+    Any,
+    Hashable,
+    Iterable,
+    TypeVar,
+)
+
+from app.core.preprocess.resources import (
+    Schema,
+    parse_schema_list,
+)
+
+M = TypeVar("M", bound="Model")
+
+
+# Field names of models by their classes
+FIELD_NAMES: dict[type, frozenset[str]] = {}
+
+
+@dataclass(slots=True)
+class Model:
+    """Base class for typed models of ksqlDB entities.
+
+    Field names are the same as keys of ksqlDB response, so models can be
+    used in templates and renderers instead of dicts. Keys without fields
+    (e.g. added in newer ksqlDB versions) are kept in `extra`, and models
+    provide them the same way as fields.
+    """
+
+    extra: dict[str, Any] = field(default_factory=dict, kw_only=True)
+
+    @classmethod
+    def from_dict(cls: type[M], data: dict) -> M:
+        names = get_field_names(cls)
+        known, extra = {}, {}
+        for key, value in data.items():
+            if key in names:
+                known[key] = value
+            else:
+                extra[key] = value
+        return cls(**known, extra=extra)
+
+    @classmethod
+    def from_list(cls: type[M], items: Iterable[dict]) -> list[M]:
+        return [cls.from_dict(item) for item in items]
+
+    def __getitem__(self, key: str) -> Any:
+        if key in get_field_names(type(self)):
+            return getattr(self, key)
+        return self.extra[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in get_field_names(type(self)):
+            return getattr(self, key)
+        return self.extra.get(key, default)
+
+    def keys(self) -> list[str]:
+        return [f.name for f in fields(self) if f.name != "extra"] + list(self.extra)
+
+    def as_dict(self) -> dict[str, Any]:
+        data = dict(asdict(self))  # type: ignore[call-overload]
+        data.update(data.pop("extra"))
+        return data
+
+
+def get_field_names(cls: type[Model]) -> frozenset[str]:
+    """Get names of fields of model class (without `extra`)."""
+    if (names := FIELD_NAMES.get(cls)) is None:
+        names = FIELD_NAMES[cls] = frozenset(f.name for f in fields(cls) if f.name != "extra")
+    return names
+
+
+@dataclass(slots=True)
+class Source(Model):
+    """Stream or table from SHOW STREAMS / SHOW TABLES."""
+
+    type: str = ""
+    name: str = ""
+    topic: str = ""
+    keyFormat: str = ""
+    valueFormat: str = ""
+    isWindowed: bool = False
+
+
+@dataclass(slots=True)
+class Query(Model):
+    """Query from SHOW QUERIES."""
+
+    queryString: str = ""
+    sinks: list[str] = field(default_factory=list)
+    sinkKafkaTopics: list[str] = field(default_factory=list)
+    id: str = ""
+    statusCount: dict[str, int] = field(default_factory=dict)
+    queryType: str = ""
+    state: str = ""
+
+
+@dataclass(slots=True)
+class Topic(Model):
+    """Topic from SHOW TOPICS (EXTENDED)."""
+
+    name: str = ""
+    replicaInfo: list[int] = field(default_factory=list)
+    consumerCount: int = 0
+    consumerGroupCount: int = 0
+
+
+@dataclass(slots=True)
+class Property(Model):
+    """Server property from SHOW PROPERTIES."""
+
+    name: str = ""
+    scope: str = ""
+    value: Any = None
+    editable: bool = False
+    level: str = ""
+
+
+@dataclass(slots=True)
+class SourceDescription(Model):
+    """Stream or table from DESCRIBE or LIST STREAMS EXTENDED."""
+
+    name: str = ""
+    type: str = ""
+    topic: str = ""
+    keyFormat: str = ""
+    valueFormat: str = ""
+    statement: str = ""
+    windowType: str | None = None
+    timestamp: str = ""
+    partitions: int = 0
+    replication: int = 0
+    extended: bool = False
+    statistics: str = ""
+    errorStats: str = ""
+    fields: list[dict] = field(default_factory=list)
+    readQueries: list[dict] = field(default_factory=list)
+    writeQueries: list[dict] = field(default_factory=list)
+    sourceConstraints: list[str] = field(default_factory=list)
+    clusterStatistics: list[dict] = field(default_factory=list)
+    clusterErrorStats: list[dict] = field(default_factory=list)
+    queryOffsetSummaries: list[dict] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class SelectHeader(Model):
+    """Header of SELECT query result."""
+
+    queryId: str = ""
+    schema: list[Schema] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SelectHeader":
+        return cls(
+            queryId=data.get("queryId", ""),
+            schema=parse_schema_list(data.get("schema", "")),
+            extra={k: v for k, v in data.items() if k not in ("queryId", "schema")},
+        )
+
+
+# Models of items of arrays in entries of response by keys of these arrays,
+# and attributes of ParsedResponse where they are stored
+ENTRY_MODELS: dict[str, tuple[str, type[Model]]] = {
+    "streams": ("streams", Source),
+    "tables": ("tables", Source),
+    "queries": ("queries", Query),
+    "topics": ("topics", Topic),
+    "properties": ("properties", Property),
+    "sourceDescriptions": ("sources", SourceDescription),
+}
+
+
+class ParsedResponse:
+    """Typed entities of ksqlDB response, parsed once and shared by views and renderers.
+
+    Entities are parsed from decoded data, or added one by one while response
+    is received. Entities of unknown types are available only in raw `data`.
+    """
+
+    __slots__ = (
+        "data",
+        "streams",
+        "tables",
+        "queries",
+        "topics",
+        "properties",
+        "sources",
+        "header",
+        "rows",
+        "final_message",
+        "derived",
+    )
+
+    def __init__(self, data: Any = None) -> None:
+        """Initialize class instance."""
+        self.data = data
+        self.streams: list[Source] = []
+        self.tables: list[Source] = []
+        self.queries: list[Query] = []
+        self.topics: list[Topic] = []
+        self.properties: list[Property] = []
+        self.sources: list[SourceDescription] = []
+        self.header: SelectHeader | None = None
+        self.rows: list[list] = []
+        self.final_message: str | None = None
+        self.derived: dict[Hashable, Any] = {}  # Data derived from entities (e.g. indexes)
+
+        if not isinstance(data, list):
+            return
+
+        for entry in data:
+            if isinstance(entry, dict):
+                self.add_entry(entry)
+
+    @property
+    def source(self) -> SourceDescription | None:
+        """Get single source description (DESCRIBE result)."""
+        return self.sources[0] if self.sources else None
+
+    def add_item(self, key: str, item: Any) -> None:
+        """Add item of streamed array of response (its entry if key is empty).
+
+        Items of arrays in entries are reported before entries themselves.
+        """
+        if not key:
+            if isinstance(item, dict):
+                self.add_entry(item, items_added=True)
+        elif key in ENTRY_MODELS and isinstance(item, dict):
+            attr, model = ENTRY_MODELS[key]
+            getattr(self, attr).append(model.from_dict(item))
+
+    def add_entry(self, entry: dict, items_added: bool = False) -> None:
+        if "header" in entry:
+            self.header = SelectHeader.from_dict(entry["header"])
+        elif "row" in entry:
+            self.rows.append(entry["row"].get("columns", []))
+        elif "finalMessage" in entry:
+            self.final_message = entry["finalMessage"]
+        elif "sourceDescription" in entry:
+            self.sources = [SourceDescription.from_dict(entry["sourceDescription"])]
+        elif not items_added:
+            for key, (attr, model) in ENTRY_MODELS.items():
+                if key in entry:
+                    setattr(self, attr, model.from_list(entry[key]))
+                    break
@@ -0,0 +1,107 @@
+import itertools
+import time
+from enum import Enum
+from typing import Any
+
+from app.core.urls import SimpleURL
+
+
+class BalancingStrategy(Enum):
+    """Strategies to pick node for read-only requests."""
+
+    ROUND_ROBIN = "round_robin"
+    LEAST_REQUESTS = "least_requests"
+
+
+class Node:
+    """Single ksqlDB node of server."""
+
+    __slots__ = ("url", "outstanding", "failures", "ejected_until", "probing")
+
+    def __init__(self, url: str) -> None:
+        """Initialize class instance."""
+        self.url = SimpleURL(url)
+        self.outstanding = 0  # requests in progress
+        self.failures = 0  # consecutive failures
+        self.ejected_until: float | None = None
+        self.probing = False
+
+    def __repr__(self) -> str:
+        """Return object representation."""
+        return f"<{self.__class__.__name__}: {self.url}>"
+
+    @property
+    def healthy(self) -> bool:
+        return self.ejected_until is None
+
+
+class NodePool:
+    """Nodes of one ksqlDB server.
+
+    Read-only requests are spread across healthy nodes, while all other requests
+    are sent to preferred (first) healthy node. Node is ejected after several
+    consecutive failures and returned back after successful health probe.
+    """
+
+    def __init__(
+        self,
+        urls: list[str],
+        strategy: BalancingStrategy = BalancingStrategy.ROUND_ROBIN,
+        max_failures: int = 3,
+        eject_time: float = 30,
+    ) -> None:
+        """Initialize class instance."""
+        if not urls:
+            raise ValueError("At least one node URL is required")
+
+        self.nodes = [Node(url) for url in urls]
+        self.strategy = strategy
+        self.max_failures = max_failures
+        self.eject_time = eject_time
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def candidates(self, read_only: bool) -> list[Node]:
+        """Get nodes to try for request, the best one goes first.
+
+        If all nodes are ejected, then all of them are candidates anyway.
+        """
+        healthy = [node for node in self.nodes if node.healthy] or list(self.nodes)
+        if not read_only or len(healthy) == 1:
+            return healthy
+
+        if self.strategy == BalancingStrategy.LEAST_REQUESTS:
+            return sorted(healthy, key=lambda node: node.outstanding)
+
+        shift = next(self._counter) % len(healthy)
+        return healthy[shift:] + healthy[:shift]
+
+    def report_success(self, node: Node) -> None:
+        node.failures = 0
+        node.ejected_until = None
+
+    def report_failure(self, node: Node) -> None:
+        node.failures += 1
+        if node.failures >= self.max_failures:
+            node.ejected_until = time.monotonic() + self.eject_time
+
+    def due_for_probe(self) -> list[Node]:
+        """Get ejected nodes that should be checked again."""
+        now = time.monotonic()
+        return [
+            node
+            for node in self.nodes
+            if node.ejected_until is not None and node.ejected_until <= now and not node.probing
+        ]
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return {
+            "strategy": self.strategy.value,
+            "nodes": len(self.nodes),
+            "healthy": sum(1 for node in self.nodes if node.healthy),
+            "outstanding": sum(node.outstanding for node in self.nodes),
+            "ejected": [str(node.url) for node in self.nodes if not node.healthy],
+        }
@@ -1,7 +1,16 @@
+from contextlib import suppress
 from enum import Enum
+from functools import cached_property
 from typing import Any
 
-COMMENT_PREFIX = "--"
+from .lexer import (
+    StatementKind,
+    classify_statement,
+    normalize,
+    split_statements,
+    statement_shape,
+)
+
 KSQL_SYSTEM_STREAM = "KSQL_PROCESSING_LOG"
 
 
@@ -10,6 +19,8 @@ class KsqlEndpoints(Enum):
 
     KSQL = "ksql"
     QUERY = "query"
+    QUERY_STREAM = "query-stream"
+    CLOSE_QUERY = "close-query"
     INFO = "info"
     HEALTH = "healthcheck"
 
@@ -17,6 +28,7 @@ class KsqlEndpoints(Enum):
 class KsqlErrors(Enum):
     """Enum with all available KSQL errors."""
 
+    BAD_REQUEST = 40000
     BAD_STATEMENT = 40001
     QUERY_ENDPOINT = 40002
 
@@ -39,6 +51,30 @@ class KsqlException(Exception):
         """Return string representation."""
         return self.info
 
+    @property
+    def message(self) -> str:
+        """Get error message from ksqlDB response (if any) or exception info."""
+        return get_error_message(self.response) or self.info
+
+
+def get_error_message(response: Any) -> str | None:
+    """Get error message from failed ksqlDB response."""
+    with suppress(Exception):
+        return str(response.json()["message"])
+    return None
+
+
+class KsqlServerUnavailable(Exception):
+    """Server is considered unavailable after multiple failures."""
+
+    def __init__(self, retry_after: float) -> None:
+        """Initialize class instance."""
+        self.retry_after = retry_after
+
+    def __str__(self) -> str:
+        """Return string representation."""
+        return f"ksqlDB server is unavailable, next attempt in {self.retry_after} s"
+
 
 class KsqlQuery:
     """Representation of KSQL query."""
@@ -60,15 +96,47 @@ class KsqlQuery:
         """Get raw query data."""
         return str(self._raw_data)
 
-    @property
+    @cached_property
     def as_string(self) -> str:
-        """Get KSQL query as string."""
-        query = " ".join(
-            line.strip()
-            for line in str(self._raw_data).splitlines()
-            if line and not line.startswith(COMMENT_PREFIX)
-        )
+        """Get KSQL query as string (without comments and extra whitespaces)."""
+        query = normalize(str(self._raw_data))
+        if query and not query.endswith(";"):
+            query += ";"
+        return query
 
+    @cached_property
+    def canonical(self) -> str:
+        """Get canonical form of query (same for equal queries written differently)."""
+        query = normalize(str(self._raw_data), upper=True)
         if query and not query.endswith(";"):
             query += ";"
         return query
+
+    @cached_property
+    def statements(self) -> list[str]:
+        """Get list of separate statements."""
+        return split_statements(str(self._raw_data))
+
+    @cached_property
+    def kind(self) -> StatementKind:
+        """Get kind of statement.
+
+        Multiple statements are executed by /ksql endpoint, so they are commands
+        unless all of them are read-only.
+        """
+        if len(self.statements) <= 1:
+            return classify_statement(self.as_string)
+
+        if all(classify_statement(s) == StatementKind.METADATA for s in self.statements):
+            return StatementKind.METADATA
+        return StatementKind.COMMAND
+
+    @cached_property
+    def shape(self) -> str:
+        """Get statement shape (leading keywords)."""
+        return statement_shape(self.as_string)
+
+    @property
+    def endpoint(self) -> KsqlEndpoints:
+        """Get endpoint that executes this statement."""
+        return KsqlEndpoints.QUERY if self.kind == StatementKind.QUERY else KsqlEndpoints.KSQL
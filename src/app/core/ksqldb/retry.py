@@ -0,0 +1,29 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+# Monotonic time after which read-only requests are not retried anymore
+RETRY_DEADLINE: ContextVar[float | None] = ContextVar("retry_deadline", default=None)
+
+
+@contextmanager
+def retry_budget(seconds: float) -> Iterator[None]:
+    """Limit total time spent on retries within block (e.g. single page render)."""
+    token = RETRY_DEADLINE.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        RETRY_DEADLINE.reset(token)
+
+
+def get_backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Get exponential backoff delay with full jitter for retry attempt (starting with 0)."""
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+def fits_retry_budget(delay: float) -> bool:
+    """Check if there is enough time left to sleep before retry."""
+    deadline = RETRY_DEADLINE.get()
+    return deadline is None or time.monotonic() + delay < deadline
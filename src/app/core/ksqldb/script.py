@@ -0,0 +1,227 @@
+import asyncio
+import time
+from contextlib import aclosing
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+)
+
+from app.core.i18n import _
+
+from .lexer import (
+    INSIGNIFICANT_TOKENS,
+    StatementKind,
+    StatementSplitter,
+    Token,
+    TokenType,
+    classify_statement,
+    tokenize,
+)
+from .resources import (
+    KsqlException,
+    get_error_message,
+)
+
+if TYPE_CHECKING:
+    from .client import AbstractKsqlClient
+
+SCRIPT_CONCURRENCY = 4
+
+StatementGroup = list[tuple[int, str]]  # (index starting from 1, statement)
+
+
+class ScriptResult:
+    """Result of single statement of script."""
+
+    __slots__ = ("index", "statement", "elapsed", "error")
+
+    def __init__(self, index: int, statement: str, elapsed: float, error: str | None) -> None:
+        """Initialize class instance."""
+        self.index = index
+        self.statement = statement
+        self.elapsed = elapsed
+        self.error = error
+
+    def __repr__(self) -> str:
+        """Return object representation."""
+        return f"<{self.__class__.__name__}: #{self.index} {'ok' if self.ok else 'failed'}>"
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "index": self.index,
+            "statement": self.statement,
+            "success": self.ok,
+            "elapsed": round(self.elapsed, 3),
+            "error": self.error,
+        }
+
+
+class ScriptSession:
+    """Streams properties and session variables set by script.
+
+    Each statement is sent as separate request, so SET, UNSET, DEFINE and
+    UNDEFINE statements are applied by runner (as ksqlDB CLI does) and
+    resulting properties and variables are sent with all later statements.
+    """
+
+    __slots__ = ("properties", "variables")
+
+    def __init__(self) -> None:
+        """Initialize class instance."""
+        self.properties: dict[str, str] = {}
+        self.variables: dict[str, str] = {}
+
+    def apply(self, statement: str) -> bool:
+        """Apply statement if it changes session, otherwise return False.
+
+        :raises ValueError: if statement changes session, but it's malformed
+        """
+        tokens = [
+            token
+            for token in tokenize(statement)
+            if token.type not in INSIGNIFICANT_TOKENS and token.type != TokenType.SEMICOLON
+        ]
+        if not tokens or tokens[0].type != TokenType.WORD:
+            return False
+
+        keyword, args = tokens[0].value.upper(), tokens[1:]
+        if keyword not in ("SET", "UNSET", "DEFINE", "UNDEFINE"):
+            return False
+
+        types = [token.type for token in args]
+        if keyword == "SET" and types == [TokenType.STRING, TokenType.SYMBOL, TokenType.STRING]:
+            self.properties[unquote(args[0])] = unquote(args[2])
+        elif keyword == "UNSET" and types == [TokenType.STRING]:
+            self.properties.pop(unquote(args[0]), None)
+        elif keyword == "DEFINE" and types == [TokenType.WORD, TokenType.SYMBOL, TokenType.STRING]:
+            self.variables[args[0].value] = unquote(args[2])
+        elif keyword == "UNDEFINE" and types == [TokenType.WORD]:
+            self.variables.pop(args[0].value, None)
+        else:
+            raise ValueError(_("Failed to parse statement: {}").format(statement))
+
+        return True
+
+
+def unquote(token: Token) -> str:
+    """Get value of string literal."""
+    return token.value[1:-1].replace("''", "'")
+
+
+async def iter_statements(chunks: AsyncIterable[str]) -> AsyncIterator[str]:
+    """Split script into statements while its chunks are read."""
+    splitter = StatementSplitter()
+    async for chunk in chunks:
+        for statement in splitter.feed(chunk):
+            yield statement
+
+    for statement in splitter.close():
+        yield statement
+
+
+async def run_script(
+    ksql: "AbstractKsqlClient",
+    chunks: AsyncIterable[str],
+    parallel: bool = False,
+    stop_on_error: bool = True,
+    concurrency: int = SCRIPT_CONCURRENCY,
+) -> AsyncGenerator[ScriptResult, None]:
+    """Execute script statement by statement, yielding result of each one when it completes.
+
+    :param parallel: execute consecutive read-only statements (SHOW, DESCRIBE, SELECT, etc)
+        concurrently, while other statements still wait for all previous ones
+    :param stop_on_error: don't execute statements after failed one
+    """
+    session = ScriptSession()
+    async for group in _group_statements(iter_statements(chunks), parallel):
+        failed = False
+        # Statements of group are cancelled if script is not read till the end
+        async with aclosing(_run_group(ksql, session, group, concurrency)) as results:
+            async for result in results:
+                failed = failed or not result.ok
+                yield result
+
+        if failed and stop_on_error:
+            return
+
+
+async def _group_statements(
+    statements: AsyncIterable[str],
+    parallel: bool,
+) -> AsyncIterator[StatementGroup]:
+    group: StatementGroup = []
+    index = 0
+    async for statement in statements:
+        index += 1
+        if parallel and classify_statement(statement) != StatementKind.COMMAND:
+            group.append((index, statement))
+            continue
+
+        if group:
+            yield group
+            group = []
+        yield [(index, statement)]
+
+    if group:
+        yield group
+
+
+async def _run_group(
+    ksql: "AbstractKsqlClient",
+    session: ScriptSession,
+    group: StatementGroup,
+    concurrency: int,
+) -> AsyncGenerator[ScriptResult, None]:
+    if len(group) == 1:
+        yield await _run_statement(ksql, session, *group[0])
+        return
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(index: int, statement: str) -> ScriptResult:
+        async with semaphore:
+            return await _run_statement(ksql, session, index, statement)
+
+    tasks = [asyncio.create_task(run(index, statement)) for index, statement in group]
+    try:
+        for future in asyncio.as_completed(tasks):
+            yield await future
+    finally:
+        # Client may disconnect before all results are sent
+        for task in tasks:
+            task.cancel()
+
+
+async def _run_statement(
+    ksql: "AbstractKsqlClient",
+    session: ScriptSession,
+    index: int,
+    statement: str,
+) -> ScriptResult:
+    error = None
+    started_at = time.monotonic()
+    try:
+        if session.apply(statement):
+            return ScriptResult(index, statement, time.monotonic() - started_at, None)
+
+        response = await ksql.execute_statement_then_query(
+            statement,
+            properties=dict(session.properties),
+            variables=dict(session.variables),
+            cache=False,
+        )
+        if not response.is_success:
+            error = get_error_message(response) or f"HTTP {response.status_code}"
+    except KsqlException as e:
+        error = e.message
+    except Exception as e:
+        error = str(e) or e.__class__.__name__
+
+    return ScriptResult(index, statement, time.monotonic() - started_at, error)
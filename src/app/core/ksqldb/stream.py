@@ -0,0 +1,228 @@
+import json
+from contextlib import suppress
+from types import TracebackType
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+)
+
+import httpx
+
+from app.core.i18n import _
+from app.core.preprocess.resources import parse_schema_list
+from app.core.urls import SimpleURL
+
+from .resources import (
+    KsqlEndpoints,
+    KsqlException,
+    KsqlQuery,
+)
+
+DELIMITED_ACCEPT_HEADER = "application/vnd.ksqlapi.delimited.v1"
+
+# Extension of streamed httpx.Response with URL of node that sent it
+NODE_URL_EXTENSION = "ksqldb_ui.node_url"
+
+# First version with /query-stream endpoint (Confluent Platform reports own numbering)
+QUERY_STREAM_MIN_VERSION = (0, 10)
+QUERY_STREAM_MIN_CP_VERSION = (6, 0)
+
+
+def supports_query_stream(version: str | None) -> bool:
+    """Check if ksqlDB server of given version supports /query-stream endpoint."""
+    try:
+        major, minor, *_rest = (int(part) for part in str(version).split("-")[0].split("."))
+    except ValueError:
+        return False
+
+    if major == 0:
+        return (major, minor) >= QUERY_STREAM_MIN_VERSION
+    return (major, minor) >= QUERY_STREAM_MIN_CP_VERSION
+
+
+class KsqlQueryStream:
+    """Streaming result of push or pull query.
+
+    Rows are read from server as they arrive:
+
+    >>> async with await ksql.stream_query("SELECT * FROM s EMIT CHANGES") as stream:
+    ...     async for row in stream:
+    ...         print(stream.columns, row)
+
+    Query is sent by `send` function of client (via its circuit breaker and
+    failover of nodes), and closed on the node that sent response.
+    """
+
+    def __init__(
+        self,
+        session: httpx.AsyncClient,
+        send: Callable[
+            [KsqlEndpoints, dict, dict[str, str], httpx.Timeout], Awaitable[httpx.Response]
+        ],
+        query: KsqlQuery,
+        legacy: bool = False,
+        timeout: float | None = None,
+        properties: dict | None = None,
+    ) -> None:
+        """Initialize class instance."""
+        self.session = session
+        self.send = send
+        self.query = query
+        self.legacy = legacy
+        self.timeout = timeout
+        self.properties = properties or {}
+
+        self.query_id: str | None = None
+        self.columns: list[str] = []
+        self.column_types: list[str] = []
+        self.final_message: str | None = None
+        self.finished = False
+        self.url: SimpleURL | None = None  # URL of node that runs query
+
+        self._response: httpx.Response | None = None
+        self._lines: AsyncIterator[str] | None = None
+
+    def __repr__(self) -> str:
+        """Return object representation."""
+        return f"<{self.__class__.__name__}: {self.query_id or self.query}>"
+
+    @property
+    def endpoint(self) -> KsqlEndpoints:
+        return KsqlEndpoints.QUERY if self.legacy else KsqlEndpoints.QUERY_STREAM
+
+    async def __aenter__(self) -> "KsqlQueryStream":
+        await self.open()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    def __aiter__(self) -> AsyncIterator[list]:
+        return self.rows()
+
+    async def open(self) -> None:
+        """Send query and read header (query id and columns)."""
+        if self.legacy:
+            body: dict[str, Any] = {
+                "ksql": self.query.as_string,
+                "streamsProperties": self.properties,
+            }
+            headers: dict[str, str] = {}
+        else:
+            body = {"sql": self.query.as_string, "properties": self.properties}
+            headers = {"Accept": DELIMITED_ACCEPT_HEADER}
+
+        # Push queries may wait for new rows forever
+        timeout = httpx.Timeout(self.timeout, read=None)
+        self._response = await self.send(self.endpoint, body, headers, timeout)
+        self.url = self._response.extensions.get(NODE_URL_EXTENSION)
+
+        if not self._response.is_success:
+            await self._response.aread()
+            await self._response.aclose()
+            raise KsqlException(
+                info=_("Failed to execute ksqlDB request: {}").format(self.query),
+                response=self._response,
+            )
+
+        self._lines = self._response.aiter_lines()
+        try:
+            await self._read_header()
+        except BaseException:
+            # Stream isn't returned to caller, so its connection is released here
+            await self._response.aclose()
+            self._response = None
+            raise
+
+    async def rows(self) -> AsyncIterator[list]:
+        """Iterate over rows (list of column values) as they arrive."""
+        if self._lines is None:
+            raise RuntimeError("Query stream is not opened")
+
+        async for line in self._lines:
+            if (entry := self._parse_line(line)) is None:
+                continue
+
+            if self.legacy:
+                if "row" in entry:
+                    yield entry["row"].get("columns", [])
+                    continue
+                if "finalMessage" in entry:
+                    self.final_message = entry["finalMessage"]
+                    break
+                self._raise_error(entry)
+            elif isinstance(entry, list):
+                yield entry
+            else:
+                self._raise_error(entry)
+
+        self.finished = True
+
+    async def close(self) -> None:
+        """Close stream. Running push query is terminated on server."""
+        if self._response is None:
+            return
+
+        if not self.finished and not self.legacy and self.query_id and self.url:
+            with suppress(httpx.HTTPError):
+                await self.session.post(
+                    str(self.url / KsqlEndpoints.CLOSE_QUERY.value),
+                    json={"queryId": self.query_id},
+                )
+
+        await self._response.aclose()
+        self._response = None
+
+    async def _read_header(self) -> None:
+        assert self._lines is not None
+        async for line in self._lines:
+            if (entry := self._parse_line(line)) is None:
+                continue
+
+            if self.legacy:
+                if "header" not in entry:
+                    self._raise_error(entry)
+                header = entry["header"]
+                self.query_id = header.get("queryId")
+                schema = parse_schema_list(header.get("schema", ""))
+                self.columns = [col.name for col in schema]
+                self.column_types = [col.type for col in schema]
+            else:
+                if "columnNames" not in entry:
+                    self._raise_error(entry)
+                self.query_id = entry.get("queryId")
+                self.columns = entry["columnNames"]
+                self.column_types = entry.get("columnTypes", [])
+            return
+
+        self.finished = True
+
+    def _parse_line(self, line: str) -> Any:
+        """Parse single line of response.
+
+        Legacy /query endpoint returns JSON array split by lines, so array
+        brackets and trailing commas are stripped before decoding.
+        """
+        line = line.strip()
+        if self.legacy:
+            line = line.removeprefix("[").removesuffix("]").removesuffix(",").strip()
+
+        if not line:
+            return None
+        return json.loads(line)
+
+    def _raise_error(self, entry: Any) -> None:
+        self.finished = True
+        error = entry.get("errorMessage", entry) if isinstance(entry, dict) else entry
+        message = error.get("message") if isinstance(error, dict) else None
+        raise KsqlException(
+            info=message or _("Failed to execute ksqlDB request: {}").format(self.query),
+            response=self._response,
+        )
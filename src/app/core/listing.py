@@ -0,0 +1,222 @@
+import math
+import re
+from typing import (
+    Any,
+    Callable,
+    Mapping,
+)
+from urllib.parse import urlencode
+
+from fastapi import Request
+
+from .ksqldb.jsonstream import KsqlResponse
+from .ksqldb.models import Model
+from .settings import get_server
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Query params of list pages
+PAGE_PARAM = "page"
+SIZE_PARAM = "size"
+SORT_PARAM = "sort"  # column name, prefixed with "-" for descending order
+SEARCH_PARAM = "search"
+FILTER_PARAM = "filter"  # repeated for each active filter
+
+SortKey = Callable[[Any], Any]
+
+
+def normalize_filter_name(value: str) -> str:
+    """Normalize name to match filters (case, spaces and dashes are ignored)."""
+    return re.sub(r"[\s-]", "_", value.lower())
+
+
+class ListParams:
+    """Paging, sorting and filtering params of list page."""
+
+    __slots__ = ("page", "size", "sort", "desc", "search", "filters")
+
+    def __init__(
+        self,
+        page: int = 1,
+        size: int = DEFAULT_PAGE_SIZE,
+        sort: str = "",
+        desc: bool = False,
+        search: str = "",
+        filters: list[str] | None = None,
+    ) -> None:
+        """Initialize class instance."""
+        self.page = page
+        self.size = size
+        self.sort = sort
+        self.desc = desc
+        self.search = search
+        self.filters = filters or []
+
+    @classmethod
+    def from_request(cls, request: Request, default_sort: str) -> "ListParams":
+        params = request.query_params
+        sort = params.get(SORT_PARAM) or default_sort
+        return cls(
+            page=max(1, get_int(params.get(PAGE_PARAM), 1)),
+            size=min(MAX_PAGE_SIZE, max(1, get_int(params.get(SIZE_PARAM), DEFAULT_PAGE_SIZE))),
+            sort=sort.lstrip("-"),
+            desc=sort.startswith("-"),
+            search=params.get(SEARCH_PARAM, "").strip(),
+            filters=[f for value in params.getlist(FILTER_PARAM) for f in value.split(",") if f],
+        )
+
+
+def get_int(value: str | None, default: int) -> int:
+    try:
+        return int(value) if value else default
+    except ValueError:
+        return default
+
+
+class ListIndex:
+    """Objects of list page with precomputed filter membership and sort orders.
+
+    Membership is a bit mask of configured filters that object name matches,
+    so filtering by any combination of filters is a single AND per object.
+    Index is cached with response, so it's built once while response is cached.
+    """
+
+    def __init__(
+        self,
+        items: list[Any],
+        name: SortKey,
+        sort_keys: Mapping[str, SortKey],
+        filters: list[str],
+    ) -> None:
+        """Initialize class instance."""
+        self.items = items
+        self.sort_keys = sort_keys
+        self.filters = [normalize_filter_name(f) for f in filters]
+        self.names = [normalize_filter_name(name(item)) for item in items]
+        self.masks = [self.get_mask(name) for name in self.names]
+        self._orders: dict[str, list[int]] = {}
+
+    def get_mask(self, name: str) -> int:
+        mask = 0
+        for i, f in enumerate(self.filters):
+            if f in name:
+                mask |= 1 << i
+        return mask
+
+    def get_order(self, column: str) -> list[int]:
+        """Get indexes of items sorted by column."""
+        if (order := self._orders.get(column)) is None:
+            key = self.sort_keys[column]
+            order = sorted(range(len(self.items)), key=lambda i: key(self.items[i]))
+            self._orders[column] = order
+        return order
+
+    def select(self, params: ListParams) -> list[int]:
+        """Get indexes of items matching params, in requested order."""
+        required = 0
+        extra_filters = []  # Unknown filters are matched by name as is
+        for f in map(normalize_filter_name, params.filters):
+            if f in self.filters:
+                required |= 1 << self.filters.index(f)
+            else:
+                extra_filters.append(f)
+        search = normalize_filter_name(params.search)
+
+        order = self.get_order(params.sort) if params.sort in self.sort_keys else None
+        indexes = order if order is not None else range(len(self.items))
+        selected = [
+            i
+            for i in indexes
+            if self.masks[i] & required == required
+            and (not search or search in self.names[i])
+            and all(f in self.names[i] for f in extra_filters)
+        ]
+        if params.desc:
+            selected.reverse()
+        return selected
+
+
+class ListPage:
+    """Single page of list with links to other pages."""
+
+    def __init__(
+        self,
+        request: Request,
+        index: ListIndex,
+        params: ListParams,
+    ) -> None:
+        """Initialize class instance."""
+        selected = index.select(params)
+        self.request = request
+        self.params = params
+        self.total = len(selected)
+        self.all_total = len(index.items)
+        self.pages = max(1, math.ceil(self.total / params.size))
+        self.number = min(params.page, self.pages)
+        self.offset = (self.number - 1) * params.size
+        self.items = [index.items[i] for i in selected[self.offset : self.offset + params.size]]
+
+    @property
+    def has_prev(self) -> bool:
+        return self.number > 1
+
+    @property
+    def has_next(self) -> bool:
+        return self.number < self.pages
+
+    def url(self, **changes: Any) -> str:
+        """Get query string of current page with changed params (None to remove param)."""
+        params = [(k, v) for k, v in self.request.query_params.multi_items() if k not in changes]
+        for key, value in changes.items():
+            values = value if isinstance(value, (list, tuple)) else [value]
+            params += [(key, str(v)) for v in values if v is not None and v != ""]
+        return "?" + urlencode(params)
+
+    def sort_url(self, column: str) -> str:
+        """Get query string to sort by column (or reverse order if sorted by it)."""
+        desc = column == self.params.sort and not self.params.desc
+        return self.url(**{SORT_PARAM: f"-{column}" if desc else column, PAGE_PARAM: None})
+
+    def filter_url(self, name: str) -> str:
+        """Get query string to toggle filter."""
+        filters = list(self.params.filters)
+        if name in filters:
+            filters.remove(name)
+        else:
+            filters.append(name)
+        return self.url(**{FILTER_PARAM: filters, PAGE_PARAM: None})
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "items": [item.as_dict() if isinstance(item, Model) else item for item in self.items],
+            "page": self.number,
+            "pages": self.pages,
+            "size": self.params.size,
+            "total": self.total,
+            "all_total": self.all_total,
+        }
+
+
+def get_list_page(
+    request: Request,
+    response: KsqlResponse,
+    kind: str,
+    name: SortKey,
+    sort_keys: Mapping[str, SortKey],
+    default_sort: str,
+) -> ListPage:
+    """Get page of list of objects from response, according to request query params.
+
+    :param kind: attribute of parsed response with objects, e.g. "streams"
+    :param name: function to get object name, which is matched by filters and search
+    :param sort_keys: functions to get sort key of object by column names
+    """
+    filters = [f for group in get_server(request).filters or [] for f in group]
+    parsed = response.parsed
+    cache_key = ("list_index", kind, tuple(filters))
+    if (index := parsed.derived.get(cache_key)) is None:
+        items = getattr(parsed, kind)
+        index = parsed.derived[cache_key] = ListIndex(items, name, sort_keys, filters)
+
+    return ListPage(request, index, ListParams.from_request(request, default_sort))
@@ -1,17 +1,19 @@
 from typing import (
+    TYPE_CHECKING,
     Protocol,
     runtime_checkable,
 )
 
-import httpx
-
 from .resources import (
     RawRenderer,
     SelectResult,
     TableRenderer,
-    parse_schema_list,
 )
 
+if TYPE_CHECKING:
+    from app.core.ksqldb.jsonstream import KsqlResponse
+    from app.core.ksqldb.models import ParsedResponse
+
 
 @runtime_checkable
 class Renderable(Protocol):
@@ -19,30 +21,31 @@ class Renderable(Protocol):
         """Render the object to a string."""
 
 
-def preprocess_data(response: httpx.Response) -> Renderable | None:
+def preprocess_data(response: "KsqlResponse") -> Renderable | None:
     """Preprocess data from ksqlDB response."""
     if response.status_code != 200:
         return None
 
-    data = response.json()
+    parsed = response.parsed
+    data = parsed.data
     if not isinstance(data, list) or not data:
         return None
 
     first = data[0]
 
-    if "header" in first:
-        return preprocess_select(data)
+    if parsed.header is not None:
+        return preprocess_select(parsed)
 
     resp_type = first.get("@type")
     if resp_type == "function_names":
         return TableRenderer(items=first["functions"], options={"type": "badge"})
 
     if resp_type == "properties":
-        return TableRenderer(items=first["properties"])
+        return TableRenderer(items=parsed.properties)
 
     if resp_type == "queries":
         return TableRenderer(
-            items=first["queries"],
+            items=parsed.queries,
             cols=[
                 "id",
                 "queryType",
@@ -60,7 +63,7 @@ def preprocess_data(response: httpx.Response) -> Renderable | None:
 
     if resp_type == "streams":
         return TableRenderer(
-            items=first["streams"],
+            items=parsed.streams,
             options={
                 "keyFormat": "badge",
                 "valueFormat": "valueFormat",
@@ -81,22 +84,17 @@ def preprocess_data(response: httpx.Response) -> Renderable | None:
     return None
 
 
-def preprocess_select(data: list) -> SelectResult:
+def preprocess_select(parsed: "ParsedResponse") -> SelectResult:
     """Preprocess SELECT query data from ksqlDB response."""
-    # Extract schema from header
-    header = data[0].get("header", {})
-    # Extract column names from schema string
-    schema_list = parse_schema_list(header.get("schema", ""))
-
-    preprocessed_data = []
-    for item in data[1:]:
-        row = item.get("row", {}).get("columns", [])
-        if row:
-            preprocessed_row = {col.name: val for col, val in zip(schema_list, row)}
-            preprocessed_data.append(preprocessed_row)
+    assert parsed.header is not None
+    schema_list = parsed.header.schema
+
+    preprocessed_data = [
+        {col.name: val for col, val in zip(schema_list, row)} for row in parsed.rows if row
+    ]
 
     return SelectResult(
         rows=preprocessed_data,
         schema_list=schema_list,
-        final_message=data[-1].get("finalMessage"),
+        final_message=parsed.final_message,
     )
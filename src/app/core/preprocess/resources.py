@@ -1,4 +1,8 @@
 from dataclasses import dataclass
+from typing import (
+    Any,
+    Iterator,
+)
 
 
 @dataclass
@@ -81,12 +85,16 @@ class SelectResult:
 
     def render(self) -> str:
         """Render preprocessed data."""
+        return "".join(self.iter_render())
+
+    def iter_render(self) -> Iterator[str]:
+        """Render preprocessed data by rows."""
         from ..render import (
             Options,
             render_kv,
         )
 
-        result = render_kv(
+        yield render_kv(
             "Schema",
             self.schema_list,
             as_table=True,
@@ -98,18 +106,17 @@ class SelectResult:
         )
 
         for index, row in enumerate(self.rows, start=1):
-            result += render_kv(
+            yield render_kv(
                 k=f"Row {index}/{len(self.rows)}",
                 v=row,
                 add_copy_button=True,
             )
-        result += f'<div class="divider">{self.final_message}</div>'
-        return result
+        yield f'<div class="divider">{self.final_message}</div>'
 
 
 @dataclass
 class TableRenderer:
-    items: list[dict]
+    items: list[Any]
     cols: list[str] | None = None
     options: dict[str, str] | None = None
 
@@ -1,20 +1,36 @@
 import contextlib
 import dataclasses
 import datetime
+import hashlib
 import json
-from collections import deque
+from collections import (
+    OrderedDict,
+    deque,
+)
 from dataclasses import dataclass
 from enum import Enum
+from functools import (
+    lru_cache,
+    partial,
+)
 from typing import (
     Any,
     Callable,
+    Hashable,
+    Iterator,
     TypeVar,
+    cast,
 )
 
 from fastapi.requests import Request
 
+from .i18n import get_current_language
 from .ksqldb import KsqlErrors
-from .settings import get_server
+from .ksqldb.models import Model
+from .settings import (
+    CacheSettings,
+    get_server,
+)
 from .utils import ContextResponse
 
 RENDER_HELPERS: dict = {}
@@ -39,6 +55,9 @@ BUBBLE_TEMPLATE = """
 
 F = TypeVar("F", bound=Callable[..., Any])
 
+# Collections of rendered items (e.g. rows of table), used to estimate fragment size
+ITEMS_TYPES = (list, tuple, deque, dict)
+
 
 def register(fn: F) -> F:
     """Register a render helper function."""
@@ -47,6 +66,156 @@ def register(fn: F) -> F:
     return fn
 
 
+class FragmentCache:
+    """Size-aware LRU cache of HTML fragments rendered by template helpers.
+
+    Fragments are keyed by digest of rendered data and options, server (links
+    depend on its settings) and language, so the same metadata is rendered
+    once for all viewers until it changes. Size is a total length of fragments.
+
+    Length of fragments that are too large to be stored is remembered per item
+    of rendered collection, so larger collections are rendered without digest.
+    """
+
+    def __init__(self, size: int = CacheSettings().fragments_size) -> None:
+        """Initialize class instance."""
+        self._entries: OrderedDict[Hashable, str] = OrderedDict()
+        self.total = 0
+        self.configure(size)
+
+        self.hits = 0
+        self.misses = 0
+        self.uncacheable = 0  # arguments that can't be digested
+        self.oversized = 0  # fragments that are too large to be stored
+        self.evictions = 0
+
+    def configure(self, size: int) -> None:
+        self.size = size
+        self.max_entry_size = size // 10  # single fragment can't evict whole cache
+        self._item_sizes: dict[str, float] = {}  # min length per item of oversized fragments
+        self.clear()
+
+    def get(self, key: Hashable) -> str | None:
+        if (value := self._entries.get(key)) is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: str) -> None:
+        if len(value) > self.max_entry_size:
+            return
+
+        if (old := self._entries.pop(key, None)) is not None:
+            self.total -= len(old)
+        self._entries[key] = value
+        self.total += len(value)
+        while self.total > self.size:
+            _key, evicted = self._entries.popitem(last=False)
+            self.total -= len(evicted)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.total = 0
+
+    def get_key(self, name: str, args: tuple, kwargs: dict[str, Any]) -> Hashable | None:
+        """Get key of fragment (None if arguments can't be digested)."""
+        server = None
+        if (request := kwargs.pop("request", None)) is not None:
+            server = get_server(request).code
+        try:
+            data = json.dumps([args, kwargs], sort_keys=True, default=_encode_for_digest)
+        except (TypeError, ValueError):
+            return None
+
+        digest = hashlib.blake2b(data.encode(), digest_size=16).digest()
+        return name, digest, server, get_current_language()
+
+    def is_oversized(self, name: str, items: Any) -> bool:
+        """Check if fragment of items surely can't be stored, judging by previous fragments."""
+        if (item_size := self._item_sizes.get(name)) is None or not isinstance(items, ITEMS_TYPES):
+            return False
+        return len(items) * item_size > self.max_entry_size
+
+    def add_oversized(self, name: str, items: Any, value: str) -> None:
+        self.oversized += 1
+        if isinstance(items, ITEMS_TYPES) and len(items):
+            item_size = len(value) / len(items)
+            self._item_sizes[name] = min(item_size, self._item_sizes.get(name, item_size))
+
+    def wrap(self, fn: F) -> F:
+        """Wrap render function to cache its fragments."""
+
+        def cached(*args: Any, **kwargs: Any) -> str:
+            if self.size <= 0:
+                return str(fn(*args, **kwargs))
+
+            name = fn.__name__
+            items = args[0] if args else kwargs.get("data")
+            if self.is_oversized(name, items):
+                self.oversized += 1
+                return str(fn(*args, **kwargs))
+
+            key = self.get_key(name, args, dict(kwargs))
+            if key is None:
+                self.uncacheable += 1
+                return str(fn(*args, **kwargs))
+
+            if (value := self.get(key)) is None:
+                value = str(fn(*args, **kwargs))
+                if len(value) > self.max_entry_size:
+                    self.add_oversized(name, items, value)
+                else:
+                    self.set(key, value)
+            return value
+
+        cached.__name__ = fn.__name__
+        cached.__doc__ = fn.__doc__
+        return cast(F, cached)
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return {
+            "fragments": len(self._entries),
+            "size": self.total,
+            "max_size": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "uncacheable": self.uncacheable,
+            "oversized": self.oversized,
+            "evictions": self.evictions,
+        }
+
+
+def _encode_for_digest(value: Any) -> Any:
+    # Types are a part of digest, so the same values of different types (which
+    # may be rendered differently) are not mixed up. Nested values are encoded
+    # by JSON encoder itself, so dataclasses are not deep-copied like by asdict().
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        cls = type(value)
+        return {cls.__name__: [getattr(value, name) for name in _get_field_names(cls)]}
+    if isinstance(value, deque):
+        return {"deque": list(value)}
+    raise TypeError(f"Object of type {type(value)} can't be digested")
+
+
+@lru_cache(maxsize=None)
+def _get_field_names(cls: type) -> tuple[str, ...]:
+    return tuple(field.name for field in dataclasses.fields(cls))
+
+
+FRAGMENT_CACHE = FragmentCache()
+
+
+def register_cached(fn: F) -> F:
+    """Register a render helper function, caching its fragments rendered in templates."""
+    RENDER_HELPERS[fn.__name__] = FRAGMENT_CACHE.wrap(fn)
+    return fn
+
+
 class BootstrapLevel(Enum):
     """Bootstrap levels in UI."""
 
@@ -55,7 +224,7 @@ class BootstrapLevel(Enum):
     DANGER = "danger"
 
 
-@register
+@register_cached
 def render_section(response: dict, **kwargs: Any) -> str:
     if (
         response.get("error_code") == KsqlErrors.BAD_STATEMENT.value
@@ -79,7 +248,7 @@ def render_list(value: list | tuple, enum: bool = False) -> str:
     return "<br>".join(rendered_values)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Options:
     # Wrap as code
     code: bool = False
@@ -107,16 +276,31 @@ class Options:
 
     @classmethod
     def from_string(cls, value: str) -> "Options":
-        return cls(
-            code=any(v in value for v in ["code", "pre"]),
-            badge=any(v in value for v in ["badge", "pill"]),
-            ignored=any(v in value for v in ["hide", "ignore", "ignored"]),
-            breaked=any(v in value for v in ["br", "break", "breaked"]),
-            timestamp=any(v in value for v in ["timestamp", "ts"]),
-            kafka_topic=any(v in value for v in ["topic", "kafka_topic"]),
-            collapsible=any(v in value for v in ["collapsible", "collapse"]),
-            hide_empty_column=any(v in value for v in ["empty_column"]),
-        )
+        if (options := OPTIONS_CACHE.get(value)) is None:
+            options = OPTIONS_CACHE[value] = cls(
+                code=any(v in value for v in ["code", "pre"]),
+                badge=any(v in value for v in ["badge", "pill"]),
+                ignored=any(v in value for v in ["hide", "ignore", "ignored"]),
+                breaked=any(v in value for v in ["br", "break", "breaked"]),
+                timestamp=any(v in value for v in ["timestamp", "ts"]),
+                kafka_topic=any(v in value for v in ["topic", "kafka_topic"]),
+                collapsible=any(v in value for v in ["collapsible", "collapse"]),
+                hide_empty_column=any(v in value for v in ["empty_column"]),
+            )
+        return options
+
+
+# Options parsed from strings (there are only few distinct ones used in templates)
+OPTIONS_CACHE: dict[str, Options] = {}
+DEFAULT_OPTIONS = Options()
+
+ValueRenderer = Callable[[Any], str]
+
+
+def get_options(options: Options | str | None) -> Options:
+    if isinstance(options, str):
+        return Options.from_string(options)
+    return options or DEFAULT_OPTIONS
 
 
 @register
@@ -134,73 +318,129 @@ def render_value(
     parent_options: dict[str, Any] | None = None,
     **kwargs: Any,
 ) -> str:
-    if isinstance(options, str):
-        opt = Options.from_string(options)
+    if options is None:
+        return render_plain_value(value, parent_options or {})
+    return compile_value_renderer(get_options(options), parent_options, **kwargs)(value)
+
+
+@register
+def render_chunks(value: Any) -> Iterator[str]:
+    """Render value by chunks if it supports it (e.g. by rows of SELECT result)."""
+    if hasattr(value, "iter_render"):
+        yield from value.iter_render()
     else:
-        opt = options or Options()
+        yield render_value(value)
+
 
+def compile_value_renderer(
+    opt: Options,
+    parent_options: dict[str, Any] | None = None,
+    **kwargs: Any,
+) -> ValueRenderer:
+    """Get function to render values with the same options (e.g. cells of table column)."""
     if opt.code:
-        return f"<code>{value}</code>"
+        return render_code
 
     if opt.kafka_topic:
-        return render_topic_link(
-            request=kwargs["request"],
-            name=value,
-        )
+        request = kwargs["request"]
+        return lambda value: render_topic_link(request=request, name=value)
 
     if opt.timestamp:
-        return render_timestamp(value)
+        return render_timestamp
 
     if opt.badge:
-        return f'<span class="badge text-bg-purple">{value}</span>'
+        return lambda value: f'<span class="badge text-bg-purple">{value}</span>'
 
     if opt.collapsible:
-        return f"<details><summary>Collapsed</summary>{value}</details>"
+        return lambda value: f"<details><summary>Collapsed</summary>{value}</details>"
+
+    return partial(render_plain_value, parent_options=parent_options or {})
+
+
+def render_plain_value(value: Any, parent_options: dict[str, Any]) -> str:
+    """Render value without options, depending on its type."""
+    if (renderer := VALUE_RENDERERS.get(type(value))) is not None:
+        return renderer(value, parent_options)
 
     if hasattr(value, "render"):
         return str(value.render())
 
-    if value is True or (isinstance(value, str) and value.lower() == "true"):
-        return '<span class="badge text-bg-success">true</span>'
+    # Subclasses of supported types
+    for value_type, renderer in VALUE_RENDERERS.items():
+        if isinstance(value, value_type):
+            return renderer(value, parent_options)
+
+    return str(value)
+
+
+def render_code(value: Any, *args: Any) -> str:
+    return f"<code>{value}</code>"
+
+
+def _render_bool(value: bool, parent_options: dict[str, Any]) -> str:
+    return TRUE_BADGE if value else FALSE_BADGE
+
+
+def _render_none(value: None, parent_options: dict[str, Any]) -> str:
+    return '<span class="badge text-bg-secondary">none</span>'
 
-    if value is False or (isinstance(value, str) and value.lower() == "false"):
-        return '<span class="badge text-bg-danger">false</span>'
 
-    if value == "[hidden]" or value is None:
-        value = str(value).lstrip("[").rstrip("]").lower()
-        return f'<span class="badge text-bg-secondary">{value}</span>'
+def _render_str(value: str, parent_options: dict[str, Any]) -> str:
+    if value.lower() == "true":
+        return TRUE_BADGE
 
-    if isinstance(value, (int, float)):
+    if value.lower() == "false":
+        return FALSE_BADGE
+
+    if value == "[hidden]":
+        return '<span class="badge text-bg-secondary">hidden</span>'
+
+    if value.isdigit() or value[1:].isdigit():
         return f"<code>{value}</code>"
 
-    if isinstance(value, str):
-        if value.isdigit() or value[1:].isdigit():
-            return f"<code>{value}</code>"
+    if value.startswith("http://") or value.startswith("https://"):
+        return render_link(value, classes="link-offset-2")
+
+    return value
 
-        if value.startswith("http://") or value.startswith("https://"):
-            return render_link(value, classes="link-offset-2")
 
-    if isinstance(value, (list, tuple)):
-        if value and (isinstance(value[0], dict) or dataclasses.is_dataclass(value[0])):
-            return render_table(list(value), **(parent_options or {}))
+def _render_sequence(value: list | tuple, parent_options: dict[str, Any]) -> str:
+    if value and (isinstance(value[0], dict) or dataclasses.is_dataclass(value[0])):
+        return render_table(list(value), **parent_options)
 
-        return render_list(value)
+    return render_list(value)
 
+
+def _render_dict(value: dict, parent_options: dict[str, Any]) -> str:
     # TODO: Maybe change to different renderer
-    if isinstance(value, dict):
-        return render_section(value, **(parent_options or {}))
+    return render_section(value, **parent_options)
 
-    if isinstance(value, deque):
-        value = list(reversed(value))
-        if value and hasattr(value[0], "keys"):
-            return render_table(value)
-        else:
-            return render_list(value)
 
-    return str(value)
+def _render_deque(value: deque, parent_options: dict[str, Any]) -> str:
+    items = list(reversed(value))
+    if items and hasattr(items[0], "keys"):
+        return render_table(items)
+    return render_list(items)
 
 
-@register
+TRUE_BADGE = '<span class="badge text-bg-success">true</span>'
+FALSE_BADGE = '<span class="badge text-bg-danger">false</span>'
+
+# Renderers of values by their types (bool goes before int for subclasses check)
+VALUE_RENDERERS: dict[type, Callable[[Any, dict[str, Any]], str]] = {
+    bool: _render_bool,
+    type(None): _render_none,
+    int: render_code,
+    float: render_code,
+    str: _render_str,
+    list: _render_sequence,
+    tuple: _render_sequence,
+    dict: _render_dict,
+    deque: _render_deque,
+}
+
+
+@register_cached
 def render_dict_table(data: dict, **kwargs: Any) -> str:
     return render_table(
         data=[{"key": k, "value": v} for k, v in data.items()],
@@ -209,7 +449,7 @@ def render_dict_table(data: dict, **kwargs: Any) -> str:
     )
 
 
-@register
+@register_cached
 def render_list_table(data: list, col_name: str = "value", **kwargs: Any) -> str:
     return render_table(
         data=[{col_name: v} for v in data],
@@ -218,7 +458,7 @@ def render_list_table(data: list, col_name: str = "value", **kwargs: Any) -> str
     )
 
 
-@register
+@register_cached
 def render_table(
     data: list[Any] | None,
     cols: list[str] | None = None,
@@ -228,23 +468,18 @@ def render_table(
 ) -> str:
     """Render a table.
 
+    Render function of each column is compiled once from its options, so
+    rendering takes linear time of table size.
+
     :param data: list of dicts with data
     :param cols: list of columns to display. If None, then autodetect columns from first entry.
     :param options: formatting options for each col
     """
-
-    def get_value(obj: object, name: str) -> Any:
-        if dataclasses.is_dataclass(obj):
-            return getattr(obj, name)
-        return obj.get(name)
-
     if not data:
         return ""
 
     first_el = data[0]
-    opts: dict[str, Options] = {
-        k: Options.from_string(v) if isinstance(v, str) else v for k, v in (options or {}).items()
-    }
+    opts = {k: get_options(v) for k, v in (options or {}).items()}
 
     columns_keys = cols
     if not columns_keys:
@@ -255,44 +490,43 @@ def render_table(
         else:
             raise TypeError(f"Object of type {type(first_el)} has no methods keys()")
 
-    filtered_columns_keys = []
-    columns = '<th scope="col">#</th>' if show_line_numbers else ""
+    def get_value(obj: Any, name: str) -> Any:
+        if dataclasses.is_dataclass(obj) and not isinstance(obj, Model):
+            return getattr(obj, name)
+        return obj.get(name)
+
+    # Nested values (e.g. lists of dicts) are rendered with the same options as table
+    parent_options = {
+        "cols": cols,
+        "show_line_numbers": show_line_numbers,
+        "options": options,
+        "as_table": True,
+    }
+
+    columns = ['<th scope="col">#</th>'] if show_line_numbers else []
+    compiled: list[tuple[str, str, ValueRenderer]] = []
     for col in columns_keys:
-        if opt := opts.get(col):
-            if opt.ignored:
-                continue
-            if opt.hide_empty_column:
-                if not any(get_value(item, col) for item in data):
-                    continue
+        opt = opts.get(col, DEFAULT_OPTIONS)
+        if opt.ignored:
+            continue
+        if opt.hide_empty_column and not any(get_value(item, col) for item in data):
+            continue
 
-        columns += f'\n<th scope="col">{col.title()}</th>'
-        filtered_columns_keys.append(col)
+        columns.append(f'\n<th scope="col">{col.title()}</th>')
+        td = f"\n<td class={'breaked' if opt.breaked else ''}>"
+        compiled.append((col, td, compile_value_renderer(opt, parent_options, **kwargs)))
 
-    body = ""
+    rows = []
     for i, item in enumerate(data, start=1):
-        item_body = f'<th scope="row">{i}</th>' if show_line_numbers else ""
-        for col in filtered_columns_keys:
-            opt = opts.get(col, Options())
-            td_class = ""
-            if opt.breaked:
-                td_class += "breaked"
-
-            rendered_value = render_value(
-                value=get_value(item, col),
-                options=opt,
-                parent_options={
-                    "cols": cols,
-                    "show_line_numbers": show_line_numbers,
-                    "options": options,
-                    "as_table": True,
-                },
-                **kwargs,
-            )
-            item_body += f"\n<td class={td_class}>{rendered_value}</td>"
-
-        body += f"<tr>{item_body}</tr>"
+        cells = [f'<tr><th scope="row">{i}</th>' if show_line_numbers else "<tr>"]
+        if dataclasses.is_dataclass(item) and not isinstance(item, Model):
+            cells += [f"{td}{render(getattr(item, col))}</td>" for col, td, render in compiled]
+        else:
+            cells += [f"{td}{render(item.get(col))}</td>" for col, td, render in compiled]
+        cells.append("</tr>")
+        rows.append("".join(cells))
 
-    return TABLE_TEMPLATE.format(columns=columns, body=body)
+    return TABLE_TEMPLATE.format(columns="".join(columns), body="".join(rows))
 
 
 @register
@@ -451,7 +685,7 @@ def render_bubbles(data: dict, keys: list[str] | None = None, lower: bool = Fals
     return "".join(render(k) for k in keys)
 
 
-@register
+@register_cached
 def render_stream_fields(data: list) -> str:
     def flatten(item: dict | list | None) -> dict | list | None:
         if not item:
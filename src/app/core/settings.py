@@ -1,6 +1,8 @@
+from importlib.util import find_spec
 from os import getenv
 from typing import (
     Any,
+    Literal,
     Mapping,
     Optional,
 )
@@ -15,8 +17,19 @@ from .utils import flatten_dict
 
 ENV_VAR_PREFIX = "KSQLDB_UI"
 SERVER_QUERY_PARAM: str = "s"
+REFRESH_QUERY_PARAM: str = "refresh"
 README = "https://github.com/deniskrumko/ksqldb-ui/blob/master/README.md"
 
+DEFAULT_CACHE_TTL: dict[str, float] = {
+    "show_streams": 10,
+    "show_tables": 10,
+    "show_queries": 5,
+    "show_topics": 30,
+    "show_properties": 60,
+    "describe": 10,
+    "explain": 5,
+}
+
 
 class LowercaseKeyMixin:
     """Mixin to normalize keys to lowercase before validation."""
@@ -30,13 +43,39 @@ class HTTPSettings(LowercaseKeyMixin, BaseModel):
     """HTTP settings for the app."""
 
     timeout: int = 5
+    max_connections: int = 100  # Max open connections per ksqlDB server
+    max_keepalive_connections: int = 20  # Max idle connections kept in pool
+    keepalive_expiry: float = 30.0  # Seconds to keep idle connection open
+    http2: bool = False  # Use HTTP/2 (requires "h2" package)
+    gzip: bool = True  # Ask ksqlDB for gzip-compressed responses
+    warmup: bool = True  # Open connections to all servers on startup
+    node_max_failures: int = 3  # Consecutive failures before node is ejected
+    node_eject_time: float = 30  # Seconds before ejected node is probed again
+    breaker_failures: int = 5  # Consecutive failures before server is considered unavailable
+    breaker_reset_time: float = 15  # Seconds before unavailable server is tried again
+    retries: int = 2  # Retries of read-only requests after transient failures
+    retry_backoff: float = 0.25  # Base delay before retry (doubled on each attempt, with jitter)
+    retry_max_backoff: float = 2  # Max delay before retry
+    retry_budget: float = 10  # Max seconds spent on retries per page render
+    max_response_size: int = 100 * 1024 * 1024  # Larger bodies are truncated (0 - no limit)
+    adaptive_timeout: bool = True  # Adapt read timeouts to observed p99 latency
+    min_timeout: float = 1  # Lower bound for adaptive timeouts (upper bound is "timeout")
+    compress_responses: bool = True  # Compress pages for clients (gzip, or brotli if installed)
+    compress_min_size: int = 1024  # Smaller responses are not compressed
+
+    @pydantic.field_validator("http2")
+    def check_http2_installed(cls, value: bool) -> bool:
+        if value and find_spec("h2") is None:
+            raise ValueError('HTTP/2 requires "h2" package, install it with "httpx[http2]"')
+        return value
 
 
 class Server(LowercaseKeyMixin, BaseModel):
     """Server configuration model."""
 
     code: str
-    url: str
+    url: str | list[str]  # Single URL or list of URLs for each node (first is preferred)
+    load_balancing: Literal["round_robin", "least_requests"] = "round_robin"
     name: str | None = None
     default: bool = False
     filters: list[list[str]] | None = None
@@ -53,9 +92,13 @@ class Server(LowercaseKeyMixin, BaseModel):
     def display_name(self) -> str:
         return self.name or self.code.title()
 
+    @property
+    def urls(self) -> list[str]:
+        return [self.url] if isinstance(self.url, str) else list(self.url)
+
     @property
     def simple_url(self) -> SimpleURL:
-        return SimpleURL(self.url)
+        return SimpleURL(self.urls[0])
 
     @property
     def query(self) -> str:
@@ -78,11 +121,32 @@ class CustomTemplate(LowercaseKeyMixin, BaseModel):
     query: str
 
 
+class CacheSettings(LowercaseKeyMixin, BaseModel):
+    """Settings for ksqlDB metadata cache."""
+
+    enabled: bool = True
+    size: int = 100  # Max cached responses per server
+    fragments_size: int = 16_000_000  # Max total length of cached rendered HTML (0 to disable)
+    details_size: int = 50_000_000  # Max total size of responses kept for "full response" panel
+    details_ttl: float = 600  # Seconds to keep responses for "full response" panel
+
+    # Seconds to cache response of each statement type (LIST is the same as SHOW).
+    # Configured TTLs are merged with default ones (zero disables caching of type).
+    ttl: dict[str, float] = DEFAULT_CACHE_TTL
+
+    @pydantic.field_validator("ttl", mode="before")
+    def merge_default_ttl(cls, value: Any) -> Any:
+        if isinstance(value, Mapping):
+            return {**DEFAULT_CACHE_TTL, **{k.lower(): v for k, v in value.items()}}
+        return value
+
+
 class TemplatesSettings(LowercaseKeyMixin, BaseModel):
     """Settings for templates."""
 
     show_builtin_templates: bool = True
     custom: dict[str, CustomTemplate] = {}
+    compiled_dir: str | None = None  # Precompiled page templates (scripts/compile_templates.sh)
 
 
 class GlobalSettings(LowercaseKeyMixin, BaseModel):
@@ -98,6 +162,7 @@ class Settings(BaseModel):
     """App settings."""
 
     http: HTTPSettings
+    cache: CacheSettings = CacheSettings()
     history: HistorySettings
     templates: TemplatesSettings
     servers: dict[str, Server]
@@ -122,6 +187,7 @@ class Settings(BaseModel):
     def from_config(cls, config: Mapping) -> "Settings":
         settings = cls(
             http=HTTPSettings(**config.get("http", {})),
+            cache=CacheSettings(**config.get("cache", {})),
             history=HistorySettings(**config.get("history", {})),
             templates=TemplatesSettings(**config.get("templates", {})),
             global_settings=GlobalSettings(**config.get("global", {})),
@@ -200,3 +266,8 @@ def get_server_code(request: Request, raise_exc: bool = True) -> str:
             return ""
 
         raise ValueError(f"{SERVER_QUERY_PARAM} query param is not defined")
+
+
+def is_refresh_requested(request: Request) -> bool:
+    """Check if user asked to bypass cache and get fresh data."""
+    return REFRESH_QUERY_PARAM in request.query_params
@@ -1,17 +1,50 @@
+import compileall
+import py_compile
+from contextlib import suppress
 from pathlib import Path
 from typing import (
     Any,
+    AsyncIterator,
     Optional,
 )
 
 from fastapi import Request
 from fastapi.templating import Jinja2Templates
 from httpx._models import Response as HttpxResponse
-from starlette.templating import _TemplateResponse as TemplateResponse
+from jinja2 import (
+    BaseLoader,
+    ChoiceLoader,
+    Environment,
+    FileSystemLoader,
+    ModuleLoader,
+    Template,
+    pass_context,
+)
+from jinja2.runtime import Context
+from markupsafe import Markup
+from starlette.responses import (
+    RedirectResponse,
+    Response,
+    StreamingResponse,
+)
 
+from .details import RESPONSE_DETAILS
+from .etag import (
+    get_digest,
+    get_etag,
+    get_etag_headers,
+    is_not_modified,
+    not_modified,
+)
 from .i18n import get_translations
-from .settings import get_server_code
+from .settings import (
+    REFRESH_QUERY_PARAM,
+    get_server_code,
+    get_settings,
+    is_refresh_requested,
+)
 from .utils import (
+    CONTEXT_DETAILS_KEY,
     CONTEXT_REQUEST_KEY,
     CONTEXT_RESPONSE_KEY,
     ContextRequest,
@@ -19,9 +52,69 @@ from .utils import (
 )
 
 TEMPLATES: Optional[Jinja2Templates] = None
+TEMPLATES_DIR = Path(__file__).parent.parent.parent / "templates"
+TEMPLATES_VERSION: Optional[str] = None
+TEMPLATES_VERSION_FILE = "VERSION"
 ERROR_TEMPLATE = "error.html"
 ERROR_NO_SERVER_TEMPLATE = "error_no_server.html"
 
+# Streamed pages are sent by chunks of this size (in characters)
+STREAM_CHUNK_SIZE = 64 * 1024
+STREAM_CONTEXT_KEY = "streaming"
+STREAM_FLUSH_MARKER = Markup("<!-- flush -->")
+
+
+@pass_context
+def stream_flush(context: Context) -> Markup:
+    """Send everything rendered so far, if template is streamed."""
+    return STREAM_FLUSH_MARKER if context.get(STREAM_CONTEXT_KEY) else Markup("")
+
+
+class StreamingTemplateResponse(StreamingResponse):
+    """Template response sent by chunks while template is rendered.
+
+    Page head and navbar are sent as soon as they are rendered (on `stream_flush()`
+    in template), then page is sent by chunks of `STREAM_CHUNK_SIZE`. Status code
+    can't be changed after first chunk, so errors while rendering break response.
+    """
+
+    def __init__(
+        self,
+        template: Template,
+        context: dict,
+        status_code: int = 200,
+        headers: Optional[dict[str, str]] = None,
+    ) -> None:
+        """Initialize class instance."""
+        self.template = template
+        self.context = context
+        super().__init__(
+            self.iter_chunks(),
+            status_code=status_code,
+            headers=headers,
+            media_type="text/html",
+        )
+
+    async def iter_chunks(self) -> AsyncIterator[str]:
+        # Template is rendered in event loop (not in thread pool as sync iterators
+        # of StreamingResponse), the same as non-streamed templates
+        buffer: list[str] = []
+        size = 0
+        for fragment in self.template.generate(self.context):
+            if fragment == STREAM_FLUSH_MARKER:
+                size = STREAM_CHUNK_SIZE
+            else:
+                buffer.append(fragment)
+                size += len(fragment)
+
+            if size >= STREAM_CHUNK_SIZE and buffer:
+                yield "".join(buffer)
+                buffer.clear()
+                size = 0
+
+        if buffer:
+            yield "".join(buffer)
+
 
 def get_templates() -> Jinja2Templates:
     """Get Jinja2Templates instance."""
@@ -30,13 +123,13 @@ def get_templates() -> Jinja2Templates:
     if TEMPLATES is not None:
         return TEMPLATES
 
-    templates_dir = Path(__file__).parent.parent.parent / "templates"
-    templates = Jinja2Templates(directory=templates_dir)
+    compiled_dir = get_settings().templates.compiled_dir
+    templates = Jinja2Templates(env=create_environment(compiled_dir))
 
     from .render import RENDER_HELPERS
 
     templates.env.globals.update(**RENDER_HELPERS)
-    templates.env.add_extension("jinja2.ext.i18n")
+    templates.env.globals["stream_flush"] = stream_flush
 
     # Set translations
     translations = get_translations()
@@ -46,13 +139,90 @@ def get_templates() -> Jinja2Templates:
     return templates
 
 
+def create_environment(compiled_dir: str | Path | None = None) -> Environment:
+    """Create Jinja environment to load templates from sources or precompiled modules.
+
+    Precompiled templates are loaded without checking sources, so they must be
+    compiled again after templates are changed (see `compile_templates`).
+    """
+    loader: BaseLoader = FileSystemLoader(TEMPLATES_DIR)
+    if compiled_dir:
+        loader = ChoiceLoader([ModuleLoader(compiled_dir), loader])
+
+    return Environment(
+        loader=loader,
+        autoescape=True,
+        auto_reload=not compiled_dir,
+        extensions=["jinja2.ext.i18n"],
+    )
+
+
+def compile_templates(target: str | Path) -> list[str]:
+    """Compile all templates to Python modules and their bytecode in target directory."""
+    env = create_environment()
+    env.compile_templates(target, zip=None, ignore_errors=False)
+    compileall.compile_dir(
+        target,
+        quiet=1,
+        invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+    )
+
+    names = env.list_templates()
+    sources = [(TEMPLATES_DIR / name).read_bytes() for name in names]
+    (Path(target) / TEMPLATES_VERSION_FILE).write_text(get_digest(*names, *sources))
+    return names
+
+
+def get_templates_version() -> str:
+    """Get version of templates, which is a part of ETags of pages.
+
+    Version of precompiled templates is saved on compilation, otherwise it
+    depends on modification time of template files (they are reloaded on change).
+    """
+    global TEMPLATES_VERSION
+
+    if TEMPLATES_VERSION is not None:
+        return TEMPLATES_VERSION
+
+    if compiled_dir := get_settings().templates.compiled_dir:
+        with suppress(OSError):
+            TEMPLATES_VERSION = (Path(compiled_dir) / TEMPLATES_VERSION_FILE).read_text()
+            return TEMPLATES_VERSION
+
+    files = sorted(TEMPLATES_DIR.rglob("*.html"))
+    return get_digest(*(f"{path}:{path.stat().st_mtime_ns}" for path in files))
+
+
 def render_template(
     template_name: str,
     request: Request,
     response: Optional[HttpxResponse] = None,
+    streaming: bool = False,
+    conditional: bool = False,
     **kwargs: Any,
-) -> TemplateResponse:
-    """Render template by name and context."""
+) -> Response:
+    """Render template by name and context.
+
+    :param streaming: send page by chunks while it's rendered (for large pages)
+    :param conditional: set ETag of page built from ksqlDB response, and reply
+        with "304 Not Modified" without rendering if client already has this page
+    """
+    if request.method == "GET" and is_refresh_requested(request):
+        # Data is already fetched bypassing cache (and cached), so page is shown
+        # from cache by URL without "refresh", which isn't kept for later reloads
+        url = request.url.remove_query_params(REFRESH_QUERY_PARAM)
+        return RedirectResponse(str(url), status_code=303)
+
+    headers = None
+    # Details are added even if page is not rendered, so link on page cached by browser is valid
+    details_id = RESPONSE_DETAILS.add(response) if response is not None else None
+    if conditional and response is not None:
+        # Age of data on page cached by browser is updated on client side
+        etag = get_etag(request, response, get_templates_version())
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        headers = get_etag_headers(etag)
+
     templates = get_templates()
     context = {"request": request, **kwargs}
 
@@ -60,6 +230,7 @@ def render_template(
     if response is not None:
         context[CONTEXT_RESPONSE_KEY] = ContextResponse(response)
         context[CONTEXT_REQUEST_KEY] = ContextRequest(response.request)
+        context[CONTEXT_DETAILS_KEY] = details_id
 
     if base_context := get_base_context(request):
         context.update(base_context)
@@ -67,7 +238,15 @@ def render_template(
         template_name = ERROR_NO_SERVER_TEMPLATE
         context["code"] = get_server_code(request, raise_exc=False)
 
-    return templates.TemplateResponse(template_name, context=context)
+    if streaming:
+        context[STREAM_CONTEXT_KEY] = True
+        return StreamingTemplateResponse(
+            templates.get_template(template_name),
+            context,
+            headers=headers,
+        )
+
+    return templates.TemplateResponse(template_name, context=context, headers=headers)
 
 
 def get_base_context(request: Request) -> dict:
@@ -1,4 +1,5 @@
 import json
+import time
 from contextlib import suppress
 from typing import Any
 
@@ -6,8 +7,12 @@ import httpx
 
 CONTEXT_RESPONSE_KEY = "x_response"
 CONTEXT_REQUEST_KEY = "x_request"
+CONTEXT_DETAILS_KEY = "x_details_id"
 VERSION_UNDEFINED = "undefined"
 
+# Extension of httpx.Response with timestamp when response was received
+FETCHED_AT_EXTENSION = "ksqldb_ui.fetched_at"
+
 
 def get_version() -> str | None:
     """Get ksqlDB UI version."""
@@ -22,6 +27,19 @@ def make_list(value: Any) -> list:
     return [value] if not isinstance(value, list) else value
 
 
+def split_names(value: str, sep: str = ",") -> list[str]:
+    """Split string with names by separator, skipping empty ones."""
+    return [name.strip() for name in value.split(sep) if name.strip()]
+
+
+def get_response_age(response: httpx.Response) -> float | None:
+    """Get seconds passed since response was received from server."""
+    fetched_at = response.extensions.get(FETCHED_AT_EXTENSION)
+    if fetched_at is None:
+        return None
+    return time.time() - float(fetched_at)
+
+
 class ContextResponse:
     def __init__(self, httpx_response: httpx.Response):
         self.data = []
@@ -33,6 +51,9 @@ class ContextResponse:
             self.text = httpx_response.text
 
         self.code = httpx_response.status_code
+        self.fetched_at = httpx_response.extensions.get(FETCHED_AT_EXTENSION)
+        self.age = get_response_age(httpx_response)
+        self.truncated = getattr(httpx_response, "truncated", False)
 
 
 class ContextRequest:
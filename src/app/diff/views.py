@@ -0,0 +1,57 @@
+from fastapi import (
+    APIRouter,
+    Request,
+)
+from fastapi.responses import Response
+
+from app.core.ksqldb import (
+    KsqlException,
+    get_ksql_client,
+)
+from app.core.ksqldb.diff import (
+    DIFF_CONCURRENCY,
+    Catalog,
+    build_catalog,
+    diff_catalogs,
+)
+from app.core.settings import is_refresh_requested
+from app.core.templates import render_template
+
+router = APIRouter()
+
+
+@router.get("/diff")
+async def diff_view(request: Request) -> Response:
+    """View to compare streams and queries across all servers."""
+    servers = request.app.settings.sorted_servers
+    cache = not is_refresh_requested(request)
+
+    ksql = get_ksql_client(request)
+    requests = []
+    for server in servers:
+        client = get_ksql_client(request, server.code)
+        requests += [
+            client.execute_statement("LIST STREAMS EXTENDED", cache=cache),
+            client.execute_statement("SHOW QUERIES", cache=cache),
+        ]
+    results = await ksql.execute_many(*requests, concurrency=DIFF_CONCURRENCY)
+
+    # Servers that failed to respond are not compared
+    catalogs: dict[str, Catalog] = {}
+    errors: dict[str, str] = {}
+    for server, streams, queries in zip(servers, results[::2], results[1::2]):
+        if error := streams.error or queries.error:
+            errors[server.code] = error.message if isinstance(error, KsqlException) else str(error)
+            continue
+        catalogs[server.code] = build_catalog(
+            streams.unwrap().parsed.sources,
+            queries.unwrap().parsed.queries,
+        )
+
+    return render_template(
+        "diff/index.html",
+        request,
+        servers=[server for server in servers if server.code in catalogs],
+        entries=diff_catalogs(catalogs),
+        errors=errors,
+    )
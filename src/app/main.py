@@ -12,7 +12,11 @@ from fastapi import (
 from starlette.responses import RedirectResponse
 
 from app.core.fastapi import init_fastapi_app
-from app.core.ksqldb import KsqlException
+from app.core.ksqldb import (
+    KsqlException,
+    KsqlServerUnavailable,
+)
+from app.core.ksqldb.retry import retry_budget
 from app.core.settings import (
     Server,
     get_server_code,
@@ -42,6 +46,13 @@ async def add_default_server(request: Request, call_next: Callable) -> Any:
     return await call_next(request)
 
 
+@app.middleware("http")
+async def limit_retries(request: Request, call_next: Callable) -> Any:
+    """Limit time spent on retries of ksqlDB requests per page render."""
+    with retry_budget(app.settings.http.retry_budget):
+        return await call_next(request)
+
+
 @app.exception_handler(400)
 @app.exception_handler(404)
 @app.exception_handler(500)
@@ -68,6 +79,10 @@ async def http_exception_handler(request: Request, exc: Exception) -> Response:
     if isinstance(exc, httpx.ReadError) and not str(exc):
         params["booting_up"] = True
 
+    if isinstance(exc, KsqlServerUnavailable):
+        params["server_unavailable"] = True
+        params["retry_after"] = exc.retry_after
+
     return render_template(ERROR_TEMPLATE, request=request, **params)
 
 
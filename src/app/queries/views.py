@@ -1,3 +1,4 @@
+from operator import attrgetter
 from typing import Optional
 
 from fastapi import (
@@ -6,27 +7,73 @@ from fastapi import (
 )
 from fastapi.responses import Response
 
+from app.core.etag import (
+    get_etag,
+    get_etag_headers,
+    is_not_modified,
+    not_modified,
+)
+from app.core.fastapi import api_success
 from app.core.i18n import _
-from app.core.ksqldb import get_ksql_client
+from app.core.ksqldb import (
+    bulk_delete,
+    get_ksql_client,
+)
+from app.core.ksqldb.jsonstream import KsqlResponse
+from app.core.listing import (
+    ListPage,
+    get_list_page,
+)
+from app.core.settings import is_refresh_requested
 from app.core.templates import render_template
+from app.core.utils import split_names
 
 router = APIRouter()
 
 
+# Sort keys of queries by column names
+SORT_KEYS = {
+    "id": attrgetter("id"),
+    "state": attrgetter("state", "queryType"),
+}
+
+
+async def get_queries_page(request: Request) -> tuple[KsqlResponse, ListPage]:
+    response = await get_ksql_client(request).execute_statement(
+        "SHOW QUERIES",
+        cache=not is_refresh_requested(request),
+    )
+    page = get_list_page(request, response, "queries", attrgetter("id"), SORT_KEYS, "id")
+    return response, page
+
+
 @router.get("/queries")
 async def list_view(request: Request, extra_context: Optional[dict] = None) -> Response:
     """View to list all available queries."""
-    ksql = get_ksql_client(request)
-    response = await ksql.execute_statement("SHOW QUERIES")
+    response, page = await get_queries_page(request)
     return render_template(
         "queries/list.html",
         request=request,
         response=response,
-        queries=sorted(response.json()[0]["queries"], key=lambda x: x["id"]),
+        streaming=True,
+        conditional=not extra_context,
+        page=page,
+        queries=page.items,
         **(extra_context or {}),
     )
 
 
+@router.get("/api/queries")
+async def api_list_queries(request: Request) -> Response:
+    """API endpoint to get page of queries."""
+    response, page = await get_queries_page(request)
+    etag = get_etag(request, response)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    return api_success(page.as_dict(), headers=get_etag_headers(etag))
+
+
 @router.post("/queries")
 async def delete_query(request: Request) -> Response:
     """Route to delete a query."""
@@ -35,16 +82,13 @@ async def delete_query(request: Request) -> Response:
     if not query_names:
         raise ValueError(_("Query name is not set"))
 
-    for query_name in query_names.split(","):
-        query_name = query_name.strip()
-        if not query_name:
-            continue
-        await get_ksql_client(request).execute_statement(f"TERMINATE {query_name}")
+    results = await bulk_delete(get_ksql_client(request), queries=split_names(query_names))
 
     return await list_view(
         request,
         extra_context={
-            "deleted_query": query_names,
+            "deleted_query": query_names if all(r.ok for r in results) else None,
+            "bulk_results": results,
         },
     )
 
@@ -58,6 +102,7 @@ async def detail_view(request: Request, query_name: str) -> Response:
             query_name=query_name,
         ),
         list_page_url=str(request.url_for("list_view")),
+        cache=not is_refresh_requested(request),
     )
 
     data = response.json()
@@ -1,7 +1,12 @@
+import codecs
 from datetime import datetime
-from typing import Any
+from typing import (
+    Any,
+    AsyncIterator,
+)
 
 from fastapi.requests import Request
+from starlette.datastructures import UploadFile
 
 from app.core.settings import get_server
 
@@ -27,6 +32,22 @@ class RequestHistory:
         return getattr(self, key)
 
 
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+async def read_upload_chunks(file: UploadFile) -> AsyncIterator[str]:
+    """Read uploaded file by chunks of text."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+
+async def iter_text(text: str) -> AsyncIterator[str]:
+    """Get text as single chunk."""
+    yield text
+
+
 def add_request_to_history(request: Request, query: Any) -> None:
     """Add request to history."""
     if request.app.settings.history.enabled:
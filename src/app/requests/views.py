@@ -1,19 +1,38 @@
+import json
+import time
+from contextlib import aclosing
+from typing import AsyncIterator
+
 from fastapi import (
     APIRouter,
     Request,
 )
-from starlette.datastructures import UploadFile
-from starlette.responses import Response
+from starlette.datastructures import (
+    FormData,
+    UploadFile,
+)
+from starlette.responses import (
+    Response,
+    StreamingResponse,
+)
 
+from app.core.details import RESPONSE_DETAILS
 from app.core.fastapi import (
     api_error,
     api_success,
 )
 from app.core.ksqldb import get_ksql_client
+from app.core.ksqldb.script import run_script
 from app.core.preprocess import preprocess_data
 from app.core.templates import render_template
 
-from .resources import add_request_to_history
+from .resources import (
+    add_request_to_history,
+    iter_text,
+    read_upload_chunks,
+)
+
+FORM_TRUE_VALUES = ("1", "true", "on")
 
 router = APIRouter()
 
@@ -35,7 +54,7 @@ async def perform_request(request: Request) -> Response:
         add_request_to_history(request, query)
 
         ksql = get_ksql_client(request)
-        ksql_response = await ksql.execute_statement_then_query(str(query))
+        ksql_response = await ksql.execute_statement_then_query(str(query), cache=False)
         context["query"] = query
 
         try:
@@ -49,6 +68,7 @@ async def perform_request(request: Request) -> Response:
         "requests/index.html",
         request=request,
         response=ksql_response,
+        streaming=True,
         **context,
     )
 
@@ -85,7 +105,7 @@ async def api_execute_request(request: Request) -> Response:
 
         # Execute statement
         ksql = get_ksql_client(request)
-        ksql_response = await ksql.execute_statement_then_query(str(query))
+        ksql_response = await ksql.execute_statement_then_query(str(query), cache=False)
 
         return api_success(
             success=ksql_response.is_success,
@@ -100,30 +120,92 @@ async def api_execute_request(request: Request) -> Response:
 
 @router.post("/api/process_file")
 async def api_process_file(request: Request) -> Response:
-    """API endpoint to process uploaded file as ksqlDB query."""
+    """API endpoint to execute uploaded file with ksqlDB statements.
+
+    File is read by chunks and executed as script (see `api_run_script`).
+    """
     form_data = await request.form()
     uploaded_file = form_data.get("file")
 
     if not uploaded_file or not isinstance(uploaded_file, UploadFile):
         return api_error("No file uploaded", status_code=400)
 
-    # Read file content
-    file_content = await uploaded_file.read()
-    query = file_content.decode("utf-8").strip()
+    return run_script_response(request, read_upload_chunks(uploaded_file), form_data)
 
-    if not query:
-        return api_error("File is empty", status_code=400)
 
-    try:
-        # Execute query
-        ksql = get_ksql_client(request)
-        ksql_response = await ksql.execute_statement_then_query(query)
-        return api_success(
-            success=ksql_response.is_success,
-            data={
-                "query": query,
-                "response": ksql_response.json(),
-            },
-        )
-    except Exception as e:
-        return api_error(f"Failed to process file: {repr(e)}", status_code=500)
+@router.post("/api/run_script")
+async def api_run_script(request: Request) -> Response:
+    """API endpoint to execute script statement by statement.
+
+    Script is either uploaded file or text. Result of each statement is streamed
+    as line of JSON as soon as statement completes, last line is a summary.
+    """
+    form_data = await request.form()
+    uploaded_file = form_data.get("file")
+    script = form_data.get("script")
+
+    if isinstance(uploaded_file, UploadFile):
+        chunks = read_upload_chunks(uploaded_file)
+    elif script and isinstance(script, str):
+        add_request_to_history(request, script)
+        chunks = iter_text(script)
+    else:
+        return api_error("Script is required", status_code=400)
+
+    return run_script_response(request, chunks, form_data)
+
+
+def run_script_response(
+    request: Request,
+    chunks: AsyncIterator[str],
+    form_data: FormData,
+) -> Response:
+    """Stream results of script as lines of JSON, last line is a summary."""
+    ksql = get_ksql_client(request)
+    results = run_script(
+        ksql,
+        chunks,
+        parallel=form_data.get("parallel") in FORM_TRUE_VALUES,
+        stop_on_error=form_data.get("continue_on_error") not in FORM_TRUE_VALUES,
+    )
+
+    async def stream() -> AsyncIterator[str]:
+        started_at = time.monotonic()
+        executed = failed = 0
+        async with aclosing(results):
+            async for result in results:
+                executed += 1
+                failed += not result.ok
+                yield json.dumps(result.as_dict()) + "\n"
+
+        summary = {
+            "executed": executed,
+            "failed": failed,
+            "elapsed": round(time.monotonic() - started_at, 3),
+        }
+        yield json.dumps({"summary": summary}) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.get("/details/{details_id}")
+async def show_response_details(request: Request, details_id: str) -> Response:
+    """View to show original request and full response of page (loaded on demand)."""
+    return render_template(
+        "includes/response_details.html",
+        request=request,
+        details=RESPONSE_DETAILS.get(details_id),
+    )
+
+
+@router.get("/api/details/{details_id}")
+async def api_download_response_details(details_id: str) -> Response:
+    """API endpoint to download original request and full response of page as JSON."""
+    if (details := RESPONSE_DETAILS.get(details_id)) is None:
+        return api_error("Response details are not found or expired", status_code=404)
+
+    return Response(
+        json.dumps(details.as_dict(), separators=(",", ":")),
+        media_type="application/json",
+        headers={"Content-Disposition": f'attachment; filename="ksqldb-{details_id}.json"'},
+    )
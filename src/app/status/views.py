@@ -4,7 +4,12 @@ from fastapi import (
 )
 from fastapi.responses import Response
 
-from app.core.ksqldb import get_ksql_client
+from app.core.ksqldb import (
+    KSQL_CLIENTS_CACHE,
+    get_ksql_client,
+)
+from app.core.render import FRAGMENT_CACHE
+from app.core.settings import is_refresh_requested
 from app.core.templates import render_template
 
 router = APIRouter()
@@ -14,20 +19,33 @@ router = APIRouter()
 async def server_status_view(request: Request) -> Response:
     """View to list all available queries."""
     ksql = get_ksql_client(request)
-    info = await ksql.get_info()
-    health = await ksql.get_health()
-    properties = await ksql.execute_statement("SHOW PROPERTIES;")
+    info, health, properties = await ksql.execute_many(
+        ksql.get_info(),
+        ksql.get_health(),
+        ksql.execute_statement("SHOW PROPERTIES;", cache=not is_refresh_requested(request)),
+    )
     return render_template(
         "status/index.html",
         request,
-        info=info.json(),
-        health=health.json(),
-        properties=properties.json()[0]["properties"],
-        response=properties,
+        info=info.response.json() if info.response else None,
+        health=health.response.json() if health.response else None,
+        properties=properties.response.parsed.properties if properties.response else [],
+        response=properties.response,
+        errors=[result.error for result in (info, health, properties) if result.error],
     )
 
 
 @router.get("/debug")
 async def debug_view(request: Request) -> Response:
     """Debug page."""
-    return render_template("status/debug.html", request)
+    client_stats: dict[str, list[dict]] = {}
+    for code, client in KSQL_CLIENTS_CACHE.items():
+        for section, stats in client.stats.items():
+            client_stats.setdefault(section, []).append({"server": code, **stats})
+
+    return render_template(
+        "status/debug.html",
+        request,
+        client_stats=client_stats,
+        fragment_cache_stats=FRAGMENT_CACHE.stats,
+    )
@@ -1,3 +1,4 @@
+from operator import attrgetter
 from typing import Optional
 
 from fastapi import (
@@ -6,29 +7,74 @@ from fastapi import (
 )
 from fastapi.responses import Response
 
+from app.core.etag import (
+    get_etag,
+    get_etag_headers,
+    is_not_modified,
+    not_modified,
+)
+from app.core.fastapi import api_success
 from app.core.i18n import _
 from app.core.ksqldb import (
-    KSQL_SYSTEM_STREAM,
+    bulk_delete,
     get_ksql_client,
 )
+from app.core.ksqldb.jsonstream import KsqlResponse
+from app.core.listing import (
+    ListPage,
+    get_list_page,
+)
+from app.core.settings import is_refresh_requested
 from app.core.templates import render_template
+from app.core.utils import split_names
 
 router = APIRouter()
 
 
+# Sort keys of streams by column names
+SORT_KEYS = {
+    "name": attrgetter("name"),
+    "topic": attrgetter("topic"),
+    "format": attrgetter("keyFormat", "valueFormat"),
+}
+
+
+async def get_streams_page(request: Request) -> tuple[KsqlResponse, ListPage]:
+    response = await get_ksql_client(request).execute_statement(
+        "SHOW STREAMS",
+        cache=not is_refresh_requested(request),
+    )
+    page = get_list_page(request, response, "streams", attrgetter("name"), SORT_KEYS, "name")
+    return response, page
+
+
 @router.get("/streams")
 async def list_view(request: Request, extra_context: Optional[dict] = None) -> Response:
     """View to list all available streams."""
-    response = await get_ksql_client(request).execute_statement("SHOW STREAMS")
+    response, page = await get_streams_page(request)
     return render_template(
         "streams/list.html",
         request=request,
         response=response,
-        streams=sorted(response.json()[0]["streams"], key=lambda x: x["name"]),
+        streaming=True,
+        conditional=not extra_context,
+        page=page,
+        streams=page.items,
         **(extra_context or {}),
     )
 
 
+@router.get("/api/streams")
+async def api_list_streams(request: Request) -> Response:
+    """API endpoint to get page of streams."""
+    response, page = await get_streams_page(request)
+    etag = get_etag(request, response)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    return api_success(page.as_dict(), headers=get_etag_headers(etag))
+
+
 @router.post("/streams")
 async def delete_stream(request: Request) -> Response:
     """Route to delete a stream."""
@@ -37,29 +83,14 @@ async def delete_stream(request: Request) -> Response:
     if not stream_names:
         raise ValueError(_("Stream name is not set"))
 
-    for stream_name in stream_names.split(","):
-        stream_name = stream_name.strip()
-        if not stream_name:
-            continue
-
-        if stream_name == KSQL_SYSTEM_STREAM:
-            raise ValueError(
-                _(
-                    "Cannot delete {name} system stream from ksqldb-ui. "
-                    "This is a protection measure.",
-                ).format(name=KSQL_SYSTEM_STREAM),
-            )
-
-        # for some cases we need to quote the stream name
-        if stream_name != stream_name.upper():
-            stream_name = f'"{stream_name}"'
-
-        await get_ksql_client(request).execute_statement(f"DROP STREAM {stream_name}")
+    # Queries that use streams are terminated first
+    results = await bulk_delete(get_ksql_client(request), streams=split_names(stream_names))
 
     return await list_view(
         request,
         extra_context={
-            "deleted_stream": stream_names,
+            "deleted_stream": stream_names if all(r.ok for r in results) else None,
+            "bulk_results": results,
         },
     )
 
@@ -73,11 +104,12 @@ async def detail_view(request: Request, stream_name: str) -> Response:
             stream_name=stream_name,
         ),
         list_page_url=str(request.url_for("list_view")),
+        cache=not is_refresh_requested(request),
     )
 
     return render_template(
         "streams/details.html",
         request=request,
         response=response,
-        stream=response.json()[0],
+        stream=response.parsed.source,
     )
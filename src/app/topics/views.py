@@ -1,3 +1,4 @@
+from operator import attrgetter
 from typing import Optional
 
 from fastapi import (
@@ -6,35 +7,82 @@ from fastapi import (
 )
 from fastapi.responses import Response
 
+from app.core.etag import (
+    get_etag,
+    get_etag_headers,
+    is_not_modified,
+    not_modified,
+)
+from app.core.fastapi import api_success
 from app.core.ksqldb import get_ksql_client
+from app.core.ksqldb.jsonstream import KsqlResponse
+from app.core.listing import (
+    ListPage,
+    SortKey,
+    get_list_page,
+)
+from app.core.settings import is_refresh_requested
 from app.core.templates import render_template
 
 router = APIRouter()
 
 
+# Sort keys of topics by column names
+SORT_KEYS: dict[str, SortKey] = {
+    "name": lambda t: t.name.lower(),
+    "partitions": lambda t: len(t.replicaInfo),
+    "consumers": attrgetter("consumerCount"),
+    "groups": attrgetter("consumerGroupCount"),
+}
+
+
+async def get_topics_page(request: Request) -> tuple[KsqlResponse, ListPage]:
+    response = await get_ksql_client(request).execute_statement(
+        "SHOW TOPICS EXTENDED",
+        cache=not is_refresh_requested(request),
+    )
+    page = get_list_page(request, response, "topics", attrgetter("name"), SORT_KEYS, "name")
+    return response, page
+
+
 @router.get("/topics")
 async def list_view(request: Request, extra_context: Optional[dict] = None) -> Response:
-    """View to list all available queries."""
-    response = await get_ksql_client(request).execute_statement("SHOW TOPICS EXTENDED")
+    """View to list all available topics."""
+    response, page = await get_topics_page(request)
     return render_template(
         "topics/list.html",
         request=request,
         response=response,
-        topics=sorted(response.json()[0]["topics"], key=lambda x: x["name"].lower()),
+        streaming=True,
+        conditional=not extra_context,
+        page=page,
+        topics=page.items,
         **(extra_context or {}),
     )
 
 
+@router.get("/api/topics")
+async def api_list_topics(request: Request) -> Response:
+    """API endpoint to get page of topics."""
+    response, page = await get_topics_page(request)
+    etag = get_etag(request, response)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    return api_success(page.as_dict(), headers=get_etag_headers(etag))
+
+
 @router.get("/topics/{topic_name}")
 async def detail_view(request: Request, topic_name: str) -> Response:
     """View to show topic details."""
-    response = await get_ksql_client(request).execute_statement("LIST STREAMS")
+    response = await get_ksql_client(request).execute_statement(
+        "LIST STREAMS",
+        cache=not is_refresh_requested(request),
+    )
 
-    data = response.json()
-    query = data[0]
     streams = sorted(
-        [s for s in query["streams"] if s["topic"] == topic_name],
-        key=lambda x: x["name"].lower(),
+        [s for s in response.parsed.streams if s.topic == topic_name],
+        key=lambda x: x.name.lower(),
     )
 
     return render_template(
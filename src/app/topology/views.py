@@ -5,6 +5,7 @@ from fastapi import (
 from fastapi.responses import Response
 
 from app.core.ksqldb import get_ksql_client
+from app.core.settings import is_refresh_requested
 from app.core.templates import render_template
 
 router = APIRouter()
@@ -14,11 +15,15 @@ router = APIRouter()
 async def index_view(request: Request) -> Response:
     """View to list all available queries."""
     ksql = get_ksql_client(request)
-    response = await ksql.execute_statement("LIST STREAMS EXTENDED")
+    response = await ksql.execute_statement(
+        "LIST STREAMS EXTENDED",
+        cache=not is_refresh_requested(request),
+    )
 
     return render_template(
         "topology/index.html",
-        streams=response.json()[0]["sourceDescriptions"],
+        streams=response.parsed.sources,
         response=response,
         request=request,
+        conditional=True,
     )
@@ -0,0 +1,55 @@
+import argparse
+import sys
+from pathlib import Path
+
+from . import suites  # noqa: F401 (registers benchmarks)
+from .runner import (
+    BASELINE_PATH,
+    compare,
+    load_report,
+    run_benchmarks,
+    save_report,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmarks of rendering and preprocessing hot paths.",
+    )
+    parser.add_argument("names", nargs="*", help="substrings of benchmark names to run")
+    parser.add_argument("--rounds", type=int, default=7, help="measured calls of each benchmark")
+    parser.add_argument("--scale", type=float, default=1, help="multiplier of input sizes")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="report file")
+    parser.add_argument("--save", action="store_true", help="save report as baseline")
+    parser.add_argument("--compare", action="store_true", help="fail on regressions")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="allowed slowdown of median compared to baseline (0.25 is 25%%)",
+    )
+    args = parser.parse_args()
+
+    def print_result(name: str, result: dict) -> None:
+        print(f"{name:<32} median {result['median'] * 1000:10.2f} ms")  # noqa: T201
+
+    report = run_benchmarks(args.names, args.scale, args.rounds, on_result=print_result)
+    if args.save:
+        save_report(args.baseline, report)
+
+    if args.compare:
+        baseline = load_report(args.baseline)
+        if baseline.get("scale") != report["scale"]:
+            print(f"Baseline has different scale: {baseline.get('scale')}")  # noqa: T201
+            return 1
+        regressions = compare(baseline, report, args.tolerance)
+        for name, ratio in regressions.items():
+            print(f"REGRESSION {name}: {ratio:.2f}x slower than baseline")  # noqa: T201
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+from typing import Any
+
+# Realistic sizes of inputs, multiplied by scale of benchmark run
+STREAMS = 10_000
+SELECT_ROWS = 5_000
+SCHEMA_DEPTH = 6
+SCHEMA_WIDTH = 2
+
+
+def scaled(size: int, scale: float) -> int:
+    return max(1, int(size * scale))
+
+
+def make_stream(i: int) -> dict:
+    return {
+        "type": "STREAM",
+        "name": f"STREAM_{i}",
+        "topic": f"events.stream-{i}",
+        "keyFormat": "KAFKA",
+        "valueFormat": "JSON" if i % 2 else "AVRO",
+        "isWindowed": i % 10 == 0,
+    }
+
+
+def make_streams(scale: float = 1) -> list[dict]:
+    return [make_stream(i) for i in range(scaled(STREAMS, scale))]
+
+
+def make_schema_string(depth: int = SCHEMA_DEPTH, width: int = SCHEMA_WIDTH) -> str:
+    """Make schema of SELECT header with nested STRUCT and ARRAY<STRUCT> fields."""
+    fields = ["`ID` BIGINT", "`NAME` STRING", "`TAGS` ARRAY<STRING>"]
+    if depth > 0:
+        nested = make_schema_string(depth - 1, width)
+        fields += [f"`STRUCT_{i}` STRUCT<{nested}>" for i in range(width // 2)]
+        fields += [f"`ITEMS_{i}` ARRAY<STRUCT<{nested}>>" for i in range(width // 2)]
+    return ", ".join(fields)
+
+
+def make_schema_fields(depth: int = SCHEMA_DEPTH, width: int = SCHEMA_WIDTH) -> list[dict]:
+    """Make fields of DESCRIBE response with nested STRUCT fields."""
+    fields: list[dict] = [
+        {"name": "ID", "type": "KEY", "schema": {"type": "BIGINT", "fields": None}},
+        {"name": "NAME", "schema": {"type": "STRING", "fields": None}},
+    ]
+    if depth > 0:
+        nested = make_schema_fields(depth - 1, width)
+        fields += [
+            {"name": f"STRUCT_{i}", "schema": {"type": "STRUCT", "fields": nested}}
+            for i in range(width)
+        ]
+    return fields
+
+
+def make_row(i: int) -> list[Any]:
+    return [
+        i,
+        f"name-{i}",
+        ["a", "b", "c"],
+        {"ID": i, "NAME": f"nested-{i}", "TAGS": [], "STRUCT_0": None},
+        [{"ID": i, "NAME": "item"}],
+    ]
+
+
+def make_select_response(scale: float = 1) -> list[dict]:
+    """Make body of SELECT query response."""
+    schema = "`ID` BIGINT, `NAME` STRING, `TAGS` ARRAY<STRING>, " + (
+        "`NESTED` STRUCT<`ID` BIGINT, `NAME` STRING, `TAGS` ARRAY<STRING>, "
+        "`STRUCT_0` STRUCT<`ID` BIGINT>>, `ITEMS` ARRAY<STRUCT<`ID` BIGINT, `NAME` STRING>>"
+    )
+    rows = [{"row": {"columns": make_row(i)}} for i in range(scaled(SELECT_ROWS, scale))]
+    return [
+        {"header": {"queryId": "transient_BENCH_1", "schema": schema}},
+        *rows,
+        {"finalMessage": "Limit Reached"},
+    ]
+
+
+def make_source_description(scale: float = 1) -> dict:
+    """Make DESCRIBE response entry with many queries."""
+    queries = [{"id": f"CSAS_STREAM_{i}", "sinks": [f"STREAM_{i}"]} for i in range(100)]
+    return {
+        "@type": "sourceDescription",
+        "statementText": "DESCRIBE STREAM_0 EXTENDED;",
+        "sourceDescription": {
+            **make_stream(0),
+            "fields": make_schema_fields(depth=2),
+            "readQueries": queries,
+            "writeQueries": queries[:10],
+            "statement": "CREATE STREAM STREAM_0 (ID BIGINT KEY) WITH (KAFKA_TOPIC='events');",
+            "statistics": "messages-per-sec: 100 total-messages: 100000",
+        },
+        "warnings": [],
+    }
+
+
+def make_statement(i: int) -> str:
+    return f"""
+        -- Enrich events of stream {i}
+        CREATE OR REPLACE STREAM `enriched_{i}` WITH (kafka_topic='enriched;{i}') AS
+        SELECT e.id, e.name, /* inline comment */ u.email
+        FROM events_{i} e
+        LEFT JOIN users u WITHIN 1 HOUR ON e.user_id = u.id
+        WHERE e.name != 'it''s -- not a comment'
+        EMIT CHANGES
+    """
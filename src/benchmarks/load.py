@@ -0,0 +1,276 @@
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+)
+
+import httpx
+
+from .runner import (
+    get_commit,
+    save_report,
+)
+
+FAKE_SERVER_CODE = "fake"
+FAKE_SERVER_URL = "http://fake.ksqldb"
+
+# Default mix of pages (route name -> weight), requests are chosen randomly by weights
+DEFAULT_MIX = "streams=4,queries=2,topics=2,topology=1,status=1,requests=1"
+REQUESTS_QUERY = "SHOW STREAMS;"
+
+# Route name -> (method, path), "requests" is a form submit of request editor
+ROUTES = {
+    "streams": ("GET", "/streams"),
+    "queries": ("GET", "/queries"),
+    "topics": ("GET", "/topics"),
+    "topology": ("GET", "/topology"),
+    "status": ("GET", "/status"),
+    "requests": ("POST", "/requests"),
+}
+
+Send = Callable[[str], Awaitable[httpx.Response]]
+
+
+class RouteStats:
+    """Latencies and errors of single route."""
+
+    __slots__ = ("latencies", "errors", "peak_rss")
+
+    def __init__(self) -> None:
+        """Initialize class instance."""
+        self.latencies: list[float] = []
+        self.errors = 0
+        self.peak_rss: int | None = None
+
+    def add(self, latency: float, ok: bool) -> None:
+        self.latencies.append(latency)
+        self.errors += not ok
+        if (rss := get_rss()) is not None:
+            self.peak_rss = max(self.peak_rss or 0, rss)
+
+    def as_dict(self, duration: float) -> dict[str, Any]:
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+        return {
+            "requests": count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4) if count else 0,
+            "rps": round(count / duration, 2) if duration else 0,
+            "p50": get_percentile(latencies, 50),
+            "p95": get_percentile(latencies, 95),
+            "p99": get_percentile(latencies, 99),
+            "max": latencies[-1] if latencies else None,
+            "peak_rss_mb": round(self.peak_rss / 1024 / 1024, 1) if self.peak_rss else None,
+        }
+
+
+def get_percentile(sorted_values: list[float], percent: float) -> float | None:
+    """Get percentile of sorted values (nearest-rank method)."""
+    if not sorted_values:
+        return None
+    index = max(0, int(len(sorted_values) * percent / 100 + 0.5) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def get_rss() -> int | None:
+    """Get resident memory of current process in bytes (Linux only)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    """Parse mix like "streams=4,status=1" into route weights."""
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        if name.strip() not in ROUTES:
+            raise ValueError(f'Unknown route "{name}", available: {", ".join(ROUTES)}')
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+async def run_load(
+    send: Send,
+    mix: dict[str, float],
+    duration: float,
+    concurrency: int = 10,
+    rps: float | None = None,
+) -> dict[str, RouteStats]:
+    """Send requests for given duration, collecting stats per route.
+
+    :param rps: send requests at fixed rate (open loop), otherwise keep `concurrency`
+        requests in flight (closed loop)
+    """
+    names, weights = list(mix), list(mix.values())
+    stats = {name: RouteStats() for name in names}
+    deadline = time.monotonic() + duration
+
+    async def request(name: str) -> None:
+        started_at = time.monotonic()
+        try:
+            response = await send(name)
+            ok = response.status_code < 400
+        except Exception:
+            ok = False
+        stats[name].add(time.monotonic() - started_at, ok)
+
+    async def worker() -> None:
+        while time.monotonic() < deadline:
+            await request(random.choices(names, weights)[0])
+
+    if rps is None:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return stats
+
+    tasks = set()
+    interval = 1 / rps
+    next_at = time.monotonic()
+    while next_at < deadline:
+        task = asyncio.create_task(request(random.choices(names, weights)[0]))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        next_at += interval
+        await asyncio.sleep(max(0, next_at - time.monotonic()))
+    await asyncio.gather(*tasks)
+    return stats
+
+
+def make_sender(client: httpx.AsyncClient, server_code: str) -> Send:
+    async def send(name: str) -> httpx.Response:
+        method, path = ROUTES[name]
+        params = {"s": server_code}
+        if method == "POST":
+            return await client.post(path, params=params, data={"query": REQUESTS_QUERY})
+        return await client.request(method, path, params=params)
+
+    return send
+
+
+def init_in_process_app() -> httpx.AsyncBaseTransport:
+    """Get transport to app from `app.main` talking to in-process fake ksqlDB server.
+
+    Fake server is configured by FAKE_KSQLDB_* env vars. App settings are read
+    from APP_CONFIG if it's set, otherwise single fake server is configured.
+    """
+    from app.core.ksqldb import KSQL_CLIENTS_CACHE
+    from app.core.ksqldb.client import KsqlClient
+    from app.core.ksqldb.fake import create_fake_app
+    from app.core.settings import (
+        Settings,
+        get_settings,
+        init_settings,
+    )
+
+    if not os.getenv("APP_CONFIG"):
+        init_settings(
+            Settings.from_config({"servers": {FAKE_SERVER_CODE: {"url": FAKE_SERVER_URL}}}),
+        )
+    settings = get_settings()
+
+    # All servers of app are served by the same fake server
+    fake_transport = httpx.ASGITransport(create_fake_app())
+    for server in settings.servers.values():
+        KSQL_CLIENTS_CACHE[server.code] = KsqlClient(
+            url=server.urls,
+            timeout=settings.http.timeout,
+            http=settings.http,
+            cache=settings.cache,
+            balancing=server.load_balancing,
+            transport=fake_transport,
+        )
+
+    from app.main import app
+
+    return httpx.ASGITransport(app)
+
+
+async def main_async(args: argparse.Namespace) -> dict[str, Any]:
+    if args.url:
+        transport = None
+        base_url = args.url
+        server_code = args.server
+    else:
+        transport = init_in_process_app()
+        base_url = "http://ksqldb-ui.test"
+        server_code = args.server or FAKE_SERVER_CODE
+
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        transport=transport,
+        timeout=args.timeout,
+        limits=httpx.Limits(max_connections=args.concurrency),
+    ) as client:
+        started_at = time.monotonic()
+        stats = await run_load(
+            make_sender(client, server_code),
+            parse_mix(args.mix),
+            duration=args.duration,
+            concurrency=args.concurrency,
+            rps=args.rps,
+        )
+        duration = time.monotonic() - started_at
+
+    return {
+        "commit": get_commit(),
+        "target": args.url or "in-process",
+        "duration": round(duration, 2),
+        "concurrency": None if args.rps else args.concurrency,
+        "rps": args.rps,
+        "routes": {name: route.as_dict(duration) for name, route in stats.items()},
+    }
+
+
+def print_report(report: dict[str, Any]) -> None:
+    def ms(value: float | None) -> str:
+        return f"{value * 1000:8.1f}" if value is not None else f"{'-':>8}"
+
+    print(  # noqa: T201
+        f"{'route':<10} {'requests':>8} {'rps':>8} {'errors':>7} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'rss MB':>8}",
+    )
+    for name, route in report["routes"].items():
+        print(  # noqa: T201
+            f"{name:<10} {route['requests']:>8} {route['rps']:>8} "
+            f"{route['error_rate']:>7.1%} {ms(route['p50'])} {ms(route['p95'])} "
+            f"{ms(route['p99'])} {route['peak_rss_mb'] or '-':>8}",
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.load",
+        description="Load test of ksqlDB UI pages against fake ksqlDB server.",
+    )
+    parser.add_argument("--url", help="running app URL (by default app is run in process)")
+    parser.add_argument("--server", default="", help="server code (s= query param)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f'weights of routes: "{DEFAULT_MIX}"')
+    parser.add_argument("--duration", type=float, default=10, help="seconds to send requests")
+    parser.add_argument("--concurrency", type=int, default=10, help="requests in flight")
+    parser.add_argument("--rps", type=float, help="send requests at fixed rate instead")
+    parser.add_argument("--timeout", type=float, default=30, help="timeout of single request")
+    parser.add_argument("--output", type=Path, help="save report as JSON")
+    args = parser.parse_args()
+
+    if args.url and not args.server:
+        parser.error("--server is required with --url")
+
+    report = asyncio.run(main_async(args))
+    print_report(report)
+    if args.output:
+        save_report(args.output, report)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
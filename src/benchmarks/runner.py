@@ -0,0 +1,111 @@
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import time
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+)
+
+# Benchmark gets scale of input sizes, prepares inputs and returns function to measure
+Benchmark = Callable[[float], Callable[[], Any]]
+
+BENCHMARKS: dict[str, Benchmark] = {}
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+
+def benchmark(fn: Benchmark) -> Benchmark:
+    """Register benchmark."""
+    BENCHMARKS[fn.__name__] = fn
+    return fn
+
+
+def measure(fn: Callable[[], Any], rounds: int) -> dict[str, Any]:
+    """Measure function calls, first call is a warmup and is not counted.
+
+    Garbage collection is disabled while measuring (as in `timeit`) to reduce noise.
+    """
+    fn()
+    timings = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            started_at = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - started_at)
+    finally:
+        gc.enable()
+
+    return {
+        "median": statistics.median(timings),
+        "min": min(timings),
+        "max": max(timings),
+        "rounds": rounds,
+    }
+
+
+def run_benchmarks(
+    names: list[str] | None = None,
+    scale: float = 1,
+    rounds: int = 7,
+    on_result: Callable[[str, dict], None] | None = None,
+) -> dict[str, Any]:
+    """Run benchmarks, returning report that can be saved as baseline.
+
+    :param names: substrings of benchmark names to run (all by default)
+    """
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if names and not any(n in name for n in names):
+            continue
+        results[name] = measure(setup(scale), rounds)
+        if on_result:
+            on_result(name, results[name])
+
+    return {
+        "commit": get_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "scale": scale,
+        "results": results,
+    }
+
+
+def compare(baseline: dict, report: dict, tolerance: float) -> dict[str, float]:
+    """Get benchmarks that became slower than baseline by more than tolerance.
+
+    Medians are compared, result is ratio of current median to baseline one.
+    """
+    regressions = {}
+    for name, result in report["results"].items():
+        if (base := baseline["results"].get(name)) is None or not base["median"]:
+            continue
+        ratio = result["median"] / base["median"]
+        if ratio > 1 + tolerance:
+            regressions[name] = ratio
+    return regressions
+
+
+def load_report(path: Path) -> dict:
+    return dict(json.loads(path.read_text()))
+
+
+def save_report(path: Path, report: dict) -> None:
+    path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+
+
+def get_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
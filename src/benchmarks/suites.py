@@ -0,0 +1,138 @@
+import json
+import tempfile
+from typing import (
+    Any,
+    Callable,
+)
+
+from app.core.ksqldb import KsqlQuery
+from app.core.ksqldb.models import (
+    ParsedResponse,
+    Source,
+)
+from app.core.preprocess.processors import preprocess_select
+from app.core.preprocess.resources import parse_schema_list
+from app.core.render import (
+    render_json,
+    render_section,
+    render_stream_fields,
+    render_table,
+    render_value,
+)
+from app.core.templates import (
+    compile_templates,
+    create_environment,
+)
+
+from .data import (
+    SCHEMA_DEPTH,
+    make_schema_fields,
+    make_schema_string,
+    make_select_response,
+    make_source_description,
+    make_statement,
+    make_streams,
+    scaled,
+)
+from .runner import benchmark
+
+
+@benchmark
+def render_table_streams(scale: float) -> Callable[[], Any]:
+    streams = Source.from_list(make_streams(scale))
+    return lambda: render_table(
+        streams,
+        cols=["name", "topic", "keyFormat", "valueFormat", "isWindowed"],
+        options={"name": "code", "valueFormat": "badge"},
+    )
+
+
+@benchmark
+def render_value_mixed(scale: float) -> Callable[[], Any]:
+    values = [1, "123", "true", None, "http://example.com", ["a", "b"], "text", 1.5] * scaled(
+        1_000,
+        scale,
+    )
+
+    def run() -> None:
+        for value in values:
+            render_value(value)
+
+    return run
+
+
+@benchmark
+def render_section_describe(scale: float) -> Callable[[], Any]:
+    response = make_source_description(scale)
+    return lambda: render_section(response, add_anchor=True, add_copy_button=True)
+
+
+@benchmark
+def render_json_streams(scale: float) -> Callable[[], Any]:
+    streams = make_streams(scale)
+    return lambda: render_json(streams)
+
+
+@benchmark
+def render_stream_fields_nested(scale: float) -> Callable[[], Any]:
+    fields = make_schema_fields(depth=scaled(SCHEMA_DEPTH, scale))
+    return lambda: render_stream_fields(fields)
+
+
+@benchmark
+def parse_schema_list_nested(scale: float) -> Callable[[], Any]:
+    schema = make_schema_string(depth=scaled(SCHEMA_DEPTH, scale))
+    return lambda: parse_schema_list(schema)
+
+
+@benchmark
+def preprocess_select_rows(scale: float) -> Callable[[], Any]:
+    data = make_select_response(scale)
+    return lambda: preprocess_select(ParsedResponse(data))
+
+
+@benchmark
+def select_result_render(scale: float) -> Callable[[], Any]:
+    result = preprocess_select(ParsedResponse(make_select_response(scale)))
+    return result.render
+
+
+@benchmark
+def ksql_query_as_string(scale: float) -> Callable[[], Any]:
+    statements = [make_statement(i) for i in range(scaled(1_000, scale))]
+
+    def run() -> None:
+        for statement in statements:
+            KsqlQuery(statement).as_string
+
+    return run
+
+
+@benchmark
+def parse_select_response(scale: float) -> Callable[[], Any]:
+    body = json.dumps(make_select_response(scale))
+    return lambda: ParsedResponse(json.loads(body))
+
+
+def load_all_templates(compiled: tempfile.TemporaryDirectory | None) -> Callable[[], Any]:
+    names = create_environment().list_templates()
+
+    def run() -> None:
+        # Templates are loaded by new environment, as in new worker process
+        env = create_environment(compiled.name if compiled else None)
+        for name in names:
+            env.get_template(name)
+
+    return run
+
+
+@benchmark
+def templates_load_source(scale: float) -> Callable[[], Any]:
+    return load_all_templates(None)
+
+
+@benchmark
+def templates_load_compiled(scale: float) -> Callable[[], Any]:
+    compiled = tempfile.TemporaryDirectory(prefix="ksqldb-ui-templates-")
+    compile_templates(compiled.name)
+    return load_all_templates(compiled)
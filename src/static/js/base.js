@@ -87,3 +87,34 @@ function togglePageHelp() {
     helpSection.style.display = helpSection.style.display === "block" ? "none" : "block";
   }
 }
+
+// Load original request and full response when details are expanded
+document.addEventListener("show.bs.collapse", function (event) {
+  const details = event.target;
+  if (!details.classList.contains("response-details") || details.dataset.loaded) {
+    return;
+  }
+
+  details.dataset.loaded = "true";
+  fetch(details.dataset.url)
+    .then(response => response.text())
+    .then(html => { details.innerHTML = html; })
+    .catch(error => {
+      delete details.dataset.loaded;
+      details.innerHTML = `<div class="alert alert-danger">${error}</div>`;
+    });
+});
+
+// Update age of data, as page may be shown from browser cache (after "304 Not Modified")
+document.addEventListener("DOMContentLoaded", function () {
+  document.querySelectorAll(".cache-info[data-fetched-at]").forEach(info => {
+    const age = Math.floor(Date.now() / 1000 - parseFloat(info.dataset.fetchedAt));
+    const ageElement = info.querySelector(".cache-age");
+    if (age > parseInt(ageElement.textContent)) {
+      ageElement.textContent = age;
+    }
+    if (parseInt(ageElement.textContent) >= 1) {
+      info.hidden = false;
+    }
+  });
+});
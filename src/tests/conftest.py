@@ -32,6 +32,9 @@ def fastapi_request(app):
     return Request(
         scope={
             "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": [],
             "query_string": b"s=testing",
             "app": app,
             "test": True,
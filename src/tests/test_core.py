@@ -37,6 +37,95 @@ def test_cache_control_header(tmp_path):
     assert response.headers["Cache-Control"] == "public, max-age=123"
 
 
+def test_precompressed_static_files(tmp_path):
+    """Should serve precompressed sibling of static file if client accepts its encoding."""
+    import gzip
+    import os
+
+    from app.core.compression import precompress_static
+
+    (tmp_path / "base.css").write_text("body { color: red; }" * 100)
+    (tmp_path / "logo.png").write_bytes(b"png")
+    assert tmp_path / "base.css.gz" in precompress_static(tmp_path)
+    assert not (tmp_path / "logo.png.gz").exists()
+
+    app = CacheControlledStaticFiles(directory=tmp_path)
+
+    def get(path, accept_encoding):
+        headers = [(b"accept-encoding", accept_encoding.encode())]
+        scope = {"type": "http", "path": f"/{path}", "method": "GET", "headers": headers}
+        return asyncio.run(app.get_response(path, scope))
+
+    response = get("base.css", "gzip, deflate")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"].startswith("text/css")
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert gzip.decompress(open(response.path, "rb").read()) == (tmp_path / "base.css").read_bytes()
+
+    assert "content-encoding" not in get("base.css", "gzip;q=0, identity").headers
+    assert "content-encoding" not in get("logo.png", "gzip").headers
+
+    # Outdated compressed file is ignored
+    os.utime(tmp_path / "base.css.gz", (0, 0))
+    assert "content-encoding" not in get("base.css", "gzip").headers
+
+
+def test_compression_middleware():
+    """Should compress large and streamed responses with encoding accepted by client."""
+    import zlib
+
+    import httpx
+    from starlette.applications import Starlette
+    from starlette.responses import (
+        PlainTextResponse,
+        Response,
+        StreamingResponse,
+    )
+    from starlette.routing import Route
+
+    from app.core.compression import CompressionMiddleware
+
+    async def chunks():
+        for i in range(3):
+            yield f"chunk {i} " * 200
+
+    app = Starlette(
+        routes=[
+            Route("/large", lambda r: PlainTextResponse("text " * 1000)),
+            Route("/small", lambda r: PlainTextResponse("text")),
+            Route("/image", lambda r: Response(b"0" * 5000, media_type="image/png")),
+            Route("/stream", lambda r: StreamingResponse(chunks(), media_type="text/html")),
+            Route("/image-stream", lambda r: StreamingResponse(chunks(), media_type="image/png")),
+        ],
+    )
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    async def get(path, accept_encoding="gzip"):
+        transport = httpx.ASGITransport(app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            headers = {"accept-encoding": accept_encoding}
+            async with client.stream("GET", path, headers=headers) as response:
+                return response, b"".join([chunk async for chunk in response.aiter_raw()])
+
+    response, body = asyncio.run(get("/large"))
+    assert response.headers["content-encoding"] == "gzip"
+    assert zlib.decompress(body, 16 + zlib.MAX_WBITS) == b"text " * 1000
+    assert "vary" in response.headers
+
+    response, body = asyncio.run(get("/stream"))
+    assert response.headers["content-encoding"] == "gzip"
+    assert zlib.decompress(body, 16 + zlib.MAX_WBITS).decode().count("chunk 2") == 200
+
+    for path, accept_encoding in [("/small", "gzip"), ("/image", "gzip"), ("/large", "identity")]:
+        response, body = asyncio.run(get(path, accept_encoding))
+        assert "content-encoding" not in response.headers
+
+    response, body = asyncio.run(get("/image-stream"))
+    assert "content-encoding" not in response.headers
+    assert "vary" not in response.headers
+    assert body.decode().count("chunk 2") == 200
+
+
 def test_register_decorator():
     """Should register a function in RENDER_HELPERS."""
 
@@ -79,6 +168,32 @@ def test_settings_from_config():
     assert settings.history.enabled
 
 
+def test_settings_cache_ttl_merged_with_defaults():
+    settings = Settings.from_config(
+        {
+            "servers": {"a": {"url": "expected"}},
+            "cache": {"ttl": {"SHOW_STREAMS": 1, "describe": 0}},
+        },
+    )
+
+    assert settings.cache.ttl["show_streams"] == 1
+    assert settings.cache.ttl["describe"] == 0
+    assert settings.cache.ttl["show_tables"] == 10
+
+
+def test_settings_http2_requires_h2(monkeypatch):
+    import pydantic
+    import pytest
+
+    config = {"servers": {"a": {"url": "expected"}}, "http": {"http2": True}}
+    monkeypatch.setattr("app.core.settings.find_spec", lambda name: None)
+    with pytest.raises(pydantic.ValidationError, match='HTTP/2 requires "h2" package'):
+        Settings.from_config(config)
+
+    monkeypatch.setattr("app.core.settings.find_spec", lambda name: object())
+    assert Settings.from_config(config).http.http2
+
+
 def test_settings_default_server_if_default_exists():
     settings = Settings.from_config(
         {
@@ -158,3 +273,206 @@ def test_flatten_dict_with_sep():
     """Should use custom separator when provided."""
     d = {"a": {"b": 1}}
     assert flatten_dict(d, sep="_") == {"a_b": 1}
+
+
+def test_benchmarks_smoke():
+    """Should run all benchmarks on small inputs."""
+    from benchmarks import suites  # noqa: F401
+    from benchmarks.runner import (
+        BENCHMARKS,
+        compare,
+        run_benchmarks,
+    )
+
+    report = run_benchmarks(scale=0.01, rounds=1)
+    assert set(report["results"]) == set(BENCHMARKS)
+
+    baseline = {"results": {name: {"median": 1e-9} for name in BENCHMARKS}}
+    assert set(compare(baseline, report, tolerance=0.2)) == set(BENCHMARKS)
+    assert compare(report, report, tolerance=0.2) == {}
+
+
+def test_load_harness():
+    """Should collect latency percentiles and errors per route."""
+    import httpx
+
+    from benchmarks.load import (
+        get_percentile,
+        parse_mix,
+        run_load,
+    )
+
+    async def send(name):
+        await asyncio.sleep(0.001)
+        return httpx.Response(500 if name == "status" else 200)
+
+    mix = parse_mix("streams=3,status=1")
+    stats = asyncio.run(run_load(send, mix, duration=0.1, concurrency=4))
+    assert stats["streams"].latencies and stats["streams"].errors == 0
+    assert stats["status"].errors == len(stats["status"].latencies)
+    assert stats["streams"].as_dict(0.1)["p99"] is not None
+
+    stats = asyncio.run(run_load(send, mix, duration=0.1, rps=100))
+    assert 5 <= sum(len(s.latencies) for s in stats.values()) <= 11
+
+    assert get_percentile([1, 2, 3, 4], 50) == 2
+    assert get_percentile([1, 2, 3, 4], 99) == 4
+
+
+def test_in_process_app_uses_settings(monkeypatch):
+    """Should create clients of in-process app with configured timeout."""
+    from app.core.ksqldb import KSQL_CLIENTS_CACHE
+    from app.core.settings import get_settings
+    from benchmarks.load import (
+        FAKE_SERVER_CODE,
+        init_in_process_app,
+    )
+
+    monkeypatch.delenv("APP_CONFIG", raising=False)
+    init_in_process_app()
+    try:
+        assert KSQL_CLIENTS_CACHE[FAKE_SERVER_CODE].timeout == get_settings().http.timeout
+    finally:
+        KSQL_CLIENTS_CACHE.pop(FAKE_SERVER_CODE)
+
+
+def test_render_table_compiled_columns():
+    """Should render cells of each column with its options, nested values as tables."""
+    from app.core.render import (
+        Options,
+        render_table,
+    )
+
+    data = [
+        {"name": "a", "count": 1, "empty": None, "nested": [{"x": "true"}], "secret": 1},
+        {"name": "b", "count": "2", "empty": "", "nested": None, "secret": 2},
+    ]
+    html = render_table(
+        data,
+        options={"name": "badge, br", "empty": "empty_column", "secret": Options(ignored=True)},
+    )
+    assert '<td class=breaked><span class="badge text-bg-purple">a</span></td>' in html
+    assert "<td class=><code>1</code></td>" in html
+    assert "<td class=><code>2</code></td>" in html
+    assert '<span class="badge text-bg-success">true</span>' in html
+    assert '<span class="badge text-bg-secondary">none</span>' in html
+    assert "Empty" not in html and "Secret" not in html
+    assert Options.from_string("badge") is Options.from_string("badge")
+
+
+def test_list_page_filters_search_sort_and_pages():
+    """Should filter by bit masks, search and sort objects, then slice page."""
+    from types import SimpleNamespace
+
+    from fastapi import Request
+
+    from app.core.listing import (
+        ListIndex,
+        ListPage,
+        ListParams,
+    )
+
+    items = [SimpleNamespace(name=name) for name in ("b-orders", "A_ORDERS", "c_users", "d_orders")]
+    index = ListIndex(
+        items,
+        name=lambda x: x.name,
+        sort_keys={"name": lambda x: x.name.lower()},
+        filters=["orders", "Users"],
+    )
+    assert index.masks == [1, 1, 2, 1]
+
+    def names(query_string: str) -> tuple[list[str], ListPage]:
+        request = Request(scope={"type": "http", "query_string": query_string.encode()})
+        page = ListPage(request, index, ListParams.from_request(request, default_sort="name"))
+        return [x.name for x in page.items], page
+
+    assert names("")[0] == ["A_ORDERS", "b-orders", "c_users", "d_orders"]
+    assert names("sort=-name&filter=orders")[0] == ["d_orders", "b-orders", "A_ORDERS"]
+    assert names("filter=orders,users")[0] == []
+    assert names("filter=b_&search=ORD")[0] == ["b-orders"]
+
+    result, page = names("s=testing&filter=orders&size=2&page=2")
+    assert result == ["d_orders"]
+    assert (page.total, page.all_total, page.pages, page.offset) == (3, 4, 2, 2)
+    assert page.has_prev and not page.has_next
+    assert page.url(page=1) == "?s=testing&filter=orders&size=2&page=1"
+    assert page.filter_url("orders") == "?s=testing&size=2"
+    assert page.sort_url("name") == "?s=testing&filter=orders&size=2&sort=-name"
+    assert page.as_dict()["total"] == 3
+
+
+def test_fragment_cache(init_settings, fastapi_request):
+    """Should render the same data once, evicting least recently used fragments by size."""
+    from collections import deque
+
+    from app.core.ksqldb.models import Topic
+    from app.core.render import (
+        FragmentCache,
+        render_table,
+    )
+
+    cache = FragmentCache(size=1000)
+    calls = []
+
+    def render(data, **kwargs):
+        calls.append(data)
+        return f"<p>{data}</p>"
+
+    cached = cache.wrap(render)
+    assert cached({"a": 1}) == cached({"a": 1}) == "<p>{'a': 1}</p>"
+    assert cached({"a": 1}, request=fastapi_request) == cached({"a": 1}, request=fastapi_request)
+    assert cached({"a": 1}, lower=True) and cached(object()) and cached(object())
+    assert len(calls) == 5
+    assert cache.stats["hits"] == 2 and cache.stats["uncacheable"] == 2
+
+    cache.configure(size=100)
+    cached("x" * 20)  # too large fragment is not cached
+    for value in "abcdefghij":
+        cached(value * 3)  # 10 chars each
+    assert cache.stats["fragments"] == 10 and cache.stats["evictions"] == 0
+    cached("k" * 3)
+    assert cache.stats["fragments"] == 10 and cache.stats["evictions"] == 1
+    assert cache.total <= cache.size
+
+    # Collections of the same items, but of different types are different fragments
+    assert cache.get_key("f", ([1, 2],), {}) != cache.get_key("f", (deque([1, 2]),), {})
+
+    # Collections larger than oversized one are rendered without digest
+    cache.configure(size=1000)
+    oversized, misses = cache.stats["oversized"], cache.stats["misses"]
+    cached(["x"] * 50)
+    cached(["x"] * 60)
+    assert cache.stats["oversized"] == oversized + 2 and cache.stats["misses"] == misses + 1
+    cached(["x"] * 2)
+    assert cache.stats["fragments"] == 1
+
+    table = [{"name": "a", "type": "b"}]
+    cached_table = FragmentCache().wrap(render_table)
+    assert cached_table(table) == cached_table(table) == render_table(table)
+    models = [Topic(name="a", replicaInfo=[1])]
+    assert cached_table(models) == cached_table(models) == render_table(models)
+
+
+def test_compiled_templates(tmp_path):
+    """Should load precompiled templates without source files, rendering the same HTML."""
+    from types import SimpleNamespace
+
+    from app.core.templates import (
+        compile_templates,
+        create_environment,
+    )
+
+    assert "base.html" in compile_templates(tmp_path)
+    assert list(tmp_path.glob("__pycache__/tmpl_*.pyc"))
+
+    compiled_env = create_environment(tmp_path)
+    source_env = create_environment()
+    assert not compiled_env.auto_reload and source_env.auto_reload
+
+    name = "includes/list_page_sort.html"
+    page = SimpleNamespace(params=SimpleNamespace(sort="name", desc=True), sort_url=lambda c: "?")
+    compiled = compiled_env.get_template(name)
+    assert compiled.filename.startswith(str(tmp_path))
+    assert compiled.render(page=page, column="name", title="Name") == source_env.get_template(
+        name,
+    ).render(page=page, column="name", title="Name")
@@ -0,0 +1,1006 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.core.ksqldb.client import KsqlClient
+from app.core.settings import HTTPSettings
+
+
+def make_client(handler, **kwargs):
+    return KsqlClient(
+        url="http://ksqldb.test",
+        transport=httpx.MockTransport(handler),
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_client_reuses_session():
+    """Should send all requests using one persistent session."""
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(200, json=[{"@type": "streams", "streams": []}])
+
+    client = make_client(handler)
+    await client.execute_statement("SHOW STREAMS")
+    session = client.session
+    await client.execute_statement("SHOW STREAMS", cache=False)
+
+    assert client.session is session
+    assert len(seen) == 2
+    assert seen[0].headers["Accept-Encoding"] == "gzip"
+    await client.close()
+    assert not client.pool_stats["open"]
+
+
+@pytest.mark.asyncio
+async def test_client_pool_stats():
+    """Should expose pool settings in stats."""
+    client = make_client(
+        lambda r: httpx.Response(200, json={}),
+        http=HTTPSettings(max_connections=7, gzip=False),
+    )
+    await client.get_health()
+
+    stats = client.pool_stats
+    assert stats["open"]
+    assert stats["max_connections"] == 7
+    assert client.session.headers["Accept-Encoding"] == "identity"
+    await client.close()
+
+
+def stream_handler(version):
+    """Fake ksqlDB server with /info, /query-stream and /query endpoints."""
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        if request.url.path == "/info":
+            return httpx.Response(200, json={"KsqlServerInfo": {"version": version}})
+        if request.url.path == "/query-stream":
+            return httpx.Response(
+                200,
+                content=(
+                    b'{"queryId":"q1","columnNames":["ID","NAME"],"columnTypes":["INT","STRING"]}\n'
+                    b'[1,"a"]\n[2,"b"]\n'
+                ),
+            )
+        if request.url.path == "/query":
+            return httpx.Response(
+                200,
+                content=(
+                    b'[{"header":{"queryId":"q2","schema":"`ID` INTEGER, `NAME` STRING"}},\n'
+                    b'{"row":{"columns":[1,"a"]}},\n'
+                    b'{"finalMessage":"Limit Reached"}]\n'
+                ),
+            )
+        return httpx.Response(200, json={})
+
+    return handler, calls
+
+
+@pytest.mark.parametrize(
+    "version,expected",
+    [("0.29.0", True), ("0.9.1", False), ("7.6.1", True), ("5.4.0", False), ("weird", False)],
+)
+def test_supports_query_stream(version, expected):
+    from app.core.ksqldb.stream import supports_query_stream
+
+    assert supports_query_stream(version) is expected
+
+
+@pytest.mark.asyncio
+async def test_stream_query():
+    """Should read header and rows from /query-stream."""
+    handler, calls = stream_handler("0.29.0")
+    client = make_client(handler)
+
+    async with await client.stream_query("SELECT * FROM s EMIT CHANGES") as stream:
+        assert stream.query_id == "q1"
+        assert stream.columns == ["ID", "NAME"]
+        assert [row async for row in stream] == [[1, "a"], [2, "b"]]
+
+    assert calls == ["/info", "/query-stream"]
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_query_legacy_fallback():
+    """Should fall back to /query for old servers."""
+    handler, calls = stream_handler("0.9.0")
+    client = make_client(handler)
+
+    async with await client.stream_query("SELECT * FROM s LIMIT 1") as stream:
+        rows = [row async for row in stream]
+
+    assert stream.query_id == "q2"
+    assert stream.columns == ["ID", "NAME"]
+    assert rows == [[1, "a"]]
+    assert stream.final_message == "Limit Reached"
+    assert calls == ["/info", "/query"]
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_query_failed_probe_is_cached():
+    """Should not check server version with every query if check failed."""
+    handler, calls = stream_handler("0.29.0")
+
+    def failing_info(request):
+        if request.url.path == "/info":
+            calls.append(request.url.path)
+            return httpx.Response(500, content=b"oops")
+        return handler(request)
+
+    client = make_client(failing_info)
+    for _ in range(2):
+        async with await client.stream_query("SELECT * FROM s LIMIT 1") as stream:
+            assert stream.legacy
+    assert calls == ["/info", "/query", "/query"]
+
+    # Check is repeated after a while
+    client._query_stream_probe_retry_at = 0
+    async with await client.stream_query("SELECT * FROM s LIMIT 1"):
+        pass
+    assert calls[-2:] == ["/info", "/query"]
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_query_failover():
+    """Should open stream via failover of nodes, and close query on the node running it."""
+    handler, calls = stream_handler("0.29.0")
+    hosts = []
+
+    def dead_node(request):
+        hosts.append((request.url.host, request.url.path))
+        if request.url.host == "dead" and request.url.path != "/info":
+            raise httpx.ConnectError("refused")
+        return handler(request)
+
+    client = KsqlClient(
+        url=["http://dead", "http://node2"],
+        transport=httpx.MockTransport(dead_node),
+        http=HTTPSettings(node_max_failures=1, node_eject_time=60),
+        balancing="least_requests",
+    )
+    async with await client.stream_query("SELECT * FROM s EMIT CHANGES") as stream:
+        assert stream.query_id == "q1"
+
+    assert [host for host in hosts if host[1] != "/info"] == [
+        ("dead", "/query-stream"),
+        ("node2", "/query-stream"),
+        ("node2", "/close-query"),
+    ]
+    assert client.breaker.failures == 0
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_query_error_header_closes_response():
+    """Should release connection if stream fails before it's returned to caller."""
+    from app.core.ksqldb.resources import KsqlException
+
+    closed = []
+
+    class Body(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            yield b'{"@type": "generic_error", "message": "bad query"}\n'
+
+        async def aclose(self):
+            closed.append(True)
+
+    def handler(request):
+        if request.url.path == "/info":
+            return httpx.Response(200, json={"KsqlServerInfo": {"version": "0.29.0"}})
+        return httpx.Response(200, stream=Body())
+
+    client = make_client(handler)
+    with pytest.raises(KsqlException, match="bad query"):
+        async with await client.stream_query("SELECT * FROM s EMIT CHANGES"):
+            pass
+    assert closed == [True]
+    await client.close()
+
+
+@pytest.mark.parametrize(
+    "raw,expected",
+    [
+        ("SHOW STREAMS", "SHOW STREAMS;"),
+        ("-- comment\nSHOW\n  STREAMS;", "SHOW STREAMS;"),
+        ("SELECT '--not comment' FROM s; -- comment", "SELECT '--not comment' FROM s;"),
+        ("SELECT 'it''s -- ok'\n  FROM `a--b` /* block\ncomment */ LIMIT 1", None),
+        ("  -- only comment", ""),
+    ],
+)
+def test_ksql_query_as_string(raw, expected):
+    from app.core.ksqldb import KsqlQuery
+
+    if expected is None:
+        expected = "SELECT 'it''s -- ok' FROM `a--b` LIMIT 1;"
+    assert KsqlQuery(raw).as_string == expected
+
+
+def test_split_statements():
+    from app.core.ksqldb.lexer import split_statements
+
+    text = "CREATE STREAM a (x STRING) WITH (kafka_topic='a;b');\n-- ; comment\nDROP STREAM a"
+    assert split_statements(text) == [
+        "CREATE STREAM a (x STRING) WITH (kafka_topic='a;b');",
+        "DROP STREAM a;",
+    ]
+
+
+@pytest.mark.parametrize(
+    "statement,kind,shape",
+    [
+        ("select * from s", "query", "SELECT"),
+        ("PRINT 'topic' FROM BEGINNING", "query", "PRINT"),
+        ("/* c */ LIST STREAMS EXTENDED", "metadata", "LIST STREAMS EXTENDED"),
+        ("DESCRIBE my_stream EXTENDED", "metadata", "DESCRIBE"),
+        ("CREATE OR REPLACE STREAM s AS SELECT 1", "command", "CREATE OR REPLACE"),
+        ("SHOW STREAMS; SHOW TOPICS;", "metadata", "SHOW STREAMS"),
+        ("SHOW STREAMS; DROP STREAM s;", "command", "SHOW STREAMS"),
+    ],
+)
+def test_statement_kind_and_shape(statement, kind, shape):
+    from app.core.ksqldb import KsqlQuery
+
+    query = KsqlQuery(statement)
+    assert query.kind.value == kind
+    assert query.shape == shape
+
+
+@pytest.mark.asyncio
+async def test_execute_statement_then_query_routing():
+    """Should send queries directly to /query and remember misrouted shapes."""
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        if request.url.path == "/query":
+            if b"SELECT" in request.content:
+                if b"typo" in request.content:
+                    return httpx.Response(400, json={"error_code": 40001, "message": "typo"})
+                return httpx.Response(200, json=[{"header": {"schema": "`A` INT"}}])
+            message = "Statement type `PrintTopic' not supported for this resource"
+            return httpx.Response(400, json={"error_code": 40000, "message": message})
+        return httpx.Response(200, json=[{"@type": "currentStatus"}])
+
+    client = make_client(handler)
+    await client.execute_statement_then_query("SELECT * FROM s")
+    assert calls == ["/query"]
+
+    calls.clear()
+    await client.execute_statement_then_query("SHOW STREAMS")
+    assert calls == ["/ksql"]
+
+    # Misrouted statement shape is remembered
+    calls.clear()
+    await client.execute_statement_then_query("PRINT 'x'")
+    await client.execute_statement_then_query("PRINT 'y'")
+    assert calls == ["/query", "/ksql", "/ksql"]
+
+    # Errors of queries are not sent to /ksql again
+    calls.clear()
+    response = await client.execute_statement_then_query("SELECT typo FROM s", raise_exc=False)
+    assert response.status_code == 400
+    assert calls == ["/query"]
+
+    # Queries sent to /ksql don't invalidate cache
+    generation = client.cache.generation
+    await client.execute_statement_then_query("PRINT 'z'")
+    assert client.cache.generation == generation
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_coalesce_read_only_requests():
+    """Should share one upstream call between identical concurrent read-only requests."""
+    calls = []
+
+    async def handler(request):
+        calls.append(request.content)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=[{"@type": "streams", "streams": []}])
+
+    client = make_client(handler)
+    responses = await asyncio.gather(
+        *(client.execute_statement("SHOW STREAMS") for _ in range(5)),
+        client.execute_statement("show   streams;"),
+    )
+
+    assert len(calls) == 1
+    assert all(r is responses[0] for r in responses)
+    assert client.coalescer.stats == {"calls": 1, "hits": 5, "merges": 1, "in_flight": 0}
+
+    # Mutating statements are never coalesced
+    calls.clear()
+    await asyncio.gather(*(client.execute_statement("DROP STREAM s") for _ in range(2)))
+    assert len(calls) == 2
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_coalesce_shares_errors():
+    """Should raise the same error for all joined callers."""
+    from app.core.ksqldb.client import RequestCoalescer
+
+    coalescer = RequestCoalescer()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise httpx.ConnectError("boom")
+
+    results = await asyncio.gather(
+        coalescer.run("key", fail),
+        coalescer.run("key", fail),
+        return_exceptions=True,
+    )
+    assert all(isinstance(r, httpx.ConnectError) for r in results)
+    assert coalescer.stats["calls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_metadata_cache():
+    """Should cache metadata responses and invalidate them on commands."""
+    calls = []
+
+    def handler(request):
+        calls.append(json.loads(request.content))
+        if b"DROP" in request.content:
+            return httpx.Response(
+                200, json=[{"@type": "currentStatus", "commandSequenceNumber": 7}]
+            )
+        return httpx.Response(200, json=[{"@type": "streams", "streams": []}])
+
+    client = make_client(handler)
+    await client.execute_statement("SHOW STREAMS")
+    await client.execute_statement("show  streams")
+    assert len(calls) == 1
+
+    # Refresh bypass
+    await client.execute_statement("SHOW STREAMS", cache=False)
+    assert len(calls) == 2
+
+    # Write-through invalidation with consistency token
+    await client.execute_statement("DROP STREAM s")
+    await client.execute_statement("SHOW STREAMS")
+    assert len(calls) == 4
+    assert calls[-1]["commandSequenceNumber"] == 7
+    assert client.cache.stats["invalidations"] == 1
+    await client.close()
+
+
+def test_metadata_cache_ttl():
+    from app.core.ksqldb import KsqlQuery
+    from app.core.ksqldb.cache import MetadataCache
+    from app.core.settings import CacheSettings
+
+    cache = MetadataCache(CacheSettings(ttl={"SHOW_TOPICS": 3, "describe": 1, "show_queries": 0}))
+    assert cache.get_ttl(KsqlQuery("LIST TOPICS EXTENDED")) == 3
+    assert cache.get_ttl(KsqlQuery("describe s")) == 1
+    assert cache.get_ttl(KsqlQuery("SHOW QUERIES")) == 0
+    assert cache.get_ttl(KsqlQuery("SHOW TABLES")) == 10  # default TTL is kept
+    assert cache.get_ttl(KsqlQuery("DROP STREAM s")) == 0
+
+
+@pytest.mark.asyncio
+async def test_multi_node_balancing_and_failover():
+    """Should spread reads across nodes, send writes to preferred node and eject dead nodes."""
+    calls = []
+
+    def handler(request):
+        calls.append((request.url.host, request.url.path))
+        if request.url.host == "dead" and request.url.path != "/info":
+            raise httpx.ConnectError("refused")
+        return httpx.Response(200, json=[{"@type": "currentStatus"}])
+
+    client = KsqlClient(
+        url=["http://node1", "http://node2", "http://dead"],
+        transport=httpx.MockTransport(handler),
+        http=HTTPSettings(node_max_failures=1, node_eject_time=60),
+    )
+
+    for _ in range(3):
+        await client.execute_statement("SHOW STREAMS", cache=False)
+    # Third node is dead, so read request failed over to the next one
+    assert [host for host, _ in calls] == ["node1", "node2", "dead", "node1"]
+    assert client.nodes.stats["ejected"] == ["http://dead"]
+
+    calls.clear()
+    await client.execute_statement("SHOW STREAMS", cache=False)
+    await client.execute_statement("DROP STREAM s")
+    await client.execute_statement("DROP STREAM s")
+    assert [host for host, _ in calls] == ["node2", "node1", "node1"]
+    await client.close()
+
+
+def test_server_urls():
+    from app.core.settings import Server
+
+    assert Server(code="a", url="http://a").urls == ["http://a"]
+    server = Server(code="b", url=["http://b1", "http://b2"])
+    assert server.urls == ["http://b1", "http://b2"]
+    assert server.simple_url == "http://b1"
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker():
+    """Should fail fast after consecutive failures and recover after trial request."""
+    from app.core.ksqldb import KsqlServerUnavailable
+
+    calls = []
+    status = {"code": 503}
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(status["code"], json={"@type": "currentStatus"})
+
+    client = make_client(
+        handler,
+        http=HTTPSettings(breaker_failures=2, breaker_reset_time=60, retries=0),
+    )
+    for _ in range(2):
+        with pytest.raises(Exception):
+            await client.execute_statement("SHOW STREAMS", cache=False)
+
+    with pytest.raises(KsqlServerUnavailable):
+        await client.execute_statement("SHOW STREAMS", cache=False)
+    assert len(calls) == 2
+    assert client.stats["breaker"]["state"] == "open"
+
+    # Reset time passed: single trial request closes circuit
+    client.breaker.reset_time = 0
+    status["code"] = 200
+    await client.execute_statement("SHOW STREAMS", cache=False)
+    assert client.stats["breaker"]["state"] == "closed"
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_cancelled_trial():
+    """Should allow another trial request if trial request is cancelled."""
+    from app.core.ksqldb import KsqlServerUnavailable
+
+    received = asyncio.Event()
+    release = asyncio.Event()
+
+    async def handler(request):
+        received.set()
+        await release.wait()
+        return httpx.Response(200, json=[{"@type": "streams", "streams": []}])
+
+    client = make_client(
+        handler,
+        http=HTTPSettings(breaker_failures=1, breaker_reset_time=0, retries=0),
+    )
+    client.breaker.report_failure()
+    assert client.stats["breaker"]["state"] == "half_open"
+
+    trial = asyncio.create_task(client.execute_statement("SHOW STREAMS", cache=False))
+    await received.wait()
+    with pytest.raises(KsqlServerUnavailable):
+        await client.execute_statement("SHOW TABLES", cache=False)
+
+    trial.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+
+    release.set()
+    await client.execute_statement("SHOW STREAMS", cache=False)
+    assert client.stats["breaker"]["state"] == "closed"
+    await client.close()
+
+
+def test_adaptive_timeout():
+    from app.core.ksqldb.breaker import LatencyTracker
+
+    tracker = LatencyTracker(min_timeout=1, max_timeout=10)
+    assert tracker.get_timeout("key") == 10
+
+    for _ in range(100):
+        tracker.record("key", 0.1)
+    assert tracker.get_timeout("key") == 1
+
+    for _ in range(2):
+        tracker.record("key", 2)
+    assert tracker.get_timeout("key") == 6
+
+
+@pytest.mark.asyncio
+async def test_adaptive_timeout_grows_after_timeout():
+    """Should use max timeout again after request timed out, instead of failing forever."""
+    from app.core.ksqldb.breaker import (
+        LATENCY_WINDOW,
+        CircuitState,
+    )
+
+    latency = 0.0
+
+    async def handler(request):
+        if latency > request.extensions["timeout"]["read"]:
+            raise httpx.ReadTimeout("", request=request)
+        await asyncio.sleep(latency)
+        return httpx.Response(200, json=[{"@type": "streams", "streams": []}])
+
+    client = make_client(
+        handler,
+        timeout=1,
+        http=HTTPSettings(min_timeout=0.01, retries=0, breaker_failures=2),
+    )
+    for _ in range(LATENCY_WINDOW):
+        await client.execute_statement("SHOW STREAMS", cache=False)
+    assert client.latency.get_timeout(("ksql", "metadata")) == 0.01
+
+    # Latency rises after window of fast responses is full
+    latency = 0.05
+    with pytest.raises(httpx.ReadTimeout):
+        await client.execute_statement("SHOW STREAMS", cache=False)
+    for _ in range(5):
+        await client.execute_statement("SHOW STREAMS", cache=False)
+    assert client.breaker.state == CircuitState.CLOSED
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_retry_read_only_requests():
+    """Should retry transient failures of read-only requests, but never of commands."""
+    from app.core.ksqldb.retry import retry_budget
+
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) % 3:
+            raise httpx.ReadError("")
+        return httpx.Response(200, json=[{"@type": "currentStatus"}])
+
+    client = make_client(handler, http=HTTPSettings(retries=2, retry_backoff=0.001))
+    await client.execute_statement("SHOW STREAMS", cache=False)
+    assert len(calls) == 3
+    assert client.retries == 2
+
+    with pytest.raises(httpx.ReadError):
+        await client.execute_statement("DROP STREAM s")
+    assert len(calls) == 4
+
+    # No time left for retries
+    with retry_budget(0), pytest.raises(httpx.ReadError):
+        await client.execute_statement("SHOW STREAMS", cache=False)
+    assert len(calls) == 5
+    assert client.retries_exhausted == 1
+    await client.close()
+
+
+def test_json_stream_parser():
+    """Should parse JSON fed by small chunks and report items of streamed arrays."""
+    from app.core.ksqldb.jsonstream import JsonStreamParser
+
+    data = [
+        {"@type": "kafka_topics", "topics": [{"name": str(i), "size": i * 1.5} for i in range(20)]},
+        {"@type": "warning", "value": -12.5e3},
+    ]
+    text = json.dumps(data)
+    for step in (1, 7, 100):
+        parser = JsonStreamParser()
+        events = []
+        for i in range(0, len(text), step):
+            events += parser.feed(text[i : i + step])
+        events += parser.feed("", eof=True)
+
+        assert parser.result == data
+        assert [key for key, _ in events] == ["topics"] * 20 + ["", ""]
+
+    # Incomplete data keeps complete items only
+    parser = JsonStreamParser()
+    list(parser.feed(text[:100]))
+    assert parser.close() == [{"@type": "kafka_topics", "topics": data[0]["topics"][:2]}]
+
+    # Large values (with escaped quotes and brackets in strings) are decoded once complete
+    data = [{"sourceDescription": {"fields": [{"name": f'"[{i}\\'} for i in range(100)]}}]
+    text = json.dumps(data)
+    for step in (1, 5, 64):
+        parser = JsonStreamParser()
+        for i in range(0, len(text), step):
+            list(parser.feed(text[i : i + step]))
+        list(parser.feed("", eof=True))
+        assert parser.result == data
+
+    with pytest.raises(json.JSONDecodeError):
+        list(JsonStreamParser().feed('[{"a": [1, }], '))
+
+
+@pytest.mark.asyncio
+async def test_large_response_is_truncated():
+    """Should parse response incrementally and truncate it by max size."""
+    topics = [{"name": f"topic_{i}", "replicaInfo": [1, 1, 1]} for i in range(1000)]
+
+    def handler(request):
+        return httpx.Response(200, json=[{"@type": "kafka_topics", "topics": topics}])
+
+    client = make_client(handler)
+    response = await client.execute_statement("SHOW TOPICS", cache=False)
+    assert response.json()[0]["topics"] == topics
+    assert not response.truncated
+    # Models are parsed while response is received
+    assert response._parsed is not None
+    assert [topic.name for topic in response.parsed.topics] == [t["name"] for t in topics]
+    body = json.dumps([{"@type": "kafka_topics", "topics": topics}], separators=(",", ":"))
+    assert response.received_size == len(body)
+
+    client = make_client(handler, http=HTTPSettings(max_response_size=1000))
+    response = await client.execute_statement("SHOW TOPICS", cache=False)
+    assert response.truncated
+    assert response.received_size == 1000
+    assert 0 < len(response.json()[0]["topics"]) < 1000
+    assert len(response.parsed.topics) == len(response.json()[0]["topics"])
+    assert json.loads(response.text) == response.json()
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_invalid_json_response_is_kept_whole(monkeypatch):
+    """Should return whole body if it turns out to be invalid JSON after some chunks."""
+    from app.core.ksqldb import jsonstream
+    from app.core.ksqldb.jsonstream import read_json_response
+
+    body = json.dumps([{"@type": "streams", "streams": [{"name": "s"}] * 100}])[:-1] + "oops"
+
+    async def chunks():
+        for i in range(0, len(body), 64):
+            yield body[i : i + 64].encode()
+
+    def make_response(content_type="application/json"):
+        return httpx.Response(
+            200,
+            headers={"content-type": content_type},
+            content=chunks(),
+            request=httpx.Request("POST", "http://ksqldb.test/ksql"),
+        )
+
+    result = await read_json_response(make_response())
+    assert result.text == body
+    assert not result.truncated
+
+    # Only beginning of body is kept while it's parsed
+    monkeypatch.setattr(jsonstream, "RAW_TEXT_MAX_SIZE", 1000)
+    result = await read_json_response(make_response())
+    assert result.text == body[:1000]
+    assert result.truncated
+
+    # Body that is not JSON is limited by max size as well
+    result = await read_json_response(make_response("text/plain"), max_size=100)
+    assert result.text == body[:100]
+    assert result.truncated
+    assert result.received_size == 100
+
+
+def test_parsed_response_models():
+    """Should parse typed models from response once."""
+    from app.core.ksqldb.jsonstream import KsqlResponse
+    from app.core.preprocess import preprocess_data
+
+    request = httpx.Request("POST", "http://ksqldb.test/ksql")
+    data = [
+        {
+            "@type": "streams",
+            "streams": [{"type": "STREAM", "name": "S", "topic": "t", "unknownKey": 1}],
+        },
+    ]
+    response = KsqlResponse(httpx.Response(200, request=request), data=data)
+    assert response.parsed is response.parsed
+    stream = response.parsed.streams[0]
+    assert (stream.name, stream["topic"], stream.get("isWindowed")) == ("S", "t", False)
+    assert not hasattr(stream, "__dict__")
+
+    # Unknown keys are kept and rendered like fields
+    from app.core.render import render_table
+
+    assert stream["unknownKey"] == stream.get("unknownKey") == 1
+    assert stream.keys()[-1] == "unknownKey" and "extra" not in stream.keys()
+    assert stream.as_dict()["unknownKey"] == 1 and "extra" not in stream.as_dict()
+    assert '<th scope="col">Unknownkey</th>' in render_table(response.parsed.streams)
+    with pytest.raises(KeyError):
+        stream["missing"]
+
+    select = KsqlResponse(
+        httpx.Response(200, request=request),
+        data=[
+            {"header": {"queryId": "q1", "schema": "`A` INTEGER, `B` STRING"}},
+            {"row": {"columns": [1, "x"]}},
+            {"finalMessage": "Query Completed"},
+        ],
+    )
+    result = preprocess_data(select)
+    assert result.rows == [{"A": 1, "B": "x"}]
+    assert result.final_message == "Query Completed"
+
+
+@pytest.mark.asyncio
+async def test_execute_many():
+    """Should run requests concurrently with limit and keep errors per request."""
+    in_flight = []
+    max_in_flight = 0
+
+    async def handler(request):
+        nonlocal max_in_flight
+        in_flight.append(request)
+        max_in_flight = max(max_in_flight, len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(request)
+        if b"BROKEN" in request.content:
+            return httpx.Response(400, json={"message": "broken"})
+        return httpx.Response(200, json=[{"@type": "streams", "streams": []}])
+
+    client = make_client(handler)
+    results = await client.execute_many(
+        client.get_info(),
+        "SHOW STREAMS",
+        "SHOW BROKEN",
+        *[f"DESCRIBE s{i}" for i in range(5)],
+        concurrency=3,
+    )
+
+    assert max_in_flight == 3
+    assert [result.ok for result in results] == [True, True, False] + [True] * 5
+    assert results[1].unwrap().parsed.streams == []
+    with pytest.raises(Exception, match="SHOW BROKEN"):
+        results[2].unwrap()
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete():
+    """Should terminate queries before dropping streams and skip dependents of failures."""
+    from app.core.ksqldb import (
+        BulkStatus,
+        bulk_delete,
+    )
+
+    sources = [
+        {"name": "A", "readQueries": [{"id": "Q1"}], "sourceConstraints": ["B"]},
+        {"name": "B", "writeQueries": [{"id": "Q1"}], "readQueries": [{"id": "Q2"}]},
+        {"name": "c", "readQueries": [{"id": "Q3"}]},
+        {"name": "KSQL_PROCESSING_LOG", "readQueries": [{"id": "Q4"}]},
+    ]
+    statements = []
+
+    def handler(request):
+        statement = json.loads(request.content)["ksql"]
+        if statement.startswith("LIST"):
+            return httpx.Response(200, json=[{"sourceDescriptions": sources}])
+        statements.append(statement)
+        if statement == "TERMINATE Q3;":
+            return httpx.Response(400, json={"message": "Query Q3 is busy"})
+        return httpx.Response(200, json=[{"@type": "currentStatus"}])
+
+    client = make_client(handler)
+    results = await bulk_delete(client, streams=["A", "B", "c", "KSQL_PROCESSING_LOG"])
+    by_statement = {r.statement: r for r in results}
+
+    assert sorted(statements[:3]) == ["TERMINATE Q1;", "TERMINATE Q2;", "TERMINATE Q3;"]
+    assert statements[3:] == ["DROP STREAM B;", "DROP STREAM A;"]
+    assert by_statement["TERMINATE Q3;"].error == "Query Q3 is busy"
+    assert by_statement['DROP STREAM "c";'].status == BulkStatus.SKIPPED
+    assert by_statement["DROP STREAM KSQL_PROCESSING_LOG;"].status == BulkStatus.SKIPPED
+    assert by_statement["DROP STREAM A;"].ok
+    await client.close()
+
+
+def test_statement_splitter_chunks():
+    """Should split statements fed by chunks cut inside literals and comments."""
+    from app.core.ksqldb.lexer import StatementSplitter
+
+    text = "SHOW STREAMS; CREATE STREAM a WITH (kafka_topic='a;b'); /* ; */ -- x;\nDROP STREAM a"
+    for size in (1, 3, 7, len(text)):
+        splitter = StatementSplitter()
+        statements = []
+        for i in range(0, len(text), size):
+            statements += splitter.feed(text[i : i + size])
+        statements += splitter.close()
+        assert statements == [
+            "SHOW STREAMS;",
+            "CREATE STREAM a WITH (kafka_topic='a;b');",
+            "DROP STREAM a;",
+        ]
+
+
+@pytest.mark.asyncio
+async def test_run_script():
+    """Should run read-only statements concurrently and stop after failed command."""
+    from app.core.ksqldb.script import run_script
+
+    in_flight = 0
+    max_in_flight = 0
+
+    async def handler(request):
+        nonlocal in_flight, max_in_flight
+        statement = json.loads(request.content)["ksql"]
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if statement.startswith("DROP"):
+            return httpx.Response(400, json={"message": "Stream not found"})
+        return httpx.Response(200, json=[{"@type": "currentStatus"}])
+
+    async def chunks():
+        yield "SHOW STREAMS; SHOW TOPICS; DESCRI"
+        yield "BE s; DROP STREAM x; SHOW QUERIES;"
+
+    client = make_client(handler)
+    results = [r async for r in run_script(client, chunks(), parallel=True)]
+    assert max_in_flight == 3
+    assert sorted(r.index for r in results) == [1, 2, 3, 4]
+    assert results[-1].statement == "DROP STREAM x;"
+    assert results[-1].error == "Stream not found"
+
+    results = [r async for r in run_script(client, chunks(), stop_on_error=False)]
+    assert [r.index for r in results] == [1, 2, 3, 4, 5]
+    assert [r.ok for r in results] == [True, True, True, False, True]
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_run_script_cancelled():
+    """Should cancel statements running in parallel if script results are not read."""
+    from contextlib import aclosing
+
+    from app.core.ksqldb.script import run_script
+
+    cancelled = []
+
+    async def handler(request):
+        statement = json.loads(request.content)["ksql"]
+        try:
+            if not statement.startswith("SHOW STREAMS"):
+                await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(statement)
+            raise
+        return httpx.Response(200, json=[{"@type": "currentStatus"}])
+
+    async def chunks():
+        yield "SHOW STREAMS; SHOW TOPICS; SHOW QUERIES;"
+
+    client = make_client(handler)
+    async with aclosing(run_script(client, chunks(), parallel=True)) as results:
+        async for result in results:
+            assert result.statement == "SHOW STREAMS;"
+            break
+
+    await asyncio.sleep(0)
+    assert sorted(cancelled) == ["SHOW QUERIES;", "SHOW TOPICS;"]
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_run_script_session():
+    """Should send properties and variables set by script with later statements."""
+    from app.core.ksqldb.script import run_script
+
+    sent = []
+
+    def handler(request):
+        sent.append(json.loads(request.content))
+        return httpx.Response(200, json=[{"@type": "currentStatus"}])
+
+    async def chunks():
+        yield "SET 'auto.offset.reset'='earliest'; DEFINE topic = 'it''s';"
+        yield "CREATE STREAM s WITH (kafka_topic='${topic}'); UNSET 'auto.offset.reset';"
+        yield "UNDEFINE topic; DROP STREAM s; SET 'broken';"
+
+    client = make_client(handler)
+    results = [r async for r in run_script(client, chunks())]
+    assert [r.ok for r in results] == [True] * 6 + [False]
+    assert "SET 'broken';" in results[-1].error
+
+    assert [body["ksql"].split()[0] for body in sent] == ["CREATE", "DROP"]
+    assert sent[0]["streamsProperties"] == {"auto.offset.reset": "earliest"}
+    assert sent[0]["sessionVariables"] == {"topic": "it's"}
+    assert sent[1]["streamsProperties"] == {}
+    assert "sessionVariables" not in sent[1]
+    await client.close()
+
+
+def test_diff_catalogs():
+    """Should report only objects missing or differing on some servers."""
+    from app.core.ksqldb.diff import (
+        build_catalog,
+        diff_catalogs,
+    )
+    from app.core.ksqldb.models import (
+        Query,
+        SourceDescription,
+    )
+
+    def source(name, topic="t", value_type="STRING"):
+        fields = [{"name": "V", "schema": {"type": "ARRAY", "memberSchema": {"type": value_type}}}]
+        return SourceDescription(name=name, topic=topic, fields=fields)
+
+    def query(query_id, text):
+        return Query(id=query_id, queryString=text, sinks=["B"])
+
+    catalogs = {
+        "dev": build_catalog(
+            [source("A"), source("B"), source("C", value_type="INT")],
+            [query("CSAS_B_1", "create stream b as select * from a;")],
+        ),
+        "prod": build_catalog(
+            [source("A"), source("C"), source("D", topic="d")],
+            [query("CSAS_B_7", "CREATE STREAM B AS\n  SELECT * FROM A; -- same")],
+        ),
+    }
+    entries = {(entry.kind.value, entry.name): entry for entry in diff_catalogs(catalogs)}
+
+    assert sorted(entries) == [("stream", "B"), ("stream", "C"), ("stream", "D")]
+    assert entries[("stream", "B")].missing == ["prod"]
+    assert entries[("stream", "C")].aspects == ["fields"]
+    assert entries[("stream", "C")].objects["dev"].aspects["fields"] == "V ARRAY<INT>"
+
+
+@pytest.mark.asyncio
+async def test_fake_server_record_and_replay(tmp_path):
+    """Should record exchanges with real server and replay them from cassette."""
+    from app.core.ksqldb.fake import (
+        FakeSettings,
+        create_fake_app,
+    )
+
+    def upstream(request):
+        return httpx.Response(200, json=[{"@type": "streams", "streams": [{"name": "REAL"}]}])
+
+    cassette = tmp_path / "cassette.jsonl"
+    settings = FakeSettings(cassette=str(cassette), record_url="http://real.ksqldb")
+    app = create_fake_app(settings, transport=httpx.MockTransport(upstream))
+    client = KsqlClient("http://fake.ksqldb", transport=httpx.ASGITransport(app))
+    response = await client.execute_statement("show   streams", cache=False)
+    assert response.parsed.streams[0].name == "REAL"
+    await client.execute_statement("SHOW STREAMS", cache=False)
+    await client.close()
+
+    # Each exchange is appended as separate line
+    assert len(cassette.read_text().splitlines()) == 2
+
+    # Replay matches normalized statement, unknown ones get synthetic responses
+    app = create_fake_app(FakeSettings(cassette=str(cassette), streams=3))
+    client = KsqlClient("http://fake.ksqldb", transport=httpx.ASGITransport(app))
+    response = await client.execute_statement("SHOW STREAMS;", cache=False)
+    assert response.parsed.streams[0].name == "REAL"
+    response = await client.execute_statement("LIST TOPICS", cache=False)
+    assert len(response.parsed.topics) == 3
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_fake_server_fault_injection():
+    """Should inject errors and stream body by chunks."""
+    from app.core.ksqldb.fake import (
+        FakeEndpointSettings,
+        FakeSettings,
+        create_fake_app,
+    )
+
+    settings = FakeSettings(
+        rows=50,
+        endpoints={
+            "ksql": FakeEndpointSettings(error_rate=1, error_status=503),
+            "query": FakeEndpointSettings(chunk_size=100),
+        },
+    )
+    client = KsqlClient(
+        "http://fake.ksqldb",
+        http=HTTPSettings(retries=0),
+        transport=httpx.ASGITransport(create_fake_app(settings)),
+    )
+
+    response = await client.execute_statement("SHOW STREAMS", cache=False, raise_exc=False)
+    assert response.status_code == 503
+    response = await client.execute_query("SELECT * FROM s EMIT CHANGES LIMIT 50;")
+    assert len(response.parsed.rows) == 50
+    await client.close()
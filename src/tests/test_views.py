@@ -1,5 +1,6 @@
 import pytest
 
+from app.core.ksqldb.resources import KsqlEndpoints
 from app.status.views import (
     debug_view,
     server_status_view,
@@ -28,6 +29,22 @@ async def test_status_view_success(fastapi_request):
     assert "info" in response.context
     assert "health" in response.context
     assert "properties" in response.context
+    assert response.context["errors"] == []
+
+
+@pytest.mark.asyncio
+async def test_status_view_shows_all_errors(fastapi_request, monkeypatch):
+    """Should show error of any request of status page, not only info and health."""
+    from app.core.ksqldb.client import MockKsqlClient
+
+    monkeypatch.setitem(MockKsqlClient.RESPONSES_MAP, KsqlEndpoints.KSQL, {})
+    response = await server_status_view(fastapi_request)
+
+    assert response.status_code == 200
+    assert response.context["info"]
+    [error] = response.context["errors"]
+    assert "SHOW PROPERTIES;" in str(error)
+    assert b"SHOW PROPERTIES;" in response.body
 
 
 @pytest.mark.asyncio
@@ -38,3 +55,230 @@ async def test_debug_view_success(fastapi_request):
     # Verify response is a template response
     assert response.status_code == 200
     assert response.template.name == "status/debug.html"
+
+
+@pytest.mark.asyncio
+async def test_diff_view_success(fastapi_request):
+    """Test successful diff view with mocked ksqlDB client."""
+    from app.diff.views import diff_view
+
+    response = await diff_view(fastapi_request)
+
+    assert response.status_code == 200
+    assert response.template.name == "diff/index.html"
+    assert response.context["entries"] == []
+    assert response.context["errors"] == {}
+
+
+@pytest.mark.asyncio
+async def test_queries_list_view_success(fastapi_request):
+    """Test successful queries list view with server-side paging."""
+    from app.queries.views import list_view
+
+    response = await list_view(fastapi_request)
+
+    assert response.status_code == 200
+    assert response.template.name == "queries/list.html"
+    page = response.context["page"]
+    assert page.number == 1
+    assert page.items == response.context["queries"]
+
+
+@pytest.mark.asyncio
+async def test_conditional_get(fastapi_request, init_settings):
+    """Should send 304 without rendering page if client has page with the same ETag."""
+    from starlette.requests import Request
+
+    from app.core.details import RESPONSE_DETAILS
+    from app.queries.views import (
+        api_list_queries,
+        list_view,
+    )
+
+    def with_headers(request, query_string=b"s=testing", **headers):
+        raw_headers = [(k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()]
+        return Request(
+            scope={**request.scope, "query_string": query_string, "headers": raw_headers},
+        )
+
+    for view in (list_view, api_list_queries):
+        response = await view(fastapi_request)
+        etag = response.headers["etag"]
+        assert response.status_code == 200
+        assert response.headers["cache-control"] == "no-cache"
+        assert etag.startswith('W/"')  # Body may be compressed or not
+
+        response = await view(with_headers(fastapi_request, if_none_match=f'W/"x", {etag}'))
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert not response.body
+
+        response = await view(with_headers(fastapi_request, if_none_match=etag[2:]))
+        assert response.status_code == 304
+
+        # Other page of list is another representation
+        other = with_headers(fastapi_request, b"s=testing&page=2", if_none_match=etag)
+        response = await view(other)
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    # Details linked from page cached by browser are stored again
+    response = await list_view(fastapi_request)
+    details_id = response.context["x_details_id"]
+    RESPONSE_DETAILS.clear()
+    response = await list_view(
+        with_headers(fastapi_request, if_none_match=response.headers["etag"])
+    )
+    assert response.status_code == 304
+    assert RESPONSE_DETAILS.get(details_id) is not None
+    RESPONSE_DETAILS.clear()
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_after_refetch(fastapi_request, init_settings, monkeypatch):
+    """Should send 304 if metadata fetched again from ksqlDB is the same."""
+    import json
+    from pathlib import Path
+
+    import httpx
+    from starlette.requests import Request
+
+    from app.core.ksqldb.client import (
+        KSQL_CLIENTS_CACHE,
+        KsqlClient,
+    )
+    from app.core.settings import CacheSettings
+    from app.queries.views import list_view
+
+    body = (Path(__file__).parents[1] / "app/core/ksqldb/responses/show_queries.json").read_text()
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json=json.loads(body))
+
+    # Cached responses expire immediately, so each page is fetched again
+    client = KsqlClient(
+        "http://testing",
+        transport=httpx.MockTransport(handler),
+        cache=CacheSettings(ttl={"show_queries": 0}),
+    )
+    monkeypatch.setitem(KSQL_CLIENTS_CACHE, "testing", client)
+    scope = {**fastapi_request.scope, "test": False}
+
+    response = await list_view(Request(scope=scope))
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    headers = [(b"if-none-match", etag.encode())]
+    response = await list_view(Request(scope={**scope, "headers": headers}))
+    assert len(calls) == 2
+    assert response.status_code == 304
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_streaming_template_response(fastapi_request, monkeypatch):
+    """Should send page head first, then body by chunks, the same as non-streamed page."""
+    from app.core import templates
+    from app.queries.views import list_view
+
+    monkeypatch.setattr(templates, "STREAM_CHUNK_SIZE", 1024)
+    response = await list_view(fastapi_request)
+    assert isinstance(response, templates.StreamingTemplateResponse)
+
+    chunks = [chunk async for chunk in response.body_iterator]
+    assert len(chunks) > 2
+
+    # Navbar is sent before rendering of page body, other chunks are not smaller than limit
+    navbar_end = next(i for i, chunk in enumerate(chunks) if "</nav>" in chunk)
+    assert "<table" not in "".join(chunks[: navbar_end + 1])
+    assert all(len(chunk) >= 1024 for chunk in chunks[navbar_end + 1 : -1])
+
+    context = {**response.context, templates.STREAM_CONTEXT_KEY: False}
+    assert "".join(chunks) == response.template.render(context)
+
+
+@pytest.mark.asyncio
+async def test_response_details_loaded_on_demand(fastapi_request):
+    """Should link response details from page and serve them from store by ID."""
+    import json
+
+    from app.core.details import RESPONSE_DETAILS
+    from app.core.ksqldb import get_ksql_client
+    from app.requests.views import (
+        api_download_response_details,
+        show_response_details,
+    )
+
+    response = await server_status_view(fastapi_request)
+    details_id = response.context["x_details_id"]
+    assert f"/details/{details_id}" in response.body.decode()
+    assert "Loading..." in response.body.decode()
+
+    response = await show_response_details(fastapi_request, details_id)
+    assert response.context["details"].response.code == 200
+    assert "HTTP 200" in response.body.decode()
+
+    # The same (cached) response is stored once, as compact JSON
+    ksql_response = await get_ksql_client(fastapi_request).execute_statement("SHOW PROPERTIES;")
+    ksql_details_id = RESPONSE_DETAILS.add(ksql_response)
+    assert RESPONSE_DETAILS.add(ksql_response) == ksql_details_id
+    content = RESPONSE_DETAILS.get(ksql_details_id).content
+    assert json.loads(content) == ksql_response.json() and b", " not in content
+
+    response = await api_download_response_details(details_id)
+    data = json.loads(response.body)
+    assert data["request"]["method"] == "POST" and data["response"]["code"] == 200
+    assert response.headers["content-disposition"].startswith("attachment")
+
+    RESPONSE_DETAILS.clear()
+    assert (await show_response_details(fastapi_request, details_id)).context["details"] is None
+    assert (await api_download_response_details(details_id)).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_api_process_file(fastapi_request, init_settings):
+    """Should execute uploaded file as script, reading it by chunks."""
+    import json
+
+    import httpx
+    from starlette.requests import Request
+
+    from app.requests.views import api_process_file
+
+    upload = httpx.Request(
+        "POST",
+        "http://test/api/process_file",
+        files={"file": ("script.sql", b"SHOW QUERIES;\nSHOW PROPERTIES;\n")},
+    )
+    body = upload.read()
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    request = Request(
+        scope={
+            **fastapi_request.scope,
+            "method": "POST",
+            "headers": [(b"content-type", upload.headers["content-type"].encode())],
+        },
+        receive=receive,
+    )
+    response = await api_process_file(request)
+    lines = [json.loads(line) async for line in response.body_iterator]
+    assert [line["statement"] for line in lines[:-1]] == ["SHOW QUERIES;", "SHOW PROPERTIES;"]
+    assert lines[-1]["summary"]["failed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_refresh_redirects_to_page_without_param(fastapi_request):
+    """Should show refreshed page by URL without "refresh", so it isn't kept for reloads."""
+    from starlette.requests import Request
+
+    from app.queries.views import list_view
+
+    request = Request(scope={**fastapi_request.scope, "query_string": b"s=testing&refresh=1"})
+    response = await list_view(request)
+    assert response.status_code == 303
+    assert response.headers["location"].endswith("/?s=testing")